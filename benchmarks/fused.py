@@ -0,0 +1,85 @@
+"""融合流水线的单元素开销
+
+比较同一条 map -> filter -> map -> take_while -> slice 链路在
+itertools、ArkoWrapper 与 ArkoWrapper.lazy() 下每个元素所花费的时间。
+
+    python benchmarks/fused.py [--size N] [--repeat N]
+"""
+
+import argparse
+import timeit
+from itertools import islice, takewhile
+
+from arko.wrapper import ArkoWrapper
+
+
+def inc(x: int) -> int:
+    return x + 1
+
+
+def odd(x: int) -> bool:
+    return x & 1 == 1
+
+
+def double(x: int) -> int:
+    return x * 2
+
+
+def small(x: int) -> bool:
+    return x < 1 << 60
+
+
+def run_itertools(size: int) -> list:
+    return list(
+        islice(
+            takewhile(small, map(double, filter(odd, map(inc, range(size))))), 1, None
+        )
+    )
+
+
+def run_eager(size: int) -> list:
+    return (
+        ArkoWrapper(range(size))
+        .map(inc)
+        .filter(odd)
+        .map(double)
+        .take_while(small)
+        .slice(1, None)
+        .collect()
+    )
+
+
+def run_lazy(size: int) -> list:
+    return (
+        ArkoWrapper(range(size))
+        .lazy()
+        .map(inc)
+        .filter(odd)
+        .map(double)
+        .take_while(small)
+        .slice(1, None)
+        .collect()
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    options = parser.parse_args()
+
+    expected = run_itertools(options.size)
+    for name, func in (
+        ("itertools", run_itertools),
+        ("ArkoWrapper", run_eager),
+        ("ArkoWrapper.lazy", run_lazy),
+    ):
+        assert func(options.size) == expected, name
+        best = min(
+            timeit.repeat(lambda: func(options.size), number=1, repeat=options.repeat)
+        )
+        print(f"{name:<20}{best * 1e9 / options.size:>10.1f} ns/item")
+
+
+if __name__ == "__main__":
+    main()
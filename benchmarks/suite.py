@@ -0,0 +1,291 @@
+"""ArkoWrapper 基准测试
+
+对常见的链路，在不同的数据源（list、generator、range）与数据规模下，比较 ArkoWrapper 与
+手写的 itertools、more_itertools 实现每个元素所花费的时间。
+
+    python benchmarks/suite.py [--size N ...] [--repeat N] [--case NAME ...]
+                               [--output results.json]
+                               [--baseline baseline.json] [--tolerance 0.2]
+
+给出 --output 时将结果以 JSON 写入文件；给出 --baseline 时与之前保存的结果比较，
+ArkoWrapper 的任意一项比基准慢超过 tolerance 时以非零状态退出。
+"""
+
+import argparse
+import json
+import platform
+import sys
+import timeit
+from dataclasses import asdict, dataclass
+from itertools import chain, groupby, islice
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from arko.wrapper import ArkoWrapper
+
+try:
+    import more_itertools
+except ImportError:
+    more_itertools = None
+
+SOURCES: Dict[str, Callable[[List], Iterable]] = {
+    "list": lambda data: data,
+    "generator": lambda data: (item for item in data),
+    "range": lambda data: range(len(data)),
+}
+
+PATTERN = (3, 4, 5)
+
+
+def inc(x: int) -> int:
+    return x + 1
+
+
+def odd(x: int) -> bool:
+    return x & 1 == 1
+
+
+def bucket(x: int) -> int:
+    return x // 16
+
+
+def residue(x: int) -> int:
+    return x % 1024
+
+
+def descending(x: int) -> int:
+    return -x
+
+
+def pairs(size: int) -> List[Tuple[int, int]]:
+    return [(i, i + 1) for i in range(size)]
+
+
+def periodic(size: int) -> List[int]:
+    return [i % 10 for i in range(size)]
+
+
+def naive_search(iterable: Iterable, pattern: Tuple) -> List[int]:
+    window = len(pattern)
+    items = list(iterable)
+    return [
+        i
+        for i in range(len(items) - window + 1)
+        if tuple(items[i : i + window]) == pattern
+    ]
+
+
+def batched(iterable: Iterable, n: int) -> List[List]:
+    iterator = iter(iterable)
+    return list(iter(lambda: list(islice(iterator, n)), []))
+
+
+def unique_everseen(iterable: Iterable, key: Callable) -> List:
+    seen = set()
+    result = []
+    for item in iterable:
+        k = key(item)
+        if k not in seen:
+            seen.add(k)
+            result.append(item)
+    return result
+
+
+@dataclass(frozen=True)
+class Case:
+    """一条被测试的链路
+
+    Attributes:
+        name: 名称
+        implementations: 实现的名称 -> 以数据源为参数、返回 list 的函数
+        data: 由规模生成数据的函数；为 None 时使用 range(size)，此时也会测试 range 数据源
+    """
+
+    name: str
+    implementations: Dict[str, Callable[[Iterable], List]]
+    data: Optional[Callable[[int], List]] = None
+
+
+def _cases() -> List[Case]:
+    cases = [
+        Case(
+            "map-filter-collect",
+            {
+                "arko": lambda s: ArkoWrapper(s).map(inc).filter(odd).collect(),
+                "arko.lazy": lambda s: ArkoWrapper(s)
+                .lazy()
+                .map(inc)
+                .filter(odd)
+                .collect(),
+                "itertools": lambda s: list(filter(odd, map(inc, s))),
+            },
+        ),
+        Case(
+            "groupby",
+            {
+                "arko": lambda s: ArkoWrapper(s)
+                .groupby(bucket)
+                .map(lambda kg: (kg[0], list(kg[1])))
+                .collect(),
+                "itertools": lambda s: [(k, list(g)) for k, g in groupby(s, bucket)],
+            },
+        ),
+        Case(
+            "unique",
+            {
+                "arko": lambda s: ArkoWrapper(s).unique(residue).collect(),
+                "itertools": lambda s: unique_everseen(s, residue),
+            },
+        ),
+        Case(
+            "sort",
+            {
+                "arko": lambda s: ArkoWrapper(s).sort(key=descending).collect(),
+                "itertools": lambda s: sorted(s, key=descending),
+            },
+        ),
+        Case(
+            "search",
+            {
+                "arko": lambda s: list(ArkoWrapper(s).search(PATTERN)),
+                "itertools": lambda s: naive_search(s, PATTERN),
+            },
+            periodic,
+        ),
+        Case(
+            "flat",
+            {
+                "arko": lambda s: ArkoWrapper(s).flat(1).collect(),
+                "itertools": lambda s: list(chain.from_iterable(s)),
+            },
+            pairs,
+        ),
+        Case(
+            # 缓冲区的上限远小于数据规模，检查有界的缓冲区可以流式地读取全部元素
+            "buffered-map",
+            {
+                "arko": lambda s: ArkoWrapper(s).buffer(64).map(inc).collect(),
+                "itertools": lambda s: list(map(inc, s)),
+            },
+        ),
+    ]
+    chunked = {"itertools": lambda s: batched(s, 64)}
+    if more_itertools is not None:
+        chunked["arko"] = lambda s: ArkoWrapper(s).chunked(64).collect()
+        chunked["more_itertools"] = lambda s: list(more_itertools.chunked(s, 64))
+        cases[2].implementations["more_itertools"] = lambda s: list(
+            more_itertools.unique_everseen(s, key=residue)
+        )
+        cases[4].implementations["more_itertools"] = lambda s: list(
+            more_itertools.locate(s, lambda *w: w == PATTERN, window_size=len(PATTERN))
+        )
+        cases[5].implementations["more_itertools"] = lambda s: list(
+            more_itertools.flatten(s)
+        )
+    cases.insert(1, Case("chunked", chunked))
+    return cases
+
+
+@dataclass(frozen=True)
+class Result:
+    case: str
+    source: str
+    size: int
+    implementation: str
+    seconds: float
+
+    @property
+    def key(self) -> Tuple[str, str, int, str]:
+        return self.case, self.source, self.size, self.implementation
+
+    @property
+    def ns_per_item(self) -> float:
+        return self.seconds * 1e9 / self.size
+
+
+def run(cases: Iterable[Case], sizes: Iterable[int], repeat: int) -> Iterable[Result]:
+    """依次运行每一项，并检查同一项的各个实现结果一致"""
+    for case in cases:
+        for size in sizes:
+            data = list(range(size)) if case.data is None else case.data(size)
+            for source, make in SOURCES.items():
+                if source == "range" and case.data is not None:
+                    continue
+                expected: Any = None
+                for implementation, func in case.implementations.items():
+                    result = func(make(data))
+                    if expected is None:
+                        expected = result
+                    elif result != expected:
+                        raise AssertionError(
+                            f"{case.name}/{source}/{size}: "
+                            f"{implementation} returned a different result"
+                        )
+                    best = min(
+                        timeit.repeat(lambda: func(make(data)), number=1, repeat=repeat)
+                    )
+                    yield Result(case.name, source, size, implementation, best)
+
+
+def compare(
+    results: List[Result], baseline: Dict[str, Any], tolerance: float
+) -> List[str]:
+    """与基准比较 ArkoWrapper 的各项，返回变慢的项"""
+    previous = {
+        (r["case"], r["source"], r["size"], r["implementation"]): r["seconds"]
+        for r in baseline["results"]
+    }
+    regressions = []
+    for result in results:
+        before = previous.get(result.key)
+        if not result.implementation.startswith("arko") or not before:
+            continue
+        ratio = result.seconds / before
+        if ratio > 1 + tolerance:
+            regressions.append(
+                "/".join(map(str, result.key)) + f": {ratio:.2f}x slower than baseline"
+            )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, nargs="+", default=[1_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--case", nargs="+", help="只运行指定名称的链路")
+    parser.add_argument("--output", help="将结果以 JSON 写入此文件")
+    parser.add_argument("--baseline", help="与此前保存的 JSON 结果比较")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    options = parser.parse_args()
+
+    cases = [c for c in _cases() if not options.case or c.name in options.case]
+    results = []
+    for result in run(cases, options.size, options.repeat):
+        results.append(result)
+        print(
+            f"{result.case:<20}{result.source:<11}{result.size:>9}  "
+            f"{result.implementation:<16}{result.ns_per_item:>10.1f} ns/item"
+        )
+
+    if options.output:
+        with open(options.output, "w", encoding="utf-8") as file:
+            json.dump(
+                {
+                    "python": sys.version,
+                    "platform": platform.platform(),
+                    "results": [asdict(r) for r in results],
+                },
+                file,
+                indent=2,
+            )
+
+    if options.baseline:
+        with open(options.baseline, encoding="utf-8") as file:
+            regressions = compare(results, json.load(file), options.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,12 @@
+"""给你的 Python 迭代器加上魔法
+
+一个 Python 迭代器的包装器，使其具有与Rust中的其他方法类似的风格，以提高迭代器操作的一致性和代码的可读性。
+"""
+
+from arko.wrapper._async import AsyncArkoWrapper
+from arko.wrapper._batch import RecordBatch
+from arko.wrapper._bloom import BloomFilter
+from arko.wrapper._pipeline import Operation, Pipeline
+from arko.wrapper._search import AhoCorasick
+from arko.wrapper._spec import PipelineSpec
+from arko.wrapper._wrapper import ArkoWrapper
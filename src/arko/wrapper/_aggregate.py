@@ -0,0 +1,219 @@
+"""哈希聚合
+
+一次遍历即可按 key 分组聚合，每个 key 只保留一个累加器，无需先排序。
+不同 key 的数量超出上限时，将累加器按 key 的哈希值分区写入临时文件，最后逐个分区合并。
+"""
+
+import pickle
+import tempfile
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+__all__ = ("AggregateSpec", "Aggregation", "aggregate")
+
+T = TypeVar("T")
+K = TypeVar("K", bound=Hashable)
+
+AggregateSpec = Optional[Union[bool, Callable[[T], Any]]]
+
+KINDS = ("count", "sum", "min", "max", "mean", "collect")
+
+MAX_DEPTH = 8
+"""分区递归的最大深度；哈希值相同的 key 无法被继续分开，超过该深度的分区直接在内存中合并"""
+
+
+class Aggregation(Generic[T]):
+    """一组聚合操作
+
+    每个操作的参数为 True 时作用于元素本身，为函数时作用于函数的返回值，为 None 或 False 时不计算。
+    count 总是统计元素的个数。
+    """
+
+    __slots__ = ("fields",)
+
+    fields: List[Tuple[str, Optional[Callable[[T], Any]]]]
+
+    def __init__(self, **specs: AggregateSpec) -> None:
+        self.fields = []
+        for kind, spec in specs.items():
+            if kind not in KINDS:
+                raise TypeError(f"Unsupported aggregation: {kind!r}")
+            if spec is None or spec is False:
+                continue
+            if spec is not True and not callable(spec):
+                raise TypeError(f"'{kind}' must be a bool or a callable: {spec!r}")
+            self.fields.append((kind, None if spec is True else spec))
+
+    def new(self, item: T) -> List[Any]:
+        """由第一个元素创建累加器"""
+        state = []
+        for kind, func in self.fields:
+            value = item if func is None else func(item)
+            if kind == "count":
+                state.append(1)
+            elif kind == "mean":
+                state.append([value, 1])
+            elif kind == "collect":
+                state.append([value])
+            else:
+                state.append(value)
+        return state
+
+    def update(self, state: List[Any], item: T) -> None:
+        for i, (kind, func) in enumerate(self.fields):
+            if kind == "count":
+                state[i] += 1
+                continue
+            value = item if func is None else func(item)
+            if kind == "sum":
+                state[i] += value
+            elif kind == "min":
+                if value < state[i]:
+                    state[i] = value
+            elif kind == "max":
+                if value > state[i]:
+                    state[i] = value
+            elif kind == "mean":
+                state[i][0] += value
+                state[i][1] += 1
+            else:
+                state[i].append(value)
+
+    def merge(self, state: List[Any], other: List[Any]) -> None:
+        """将 other 合并到 state 中，other 中的元素在 state 之后"""
+        for i, (kind, _) in enumerate(self.fields):
+            if kind in ("count", "sum"):
+                state[i] += other[i]
+            elif kind == "min":
+                if other[i] < state[i]:
+                    state[i] = other[i]
+            elif kind == "max":
+                if other[i] > state[i]:
+                    state[i] = other[i]
+            elif kind == "mean":
+                state[i][0] += other[i][0]
+                state[i][1] += other[i][1]
+            else:
+                state[i].extend(other[i])
+
+    def result(self, state: List[Any]) -> Dict[str, Any]:
+        return {
+            kind: value[0] / value[1] if kind == "mean" else value
+            for (kind, _), value in zip(self.fields, state)
+        }
+
+
+def _spill(
+    table: Dict[K, List[Any]], files: List[IO[bytes]], depth: int
+) -> Dict[K, List[Any]]:
+    """将 table 中的累加器按 key 的哈希值分区追加到 files 中，返回一个新的空表"""
+    partitions: List[List[Tuple[K, List[Any]]]] = [[] for _ in files]
+    for key, state in table.items():
+        partitions[hash((key, depth)) % len(files)].append((key, state))
+    for file, partition in zip(files, partitions):
+        if partition:
+            pickle.dump(partition, file, pickle.HIGHEST_PROTOCOL)
+    return {}
+
+
+def _read(file: IO[bytes]) -> Iterator[Tuple[K, List[Any]]]:
+    with file:
+        file.seek(0)
+        while True:
+            try:
+                yield from pickle.load(file)
+            except EOFError:
+                return
+
+
+def _merge(aggregation: Aggregation) -> Callable[[Dict, Any, List[Any]], None]:
+    def fold(table: Dict, key: Any, state: List[Any]) -> None:
+        current = table.get(key)
+        if current is None:
+            table[key] = state
+        else:
+            aggregation.merge(current, state)
+
+    return fold
+
+
+def _partitioned(
+    pairs: Iterable[Tuple[K, Any]],
+    fold: Callable[[Dict[K, List[Any]], K, Any], None],
+    aggregation: Aggregation,
+    max_keys: Optional[int],
+    partitions: int,
+    depth: int,
+) -> Iterator[Tuple[K, Dict[str, Any]]]:
+    """聚合 (key, 值) 对，超出 max_keys 时分区写入临时文件，再递归地合并每个分区"""
+    if depth >= MAX_DEPTH:
+        max_keys = None
+    table: Dict[K, List[Any]] = {}
+    files: List[IO[bytes]] = []
+    try:
+        for key, value in pairs:
+            fold(table, key, value)
+            if max_keys is not None and len(table) > max_keys:
+                if not files:
+                    files = [
+                        tempfile.TemporaryFile(prefix="arko-aggregate-")
+                        for _ in range(partitions)
+                    ]
+                table = _spill(table, files, depth)
+        if not files:
+            for key, state in table.items():
+                yield key, aggregation.result(state)
+            return
+        table = _spill(table, files, depth)
+        for file in files:
+            yield from _partitioned(
+                _read(file),
+                _merge(aggregation),
+                aggregation,
+                max_keys,
+                partitions,
+                depth + 1,
+            )
+    finally:
+        for file in files:
+            file.close()
+
+
+def aggregate(
+    iterable: Iterable[T],
+    key: Callable[[T], K],
+    aggregation: Aggregation[T],
+    max_keys: Optional[int] = None,
+    partitions: int = 16,
+) -> Iterator[Tuple[K, Dict[str, Any]]]:
+    """按 key 聚合 iterable，依次产出 (key, 聚合结果)
+
+    未发生分区时按 key 第一次出现的顺序产出；否则按分区依次产出，累加器与 key 需要能被 pickle。
+    """
+    if max_keys is not None and max_keys <= 0:
+        raise ValueError(f"'max_keys' must be a positive number: {max_keys}")
+    if partitions <= 1:
+        raise ValueError(f"'partitions' must be greater than 1: {partitions}")
+
+    def fold(table: Dict[K, List[Any]], k: K, item: T) -> None:
+        state = table.get(k)
+        if state is None:
+            table[k] = aggregation.new(item)
+        else:
+            aggregation.update(state, item)
+
+    pairs = ((key(item), item) for item in iterable)
+    return _partitioned(pairs, fold, aggregation, max_keys, partitions, 0)
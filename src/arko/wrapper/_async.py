@@ -0,0 +1,344 @@
+"""异步迭代器的包装器
+
+与 ArkoWrapper 相同风格的、作用于异步迭代器之上的包装器。
+"""
+
+import asyncio
+import inspect
+from collections import deque
+from itertools import islice
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Generic,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+from typing_extensions import Self
+
+from arko.wrapper._tee import AsyncTeeBuffer, AsyncTeeCursor, OverflowPolicy
+
+__all__ = ("AsyncArkoWrapper",)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+MaybeAwaitable = Union[R, Awaitable[R]]
+
+
+async def _resolve(value: MaybeAwaitable[R]) -> R:
+    return await value if inspect.isawaitable(value) else value
+
+
+async def _from_iterable(iterable: Iterable[T]) -> AsyncIterator[T]:
+    for item in iterable:
+        yield item
+
+
+class _End:
+    """用于在队列中标记上游已经结束"""
+
+    __slots__ = ("error",)
+
+    def __init__(self, error: Optional[BaseException] = None) -> None:
+        self.error = error
+
+
+class AsyncArkoWrapper(Generic[T]):
+    """一个 Python 异步迭代器的包装器
+
+    传入的函数既可以是普通函数，也可以是返回 awaitable 的协程函数。
+    """
+
+    __root__: AsyncIterable[T]
+
+    __slots__ = ("__root__",)
+
+    def __init__(
+        self, iterable: Optional[Union[AsyncIterable[T], Iterable[T]]] = None
+    ) -> None:
+        """初始化方法
+
+        Args:
+            iterable: 需要被 Wrap 的异步可迭代对象，普通的可迭代对象会被转换为异步的。
+        """
+        if isinstance(iterable, AsyncIterable):
+            self.__root__ = iterable
+        elif iterable is None:
+            self.__root__ = _from_iterable([])
+        elif isinstance(iterable, Iterable):
+            self.__root__ = _from_iterable(iterable)
+        else:
+            raise TypeError(f"'{type(iterable).__name__}' object is not iterable")
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} " + "{" + f"{self.__root__}" + "}>"
+
+    def _tee(self) -> AsyncIterator[T]:
+        """将已有迭代器分裂一次
+
+        与 ArkoWrapper 相同，所有分支共享同一个缓冲区，自身保留一个停在起点的读取者，因此可以被多次迭代；
+        由 buffer 创建的 AsyncArkoWrapper 只能读取一次，读过的元素会被释放。
+        """
+        root = self.__root__
+        if isinstance(root, AsyncTeeBuffer):
+            return aiter(root.cursor())
+        if isinstance(root, AsyncTeeCursor) and root.buffer.one_shot:
+            return aiter(root)
+        if not isinstance(root, AsyncTeeCursor):
+            self.__root__ = root = AsyncTeeBuffer(root).cursor()
+        return aiter(root.copy())
+
+    def __aiter__(self) -> AsyncIterator[T]:
+        return self._tee()
+
+    @property
+    def root(self) -> AsyncIterable[T]:
+        return self.__root__
+
+    def amap(
+        self,
+        func: Callable[[T], Awaitable[R]],
+        *,
+        concurrency: int = 16,
+        ordered: bool = True,
+    ) -> "AsyncArkoWrapper[R]":
+        """并发地对每个元素执行协程函数 func
+
+        Args:
+            func: 返回 awaitable 的函数。
+            concurrency: 同时执行的 func 的上限，上游也只会被按需读取。
+            ordered: 是否保持输入的顺序；为 False 时先完成的先产出。
+        """
+        if concurrency <= 0:
+            raise ValueError(f"'concurrency' must be a positive number: {concurrency}")
+        iter_values = self._tee()
+
+        async def generator() -> AsyncIterator[R]:
+            pending: Deque[asyncio.Future] = deque()
+            exhausted = False
+
+            async def fill() -> None:
+                nonlocal exhausted
+                while not exhausted and len(pending) < concurrency:
+                    try:
+                        item = await anext(iter_values)
+                    except StopAsyncIteration:
+                        exhausted = True
+                    else:
+                        pending.append(asyncio.ensure_future(func(item)))
+
+            try:
+                await fill()
+                if ordered:
+                    while pending:
+                        result = await pending.popleft()
+                        await fill()
+                        yield result
+                else:
+                    while pending:
+                        done, _ = await asyncio.wait(
+                            pending, return_when=asyncio.FIRST_COMPLETED
+                        )
+                        for future in done:
+                            pending.remove(future)
+                        await fill()
+                        for future in done:
+                            yield future.result()
+            finally:
+                for future in pending:
+                    future.cancel()
+
+        return self.__class__(generator())
+
+    def batch(
+        self, size: int, timeout: Optional[float] = None
+    ) -> "AsyncArkoWrapper[List[T]]":
+        """按数量或时间分批
+
+        每一批最多包含 size 个元素；若给出 timeout，则一批中的第一个元素到达后最多再等待 timeout 秒。
+        上游会在后台被持续读取，因此等待下游处理时不会阻塞上游。
+        """
+        if size <= 0:
+            raise ValueError(f"'size' must be a positive number: {size}")
+        iter_values = self._tee()
+
+        async def generator() -> AsyncIterator[List[T]]:
+            queue: asyncio.Queue = asyncio.Queue(size)
+
+            async def produce() -> None:
+                try:
+                    async for item in iter_values:
+                        await queue.put(item)
+                except Exception as e:
+                    await queue.put(_End(e))
+                else:
+                    await queue.put(_End())
+
+            loop = asyncio.get_running_loop()
+            task = asyncio.ensure_future(produce())
+            end: Optional[_End] = None
+            # 超时时不取消正在进行的 queue.get()，而是留到下一批继续等待，以免丢失同时到达的元素
+            get: Optional[asyncio.Future] = None
+            try:
+                while end is None:
+                    if get is None:
+                        get = asyncio.ensure_future(queue.get())
+                    item = await get
+                    get = None
+                    if isinstance(item, _End):
+                        end = item
+                        break
+                    items = [item]
+                    deadline = None if timeout is None else loop.time() + timeout
+                    while len(items) < size:
+                        get = asyncio.ensure_future(queue.get())
+                        if deadline is not None:
+                            done, _ = await asyncio.wait(
+                                (get,), timeout=deadline - loop.time()
+                            )
+                            if not done:
+                                break
+                        item = await get
+                        get = None
+                        if isinstance(item, _End):
+                            end = item
+                            break
+                        items.append(item)
+                    yield items
+                if end.error is not None:
+                    raise end.error
+            finally:
+                task.cancel()
+                if get is not None:
+                    get.cancel()
+
+        return self.__class__(generator())
+
+    def buffer(
+        self, max_size: Optional[int], *, overflow: OverflowPolicy = "raise"
+    ) -> Self:
+        """转为只能读取一次的流，并限制分支之间共享缓冲区的大小，参数与 ArkoWrapper.buffer 相同"""
+        return self.__class__(
+            AsyncTeeBuffer(self._tee(), max_size, overflow, one_shot=True)
+        )
+
+    def chunked(self, n: int) -> "AsyncArkoWrapper[List[T]]":
+        """每 n 个元素组成一个列表，最后一个列表可能不足 n 个"""
+        if n <= 0:
+            raise ValueError(f"'n' must be a positive number: {n}")
+        iter_values = self._tee()
+
+        async def generator() -> AsyncIterator[List[T]]:
+            items = []
+            async for item in iter_values:
+                items.append(item)
+                if len(items) == n:
+                    yield items
+                    items = []
+            if items:
+                yield items
+
+        return self.__class__(generator())
+
+    async def collect(self, func: Callable[[List[T]], R] = list) -> R:
+        """读取全部元素，并以列表的形式交给 func"""
+        return func([item async for item in self._tee()])
+
+    def drop_while(self, func: Callable[[T], MaybeAwaitable[bool]]) -> Self:
+        iter_values = self._tee()
+
+        async def generator() -> AsyncIterator[T]:
+            dropping = True
+            async for item in iter_values:
+                if dropping and await _resolve(func(item)):
+                    continue
+                dropping = False
+                yield item
+
+        return self.__class__(generator())
+
+    def enumerate(self, start: int = 0) -> "AsyncArkoWrapper[Tuple[int, T]]":
+        iter_values = self._tee()
+
+        async def generator() -> AsyncIterator[Tuple[int, T]]:
+            index = start
+            async for item in iter_values:
+                yield index, item
+                index += 1
+
+        return self.__class__(generator())
+
+    def filter(self, func: Optional[Callable[[T], MaybeAwaitable[Any]]]) -> Self:
+        iter_values = self._tee()
+
+        async def generator() -> AsyncIterator[T]:
+            async for item in iter_values:
+                if item if func is None else await _resolve(func(item)):
+                    yield item
+
+        return self.__class__(generator())
+
+    def filter_false(self, func: Optional[Callable[[T], MaybeAwaitable[Any]]]) -> Self:
+        iter_values = self._tee()
+
+        async def generator() -> AsyncIterator[T]:
+            async for item in iter_values:
+                if not (item if func is None else await _resolve(func(item))):
+                    yield item
+
+        return self.__class__(generator())
+
+    async def for_each(self, func: Callable[[T], MaybeAwaitable[Any]]) -> None:
+        """对每个元素依次调用 func"""
+        async for item in self._tee():
+            await _resolve(func(item))
+
+    def map(self, func: Callable[[T], MaybeAwaitable[R]]) -> "AsyncArkoWrapper[R]":
+        """依次对每个元素执行 func，需要并发执行协程时请使用 amap"""
+        iter_values = self._tee()
+
+        async def generator() -> AsyncIterator[R]:
+            async for item in iter_values:
+                yield await _resolve(func(item))
+
+        return self.__class__(generator())
+
+    def slice(self, *args) -> Self:
+        islice((), *args)  # 与 islice 保持一致的参数校验
+        s = slice(*args)
+        start, stop, step = s.start or 0, s.stop, s.step or 1
+        iter_values = self._tee()
+
+        async def generator() -> AsyncIterator[T]:
+            if stop is not None and stop <= start:
+                return
+            index = 0
+            async for item in iter_values:
+                if index >= start and not (index - start) % step:
+                    yield item
+                index += 1
+                if stop is not None and index >= stop:
+                    return
+
+        return self.__class__(generator())
+
+    def take_while(self, func: Callable[[T], MaybeAwaitable[bool]]) -> Self:
+        iter_values = self._tee()
+
+        async def generator() -> AsyncIterator[T]:
+            async for item in iter_values:
+                if not await _resolve(func(item)):
+                    return
+                yield item
+
+        return self.__class__(generator())
@@ -0,0 +1,214 @@
+"""列式记录批次
+
+将由数值组成的记录（如 (ts, value, id) 元组）按列打包为 array.array，每条记录只占用其各列的原始字节数，
+不再是一个装着若干 Python 对象的元组。列可以以 memoryview 的形式零拷贝地读取、切片，
+使用 pickle 协议 5 时列的内容作为带外缓冲区传递，不会被复制进 pickle 数据中。
+"""
+
+import builtins
+import pickle
+from array import array, typecodes
+from collections.abc import Mapping
+from itertools import compress, islice
+from operator import itemgetter
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from typing_extensions import Self
+
+__all__ = ("Column", "RecordBatch", "Schema", "batches")
+
+Column = Union[array, memoryview]
+Schema = Union[Mapping, Sequence[Tuple[str, str]]]
+
+TYPECODES = tuple(code for code in typecodes if code not in "uw")
+"""支持的类型码：Unicode 字符列（"u"、"w"）无法通过 memoryview 零拷贝地还原，因此不被支持"""
+
+
+def _schema(schema: Schema) -> Tuple[Tuple[str, str], ...]:
+    """将 schema 规范化为 ((列名, 类型码), ...)"""
+    items = tuple(schema.items() if isinstance(schema, Mapping) else schema)
+    if not items:
+        raise ValueError("Schema must contain at least one column")
+    for name, typecode in items:
+        if typecode not in TYPECODES:
+            raise ValueError(f"Unsupported typecode for column {name!r}: {typecode!r}")
+    if len({name for name, _ in items}) != len(items):
+        raise ValueError("Column names must be unique")
+    return items
+
+
+def _rebuild(
+    schema: Tuple[Tuple[str, str], ...], buffers: Tuple[Any, ...]
+) -> "RecordBatch":
+    return RecordBatch(
+        schema,
+        [
+            memoryview(buffer).cast("B").cast(typecode)
+            for (_, typecode), buffer in zip(schema, buffers)
+        ],
+    )
+
+
+class RecordBatch:
+    """一批列式存储的记录
+
+    Args:
+        schema: {列名: array 的类型码} 或 [(列名, 类型码), ...]，如 {"ts": "d", "value": "d", "id": "q"}。
+        columns: 与 schema 一一对应的列，每一列是一个 array.array 或 memoryview，长度需要相同。
+    """
+
+    __slots__ = "schema", "columns"
+
+    schema: Tuple[Tuple[str, str], ...]
+    columns: Tuple[Column, ...]
+
+    def __init__(self, schema: Schema, columns: Sequence[Column]) -> None:
+        self.schema = _schema(schema)
+        self.columns = tuple(columns)
+        if len(self.columns) != len(self.schema):
+            raise ValueError(
+                f"Expected {len(self.schema)} columns, got {len(self.columns)}"
+            )
+        if len({len(column) for column in self.columns}) > 1:
+            raise ValueError("All columns must have the same length")
+
+    @classmethod
+    def from_records(cls, schema: Schema, records: Iterable[Any]) -> Self:
+        """由记录创建批次，记录可以是按 schema 顺序排列的序列，也可以是以列名为键的映射
+
+        序列的长度与列数不同时抛出 ValueError。
+        """
+        schema = _schema(schema)
+        records = records if isinstance(records, list) else list(records)
+        if records and isinstance(records[0], Mapping):
+            getters = [itemgetter(name) for name, _ in schema]
+            values = [map(getter, records) for getter in getters]
+        else:
+            width = len(schema)
+            for index, record in enumerate(records):
+                if len(record) != width:
+                    raise ValueError(
+                        f"Record {index} has {len(record)} fields, "
+                        f"expected {width}: {record!r}"
+                    )
+            values = zip(*records) if records else [() for _ in schema]
+        return cls(
+            schema,
+            [array(typecode, column) for (_, typecode), column in zip(schema, values)],
+        )
+
+    def __len__(self) -> int:
+        return len(self.columns[0])
+
+    def __iter__(self) -> Iterator[Tuple]:
+        """依次产出每条记录组成的元组"""
+        return zip(*self.columns)
+
+    def __getitem__(self, name: str) -> memoryview:
+        return self.column(name)
+
+    def __repr__(self) -> str:
+        columns = ", ".join(f"{name}:{typecode}" for name, typecode in self.schema)
+        return f"<{self.__class__.__name__} [{columns}] rows={len(self)}>"
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, RecordBatch):
+            return NotImplemented
+        return self.schema == other.schema and all(
+            a.tolist() == b.tolist() for a, b in zip(self.columns, other.columns)
+        )
+
+    def __reduce_ex__(self, protocol: int):
+        if protocol >= 5:
+            # 列的内容作为带外缓冲区，配合 buffer_callback 可以避免复制
+            buffers = tuple(pickle.PickleBuffer(column) for column in self.columns)
+        else:
+            buffers = tuple(memoryview(column).tobytes() for column in self.columns)
+        return _rebuild, (self.schema, buffers)
+
+    @property
+    def names(self) -> Tuple[str, ...]:
+        return tuple(name for name, _ in self.schema)
+
+    @property
+    def nbytes(self) -> int:
+        """所有列所占用的字节数"""
+        return builtins.sum(memoryview(column).nbytes for column in self.columns)
+
+    def index(self, name: str) -> int:
+        for i, (column, _) in enumerate(self.schema):
+            if column == name:
+                return i
+        raise KeyError(name)
+
+    def column(self, name: str) -> memoryview:
+        """以 memoryview 的形式零拷贝地返回一列"""
+        return memoryview(self.columns[self.index(name)])
+
+    def slice(self, start: Optional[int] = None, stop: Optional[int] = None) -> Self:
+        """零拷贝地截取 [start, stop) 之间的记录"""
+        return self.__class__(
+            self.schema,
+            [memoryview(column)[start:stop] for column in self.columns],
+        )
+
+    def map(
+        self, name: str, func: Callable[[Any], Any], typecode: Optional[str] = None
+    ) -> Self:
+        """对一列中的每个值执行 func，得到替换了这一列的新批次，其余列不会被复制
+
+        Args:
+            name: 列名。
+            func: 作用于每个值的函数。
+            typecode: 新的一列的类型码，默认与原来相同。
+        """
+        i = self.index(name)
+        typecode = typecode or self.schema[i][1]
+        schema = list(self.schema)
+        schema[i] = (name, typecode)
+        columns = list(self.columns)
+        columns[i] = array(typecode, builtins.map(func, self.columns[i]))
+        return self.__class__(schema, columns)
+
+    def filter(self, mask: Iterable[Any]) -> Self:
+        """只保留 mask 中对应位置为真的记录
+
+        例如 batch.filter(map(lambda v: v > 0, batch["value"]))
+        """
+        mask = mask if isinstance(mask, (list, tuple)) else list(mask)
+        if len(mask) != len(self):
+            raise ValueError(f"Mask length {len(mask)} does not match {len(self)} rows")
+        return self.__class__(
+            self.schema,
+            [
+                array(typecode, compress(column, mask))
+                for (_, typecode), column in zip(self.schema, self.columns)
+            ],
+        )
+
+    def sum(self, name: str, start: Any = 0) -> Any:
+        """对一列求和"""
+        return builtins.sum(self.columns[self.index(name)], start)
+
+    def records(self) -> List[Tuple]:
+        return list(self)
+
+
+def batches(records: Iterable[Any], schema: Schema, size: int) -> Iterator[RecordBatch]:
+    """将 records 每 size 条打包为一个 RecordBatch"""
+    if size <= 0:
+        raise ValueError(f"'size' must be a positive number: {size}")
+    schema = _schema(schema)
+    iterator = iter(records)
+    while chunk := list(islice(iterator, size)):
+        yield RecordBatch.from_records(schema, chunk)
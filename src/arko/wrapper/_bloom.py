@@ -0,0 +1,72 @@
+"""布隆过滤器"""
+
+import math
+from typing import Hashable
+
+__all__ = ("BloomFilter",)
+
+_MASK = (1 << 64) - 1
+
+
+class BloomFilter:
+    """固定大小的布隆过滤器
+
+    只会误判“存在”，不会误判“不存在”。内存占用只取决于 capacity 与 error_rate，
+    与实际加入的元素数量无关；当加入的元素超过 capacity 时，误判率会逐渐升高。
+
+    Args:
+        capacity: 预计加入的元素数量
+        error_rate: 在加入 capacity 个元素后期望的误判率
+    """
+
+    __slots__ = "capacity", "error_rate", "size", "hash_count", "_bits"
+
+    capacity: int
+    error_rate: float
+    size: int
+    hash_count: int
+
+    def __init__(self, capacity: int, error_rate: float = 0.01) -> None:
+        if capacity <= 0:
+            raise ValueError(f"'capacity' must be a positive number: {capacity}")
+        if not 0 < error_rate < 1:
+            raise ValueError(f"'error_rate' must be between 0 and 1: {error_rate}")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(
+            8, math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+        )
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: Hashable) -> range:
+        # 双重哈希：由一个 64 位哈希值拆出两个哈希值，h1 + i * h2 即为第 i 个位置
+        value = hash((item, 0x9E3779B9)) & _MASK
+        h1, h2 = value & 0xFFFFFFFF, (value >> 32) | 1
+        return range(h1, h1 + self.hash_count * h2, h2)
+
+    def add(self, item: Hashable) -> bool:
+        """加入 item，返回在加入之前它是否（可能）已经存在"""
+        bits, size = self._bits, self.size
+        existed = True
+        for position in self._positions(item):
+            position %= size
+            index, mask = position >> 3, 1 << (position & 7)
+            if not bits[index] & mask:
+                existed = False
+                bits[index] |= mask
+        return existed
+
+    def __contains__(self, item: Hashable) -> bool:
+        bits, size = self._bits, self.size
+        for position in self._positions(item):
+            position %= size
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__name__} capacity={self.capacity} "
+            f"error_rate={self.error_rate} size={self.size}>"
+        )
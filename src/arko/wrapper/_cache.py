@@ -0,0 +1,107 @@
+"""缓存
+
+将上游迭代器中的元素在第一次被读取时记录下来，之后的读取、按下标访问、反转与求长度都直接使用记录下的元素，
+上游的每个元素最多只会被计算一次。
+"""
+
+from typing import (
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    TypeVar,
+    Union,
+    overload,
+)
+
+__all__ = ("CachedSource",)
+
+T = TypeVar("T")
+
+
+class CachedSource(Sequence[T]):
+    """按需读取上游并缓存已读取元素的序列
+
+    只会读取到所需的位置为止：按非负下标访问或提前结束的迭代不会读完上游，
+    负下标、求长度与反转则需要读完上游。
+    """
+
+    __slots__ = "items", "_iterator"
+
+    items: List[T]
+
+    def __init__(self, iterable: Iterable[T]) -> None:
+        self.items = []
+        # 上游读完后置为 None
+        self._iterator: Optional[Iterator[T]] = iter(iterable)
+
+    @property
+    def complete(self) -> bool:
+        """上游是否已经读完"""
+        return self._iterator is None
+
+    def fill(self, count: Optional[int] = None) -> None:
+        """读取上游，直到缓存了 count 个元素或上游读完，count 为 None 时读完上游"""
+        if self._iterator is None:
+            return
+        items = self.items
+        if count is None:
+            items.extend(self._iterator)
+            self._iterator = None
+            return
+        while len(items) < count:
+            try:
+                items.append(next(self._iterator))
+            except StopIteration:
+                self._iterator = None
+                return
+
+    def __len__(self) -> int:
+        self.fill()
+        return len(self.items)
+
+    @overload
+    def __getitem__(self, index: int) -> T: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[T]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[T, List[T]]:
+        if isinstance(index, slice):
+            self.fill()
+        elif index >= 0:
+            self.fill(index + 1)
+        else:
+            self.fill()
+        return self.items[index]
+
+    def __iter__(self) -> Iterator[T]:
+        if self._iterator is None:
+            return iter(self.items)
+        return self._iterate()
+
+    def _iterate(self) -> Iterator[T]:
+        items = self.items
+        index = 0
+        while True:
+            # 其它读取者可能已经读取了更多的元素
+            while index < len(items):
+                yield items[index]
+                index += 1
+            if self._iterator is None:
+                return
+            try:
+                item = next(self._iterator)
+            except StopIteration:
+                self._iterator = None
+                return
+            items.append(item)
+
+    def __reversed__(self) -> Iterator[T]:
+        self.fill()
+        return reversed(self.items)
+
+    def __repr__(self) -> str:
+        state = "complete" if self.complete else "partial"
+        return f"<{self.__class__.__name__} {state} cached={len(self.items)}>"
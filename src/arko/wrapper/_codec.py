@@ -0,0 +1,112 @@
+"""JSON Lines 与 MessagePack 的流式读写
+
+通过 msgspec 编解码：读取时按大块读入文件，一次解码块中所有完整的行；写入时复用同一个编码缓冲区，
+攒够一大块后才写入文件。MessagePack 文件由若干块组成，每一块是一个带有 4 字节（小端）长度头部的
+MessagePack 数组。
+"""
+
+import os
+import struct
+from typing import Any, BinaryIO, Iterable, Iterator, List, Union
+
+import msgspec
+
+__all__ = (
+    "read_frames",
+    "read_jsonl",
+    "read_msgpack",
+    "write_frames",
+    "write_jsonl",
+    "write_msgpack",
+)
+
+StrOrPath = Union[str, "os.PathLike[str]"]
+
+BLOCK_SIZE = 1 << 20
+"""读取与写入文件时每一块的字节数"""
+
+FRAME = struct.Struct("<I")
+"""MessagePack 文件中每一块之前记录其字节数的头部"""
+
+
+def read_jsonl(path: StrOrPath, type: Any = Any) -> Iterator[Any]:
+    """逐行解码 JSON Lines 文件，type 为每一行的类型，用于校验与还原（例如一个 msgspec.Struct）"""
+    decoder = msgspec.json.Decoder(type)
+    with open(path, "rb") as file:
+        rest = b""
+        while block := file.read(BLOCK_SIZE):
+            end = block.rfind(b"\n")
+            if end < 0:
+                rest += block
+                continue
+            yield from decoder.decode_lines(rest + block[: end + 1])
+            rest = block[end + 1 :]
+        if rest.strip():
+            yield from decoder.decode_lines(rest)
+
+
+def write_jsonl(path: StrOrPath, items: Iterable[Any]) -> int:
+    """将每个元素编码为一行 JSON 写入文件，返回写入的行数"""
+    encoder = msgspec.json.Encoder()
+    buffer = bytearray()
+    count = 0
+    with open(path, "wb") as file:
+        for item in items:
+            encoder.encode_into(item, buffer, len(buffer))
+            buffer.append(10)  # b"\n"
+            count += 1
+            if len(buffer) >= BLOCK_SIZE:
+                file.write(buffer)
+                buffer.clear()
+        file.write(buffer)
+    return count
+
+
+def read_frames(file: BinaryIO, decoder: msgspec.msgpack.Decoder) -> Iterator[Any]:
+    """依次解码 file 中的每一块，并产出块中的元素"""
+    header = FRAME.size
+    while head := file.read(header):
+        (size,) = FRAME.unpack(head)
+        yield from decoder.decode(file.read(size))
+
+
+def write_frames(
+    file: BinaryIO, items: Iterable[Any], chunk_size: int
+) -> Iterator[Any]:
+    """每 chunk_size 个元素编码为一块写入 file，同时依次产出这些元素"""
+    if chunk_size <= 0:
+        raise ValueError(f"'chunk_size' must be a positive number: {chunk_size}")
+    encoder = msgspec.msgpack.Encoder()
+    buffer = bytearray()
+    chunk: List[Any] = []
+
+    def flush() -> None:
+        # 预留头部的位置，编码到同一个缓冲区中
+        encoder.encode_into(chunk, buffer, FRAME.size)
+        FRAME.pack_into(buffer, 0, len(buffer) - FRAME.size)
+        file.write(buffer)
+        chunk.clear()
+
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= chunk_size:
+            flush()
+        yield item
+    if chunk:
+        flush()
+
+
+def read_msgpack(path: StrOrPath, type: Any = Any) -> Iterator[Any]:
+    """读取由 write_msgpack 写入的文件，type 为每个元素的类型"""
+    decoder = msgspec.msgpack.Decoder(List[type])
+    with open(path, "rb") as file:
+        yield from read_frames(file, decoder)
+
+
+def write_msgpack(path: StrOrPath, items: Iterable[Any], chunk_size: int = 1024) -> int:
+    """每 chunk_size 个元素编码为一块 MessagePack 写入文件，返回写入的元素数量"""
+    count = 0
+    with open(path, "wb", buffering=BLOCK_SIZE) as file:
+        for _ in write_frames(file, items, chunk_size):
+            count += 1
+    return count
@@ -0,0 +1,84 @@
+"""外部排序
+
+内存中放不下的数据先按 memory_limit 分成若干段，每段排序后写入临时文件，
+最后用 heapq.merge 多路归并。
+"""
+
+import heapq
+import pickle
+import tempfile
+from itertools import islice
+from typing import IO, Any, Callable, Iterable, Iterator, List, Optional, TypeVar
+
+__all__ = ("external_sort",)
+
+T = TypeVar("T")
+
+# 每次 pickle 的元素数量，归并时每一段只需在内存中保留这么多元素
+_BLOCK_SIZE = 1024
+# 同时归并的段数的上限，超出时先将部分段归并为更长的段
+_MAX_FAN_IN = 128
+
+
+def _write_run(items: Iterable[T]) -> IO[bytes]:
+    """将已排序的元素分块写入一个临时文件"""
+    file = tempfile.TemporaryFile(prefix="arko-sort-")
+    iterator = iter(items)
+    while block := list(islice(iterator, _BLOCK_SIZE)):
+        pickle.dump(block, file, pickle.HIGHEST_PROTOCOL)
+    file.seek(0)
+    return file
+
+
+def _read_run(file: IO[bytes]) -> Iterator[T]:
+    """依次读回 _write_run 写入的元素，读完后关闭文件"""
+    with file:
+        while True:
+            try:
+                block = pickle.load(file)
+            except EOFError:
+                return
+            yield from block
+
+
+def external_sort(
+    iterable: Iterable[T],
+    key: Optional[Callable[[T], Any]] = None,
+    reverse: bool = False,
+    memory_limit: int = 1 << 20,
+) -> Iterator[T]:
+    """稳定地排序 iterable，内存中最多同时保留约 memory_limit 个元素
+
+    元素需要能被 pickle。所有元素都能放入一段时不会写入任何文件。
+    """
+    if memory_limit <= 0:
+        raise ValueError(f"'memory_limit' must be a positive number: {memory_limit}")
+    iterator = iter(iterable)
+    # levels[i] 中的每一段都由 _MAX_FAN_IN ** i 段归并而来；层数越高的段在输入中越靠前，
+    # 同时打开的临时文件因此不超过 _MAX_FAN_IN 乘以层数
+    levels: List[List[IO[bytes]]] = []
+
+    def merge(runs: List[IO[bytes]]) -> Iterator[T]:
+        return heapq.merge(*map(_read_run, runs), key=key, reverse=reverse)
+
+    try:
+        while chunk := list(islice(iterator, memory_limit)):
+            chunk.sort(key=key, reverse=reverse)
+            if not levels and len(chunk) < memory_limit:
+                yield from chunk
+                return
+            run = _write_run(chunk)
+            del chunk
+            for runs in levels:
+                runs.append(run)
+                if len(runs) < _MAX_FAN_IN:
+                    break
+                run = _write_run(merge(runs))
+                runs.clear()
+            else:
+                levels.append([run])
+        yield from merge([run for runs in reversed(levels) for run in runs])
+    finally:
+        for runs in levels:
+            for file in runs:
+                file.close()
@@ -0,0 +1,169 @@
+"""内存映射的文件
+
+通过 mmap 读取文件，按行或按定长记录产出内容，不经过缓冲读取；按字节读取行时产出的是 mmap 的 memoryview 切片，
+不会为每一行分配新的对象。文件还可以被切分为若干与行（或记录）边界对齐的字节范围，交给多个工作者分别读取。
+"""
+
+import mmap
+import os
+import struct
+from typing import Iterator, List, Optional, Tuple, Union
+
+__all__ = ("FileSource",)
+
+StrOrPath = Union[str, "os.PathLike[str]"]
+
+
+class FileSource:
+    """以 mmap 读取的文件（或文件中的一段字节范围），可以被多次迭代，也可以被 pickle
+
+    Args:
+        path: 文件路径。
+        mode: "lines" 产出解码后的 str；"bytes-lines" 产出 memoryview；
+            "struct:<fmt>" 按 struct 格式 fmt 将定长记录解包为元组，例如 "struct:<dqd"。
+            按行读取时以 b"\\n" 分行，并保留行尾。
+        encoding: mode 为 "lines" 时使用的编码。
+        errors: 解码出错时的处理方式。
+        start: 起始的字节偏移。
+        end: 结束的字节偏移（不含），默认为文件末尾。
+    """
+
+    __slots__ = "path", "mode", "encoding", "errors", "start", "end", "_struct"
+
+    def __init__(
+        self,
+        path: StrOrPath,
+        mode: str = "lines",
+        *,
+        encoding: str = "utf-8",
+        errors: str = "strict",
+        start: int = 0,
+        end: Optional[int] = None,
+    ) -> None:
+        self._struct: Optional[struct.Struct] = None
+        if mode.startswith("struct:"):
+            self._struct = struct.Struct(mode[len("struct:") :])
+            if not self._struct.size:
+                raise ValueError(f"Record format must not be empty: {mode!r}")
+        elif mode not in ("lines", "bytes-lines"):
+            raise ValueError(f"Unsupported mode: {mode!r}")
+        self.path = os.fspath(path)
+        self.mode = mode
+        self.encoding = encoding
+        self.errors = errors
+        self.start = start
+        self.end = os.path.getsize(self.path) if end is None else end
+        if not 0 <= self.start <= self.end:
+            raise ValueError(f"Invalid byte range: [{self.start}, {self.end})")
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__name__} {self.path!r} mode={self.mode!r} "
+            f"range=[{self.start}, {self.end})>"
+        )
+
+    def __reduce__(self):
+        return _restore, (
+            self.path,
+            self.mode,
+            self.encoding,
+            self.errors,
+            self.start,
+            self.end,
+        )
+
+    def __length_hint__(self) -> int:
+        if self._struct is not None:
+            return (self.end - self.start) // self._struct.size
+        return NotImplemented
+
+    def __iter__(self) -> Iterator:
+        if self.start == self.end:
+            return
+        with open(self.path, "rb") as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if len(mapped) < self.end:
+                raise ValueError(f"{self.path!r} is shorter than {self.end} bytes")
+            if self._struct is not None:
+                yield from self._records(mapped)
+            elif self.mode == "lines":
+                for start, stop in self._lines(mapped):
+                    yield str(mapped[start:stop], self.encoding, self.errors)
+            else:
+                view = memoryview(mapped)
+                try:
+                    for start, stop in self._lines(mapped):
+                        yield view[start:stop]
+                finally:
+                    view.release()
+        finally:
+            try:
+                mapped.close()
+            except BufferError:
+                # 仍有 memoryview 在使用 mmap，留给垃圾回收关闭
+                pass
+
+    def _lines(self, mapped: mmap.mmap) -> Iterator[Tuple[int, int]]:
+        """依次产出每一行的 (起始偏移, 结束偏移)"""
+        position, end = self.start, self.end
+        find = mapped.find
+        while position < end:
+            stop = find(b"\n", position, end)
+            stop = end if stop < 0 else stop + 1
+            yield position, stop
+            position = stop
+
+    def _records(self, mapped: mmap.mmap) -> Iterator[tuple]:
+        size = self._struct.size
+        length = self.end - self.start
+        if length % size:
+            raise ValueError(
+                f"Byte range of {length} bytes is not a multiple of the record size {size}"
+            )
+        with memoryview(mapped) as view:
+            with view[self.start : self.end] as records:
+                yield from self._struct.iter_unpack(records)
+
+    def _align(self, mapped: mmap.mmap, offset: int) -> int:
+        """将 offset 向后对齐到下一行（或下一条记录）的开头"""
+        if offset <= self.start:
+            return self.start
+        if self._struct is not None:
+            size = self._struct.size
+            return min(self.end, self.start + -(-(offset - self.start) // size) * size)
+        newline = mapped.find(b"\n", offset - 1, self.end)
+        return self.end if newline < 0 else newline + 1
+
+    def split(self, n: int) -> List["FileSource"]:
+        """将字节范围切分为至多 n 段与行（或记录）边界对齐的部分
+
+        每一行（或记录）恰好属于其中一段，行较长或文件较小时得到的段数可能少于 n。
+        """
+        if n <= 0:
+            raise ValueError(f"'n' must be a positive number: {n}")
+        length = self.end - self.start
+        if n == 1 or length == 0:
+            return [self._part(self.start, self.end)]
+        with open(self.path, "rb") as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                bounds = [
+                    self._align(mapped, self.start + length * i // n) for i in range(n)
+                ]
+        bounds.append(self.end)
+        return [
+            self._part(start, stop)
+            for start, stop in zip(bounds, bounds[1:])
+            if start < stop
+        ]
+
+    def _part(self, start: int, end: int) -> "FileSource":
+        return _restore(self.path, self.mode, self.encoding, self.errors, start, end)
+
+
+def _restore(
+    path: str, mode: str, encoding: str, errors: str, start: int, end: int
+) -> FileSource:
+    return FileSource(
+        path, mode, encoding=encoding, errors=errors, start=start, end=end
+    )
@@ -0,0 +1,64 @@
+"""长度提示
+
+记录流水线中每一步输出的长度（精确值或估计值），使 len() 与收集为容器时无需额外遍历一次。
+"""
+
+from operator import length_hint
+from typing import Iterable, Iterator, NamedTuple, Optional, TypeVar
+
+__all__ = ("Hinted", "LengthHint", "chunk_count", "estimate", "slice_length")
+
+T = TypeVar("T")
+
+
+class LengthHint(NamedTuple):
+    """长度提示
+
+    Attributes:
+        length: 长度；exact 为 False 时是一个估计值或上限
+        exact: 是否为精确值
+    """
+
+    length: int
+    exact: bool = True
+
+
+class Hinted(Iterable[T]):
+    """带有长度提示的可迭代对象
+
+    list()、tuple() 等会根据 __length_hint__ 预先分配空间，之后直接迭代原本的迭代器。
+    """
+
+    __slots__ = "iterator", "length"
+
+    def __init__(self, iterator: Iterator[T], length: int) -> None:
+        self.iterator = iterator
+        self.length = length
+
+    def __iter__(self) -> Iterator[T]:
+        return self.iterator
+
+    def __length_hint__(self) -> int:
+        return self.length
+
+
+def estimate(iterable: Iterable) -> Optional[LengthHint]:
+    """通过 operator.length_hint 估计 iterable 的长度"""
+    length = length_hint(iterable, -1)
+    return None if length < 0 else LengthHint(length, False)
+
+
+def slice_length(
+    length: int, start: Optional[int], stop: Optional[int], step: Optional[int]
+) -> int:
+    """长度为 length 的迭代器经过 islice(start, stop, step) 之后的长度"""
+    start = start or 0
+    stop = length if stop is None else min(stop, length)
+    return len(range(start, stop, step or 1))
+
+
+def chunk_count(length: int, n: Optional[int]) -> int:
+    """长度为 length 的迭代器每 n 个分为一块后的块数，n 为 None 时视为一块"""
+    if n is None:
+        return 1 if length else 0
+    return -(-length // n)
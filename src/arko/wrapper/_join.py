@@ -0,0 +1,202 @@
+"""连接
+
+按 key 连接两个可迭代对象：哈希连接在较小的一侧上建立哈希表，再让另一侧流过；
+两侧都已按 key 排好序时，归并连接只需同时向前读取两侧，额外的内存只与相同 key 的右侧元素的数量有关。
+"""
+
+from itertools import groupby
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+__all__ = ("JoinType", "hash_join", "merge_join")
+
+L = TypeVar("L")
+R = TypeVar("R")
+
+JoinType = Literal["inner", "left", "outer", "semi", "anti"]
+
+JOIN_TYPES = ("inner", "left", "outer", "semi", "anti")
+
+_END = object()
+
+
+def _check(how: str) -> None:
+    if how not in JOIN_TYPES:
+        raise ValueError(f"Unsupported join type: {how!r}")
+
+
+def hash_join(
+    left: Iterable[L],
+    right: Iterable[R],
+    left_key: Callable[[L], Any],
+    right_key: Callable[[R], Any],
+    how: JoinType = "inner",
+    build_left: bool = False,
+) -> Iterator[Any]:
+    """哈希连接
+
+    build_left 为 False 时在右侧上建立哈希表，结果按左侧的顺序产出；
+    为 True 时在左侧上建立哈希表并让右侧流过，没有匹配的左侧元素在最后产出。
+    inner、left、outer 产出 (左, 右)，缺少的一侧为 None；semi、anti 产出有、没有匹配的左侧元素。
+    """
+    _check(how)
+    return (_build_left if build_left else _build_right)(
+        left, right, left_key, right_key, how
+    )
+
+
+def _build_right(
+    left: Iterable[L],
+    right: Iterable[R],
+    left_key: Callable[[L], Any],
+    right_key: Callable[[R], Any],
+    how: JoinType,
+) -> Iterator[Any]:
+    if how in ("semi", "anti"):
+        keys = set(map(right_key, right))
+        keep = how == "semi"
+        for item in left:
+            if (left_key(item) in keys) is keep:
+                yield item
+        return
+
+    table: Dict[Any, List[R]] = {}
+    for item in right:
+        table.setdefault(right_key(item), []).append(item)
+    matched = set()
+    for item in left:
+        key = left_key(item)
+        group = table.get(key)
+        if group is None:
+            if how != "inner":
+                yield item, None
+            continue
+        if how == "outer":
+            matched.add(key)
+        for other in group:
+            yield item, other
+    if how == "outer":
+        for key, group in table.items():
+            if key not in matched:
+                for other in group:
+                    yield None, other
+
+
+def _build_left(
+    left: Iterable[L],
+    right: Iterable[R],
+    left_key: Callable[[L], Any],
+    right_key: Callable[[R], Any],
+    how: JoinType,
+) -> Iterator[Any]:
+    table: Dict[Any, List[L]] = {}
+    for item in left:
+        table.setdefault(left_key(item), []).append(item)
+    matched = set()
+    for other in right:
+        key = right_key(other)
+        group = table.get(key)
+        if group is None:
+            if how == "outer":
+                yield None, other
+            continue
+        matched.add(key)
+        if how in ("inner", "left", "outer"):
+            for item in group:
+                yield item, other
+    if how == "semi":
+        for key, group in table.items():
+            if key in matched:
+                yield from group
+    elif how in ("left", "outer", "anti"):
+        for key, group in table.items():
+            if key not in matched:
+                for item in group:
+                    yield item if how == "anti" else (item, None)
+
+
+def _groups(
+    iterable: Iterable, key: Callable[[Any], Any], side: str
+) -> Iterator[Tuple[Any, Iterator]]:
+    """按 key 分组，并检查 key 是否单调不减"""
+    previous = _END
+    for k, group in groupby(iterable, key):
+        if previous is not _END and k < previous:
+            raise ValueError(f"The {side} side is not sorted by key: {k!r}")
+        previous = k
+        yield k, group
+
+
+def merge_join(
+    left: Iterable[L],
+    right: Iterable[R],
+    left_key: Callable[[L], Any],
+    right_key: Callable[[R], Any],
+    how: JoinType = "inner",
+) -> Iterator[Any]:
+    """归并连接，两侧都需要已按 key 从小到大排好序，结果按 key 的顺序产出
+
+    左侧的元素逐个流过，只有同一个 key 的右侧元素会被暂存。产出的内容与 hash_join 相同。
+    """
+    _check(how)
+    return _merge_join(left, right, left_key, right_key, how)
+
+
+def _merge_join(
+    left: Iterable[L],
+    right: Iterable[R],
+    left_key: Callable[[L], Any],
+    right_key: Callable[[R], Any],
+    how: JoinType,
+) -> Iterator[Any]:
+    lefts = _groups(left, left_key, "left")
+    rights = _groups(right, right_key, "right")
+    current_left: Optional[Tuple[Any, Iterator[L]]] = next(lefts, None)
+    current_right: Optional[Tuple[Any, Iterator[R]]] = next(rights, None)
+    while current_left is not None and current_right is not None:
+        key, items = current_left
+        other_key, others = current_right
+        if key < other_key:
+            if how in ("left", "outer"):
+                for item in items:
+                    yield item, None
+            elif how == "anti":
+                yield from items
+            current_left = next(lefts, None)
+        elif other_key < key:
+            if how == "outer":
+                for other in others:
+                    yield None, other
+            current_right = next(rights, None)
+        else:
+            if how == "semi":
+                yield from items
+            elif how != "anti":
+                group = list(others)
+                for item in items:
+                    for other in group:
+                        yield item, other
+            current_left = next(lefts, None)
+            current_right = next(rights, None)
+    while current_left is not None:
+        if how in ("left", "outer"):
+            for item in current_left[1]:
+                yield item, None
+        elif how == "anti":
+            yield from current_left[1]
+        current_left = next(lefts, None)
+    if how == "outer":
+        while current_right is not None:
+            for other in current_right[1]:
+                yield None, other
+            current_right = next(rights, None)
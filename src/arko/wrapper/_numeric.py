@@ -0,0 +1,259 @@
+"""基于 NumPy 的数值模式
+
+将数值流按块读入 ndarray，accumulate / sort / unique 以及求和等归约操作都会以数组运算的方式执行。
+map / filter 只对 ufunc 或显式指定 vectorize=True 的函数以整个数组调用，其它函数逐个元素地调用。
+"""
+
+import builtins
+import operator
+from itertools import islice
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+__all__ = (
+    "Chunks",
+    "DEFAULT_CHUNK_SIZE",
+    "accumulate_ufunc",
+    "accumulate_chunks",
+    "filter_chunks",
+    "map_chunks",
+    "numpy",
+    "scalar",
+    "sort_chunks",
+    "split_array",
+    "to_arrays",
+    "top_chunks",
+    "unique_chunks",
+)
+
+T = TypeVar("T")
+
+DEFAULT_CHUNK_SIZE = 1 << 16
+"""每个块默认包含的元素数量"""
+
+_ACCUMULATE_UFUNCS = {
+    operator.add: "add",
+    operator.mul: "multiply",
+    operator.and_: "bitwise_and",
+    operator.or_: "bitwise_or",
+    operator.xor: "bitwise_xor",
+    builtins.max: "maximum",
+    builtins.min: "minimum",
+}
+_ASSOCIATIVE_UFUNCS = frozenset(
+    {
+        "add",
+        "multiply",
+        "bitwise_and",
+        "bitwise_or",
+        "bitwise_xor",
+        "maximum",
+        "minimum",
+        "fmax",
+        "fmin",
+        "logical_and",
+        "logical_or",
+        "logical_xor",
+    }
+)
+
+
+class Chunks(Iterable[T]):
+    """由若干个一维 ndarray 组成的可迭代对象
+
+    迭代时产出的是 Python 对象而非 NumPy 标量。arrays 需要能被多次迭代。
+    """
+
+    __slots__ = "arrays", "chunk_size"
+
+    arrays: Iterable["numpy.ndarray"]
+    chunk_size: int
+
+    def __init__(
+        self, arrays: Iterable["numpy.ndarray"], chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> None:
+        self.arrays = arrays
+        self.chunk_size = chunk_size
+
+    def __iter__(self) -> Iterator[T]:
+        for array in self.arrays:
+            yield from array.tolist()
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} chunk_size={self.chunk_size}>"
+
+
+def scalar(value: Any) -> Any:
+    """将 NumPy 标量转换为对应的 Python 对象"""
+    return value.item() if isinstance(value, numpy.generic) else value
+
+
+def _object_array(items: Iterable[Any], count: int = -1) -> "numpy.ndarray":
+    return numpy.fromiter(items, dtype=object, count=count)
+
+
+def split_array(array: "numpy.ndarray", chunk_size: int) -> Tuple["numpy.ndarray", ...]:
+    """将 array 切分为若干个视图"""
+    return tuple(array[i : i + chunk_size] for i in range(0, len(array), chunk_size))
+
+
+def to_arrays(
+    iterable: Iterable[Any], dtype: Any = None, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator["numpy.ndarray"]:
+    """将 iterable 按块读入一维 ndarray，无法构成一维数值数组的块会成为 object 数组"""
+    iterator = iter(iterable)
+    while items := list(islice(iterator, chunk_size)):
+        try:
+            array = numpy.array(items, dtype=dtype)
+        except (TypeError, ValueError):
+            array = None
+        if array is None or array.ndim != 1:
+            array = _object_array(items, len(items))
+        yield array
+
+
+def _should_vectorize(func: Callable, vectorize: Optional[bool]) -> bool:
+    """是否以整个数组调用 func：默认只对 ufunc 这样做，避免普通函数收到意料之外的数组"""
+    return isinstance(func, numpy.ufunc) if vectorize is None else vectorize
+
+
+def map_chunks(
+    arrays: Iterable["numpy.ndarray"],
+    func: Callable[[Any], Any],
+    vectorize: Optional[bool] = None,
+) -> Iterator["numpy.ndarray"]:
+    """对每个块执行 map
+
+    vectorize 为 True 时以整个数组调用 func；为 None 时只有 func 是 ufunc 才这样做，否则逐个元素地调用。
+    """
+    vectorize = _should_vectorize(func, vectorize)
+    for array in arrays:
+        if vectorize:
+            yield func(array)
+        else:
+            yield _object_array(map(func, array.tolist()), len(array))
+
+
+def filter_chunks(
+    arrays: Iterable["numpy.ndarray"],
+    func: Optional[Callable[[Any], Any]],
+    vectorize: Optional[bool] = None,
+    invert: bool = False,
+) -> Iterator["numpy.ndarray"]:
+    """对每个块执行 filter，以数组调用 func 时其结果会被当作布尔掩码，vectorize 同 map_chunks"""
+    vectorize = func is not None and _should_vectorize(func, vectorize)
+    for array in arrays:
+        if func is None:
+            mask = array.astype(bool)
+        elif vectorize:
+            mask = func(array)
+        else:
+            mask = numpy.fromiter(
+                map(bool, map(func, array.tolist())), dtype=bool, count=len(array)
+            )
+        mask = mask.astype(bool, copy=False)
+        yield array[~mask if invert else mask]
+
+
+def accumulate_ufunc(func: Callable) -> Optional["numpy.ufunc"]:
+    """返回与 func 等价且满足结合律的二元 ufunc，不存在时返回 None"""
+    if isinstance(func, numpy.ufunc):
+        ufunc = func
+    elif func in _ACCUMULATE_UFUNCS:
+        ufunc = getattr(numpy, _ACCUMULATE_UFUNCS[func])
+    else:
+        return None
+    return ufunc if ufunc.__name__ in _ASSOCIATIVE_UFUNCS else None
+
+
+def accumulate_chunks(
+    arrays: Iterable["numpy.ndarray"], ufunc: "numpy.ufunc", initial: Any = None
+) -> Iterator["numpy.ndarray"]:
+    """对每个块执行累积运算，并将前一个块的最终结果带入下一个块"""
+    carry = initial
+    if initial is not None:
+        yield numpy.array([initial])
+    for array in arrays:
+        if not len(array):
+            continue
+        result = ufunc.accumulate(array)
+        if carry is not None:
+            result = ufunc(carry, result)
+        carry = result[-1]
+        yield result
+
+
+def _concatenate(arrays: Iterable["numpy.ndarray"]) -> "numpy.ndarray":
+    arrays = list(arrays)
+    if not arrays:
+        return numpy.array([])
+    return numpy.concatenate(arrays) if len(arrays) > 1 else arrays[0]
+
+
+def sort_chunks(
+    arrays: Iterable["numpy.ndarray"], reverse: bool = False, chunk_size: int = 0
+) -> Iterator["numpy.ndarray"]:
+    """将所有块合并后排序"""
+    array = numpy.sort(_concatenate(arrays), kind="stable")
+    if reverse:
+        array = array[::-1]
+    yield from split_array(array, chunk_size or len(array) or 1)
+
+
+def top_chunks(arrays: Iterable["numpy.ndarray"], k: int, largest: bool) -> List:
+    """返回所有块中最大（或最小）的 k 个元素，按从大到小（或从小到大）排列
+
+    每读入一块就用 numpy.partition 只留下 k 个候选，内存占用只与 k 和块的大小有关。
+    """
+    best = None
+    for array in arrays:
+        if best is not None:
+            array = numpy.concatenate((best, array))
+        if len(array) > k:
+            array = (
+                numpy.partition(array, len(array) - k)[len(array) - k :]
+                if largest
+                else numpy.partition(array, k - 1)[:k]
+            )
+        best = array
+    if best is None:
+        return []
+    array = numpy.sort(best, kind="stable")
+    return (array[::-1][:k] if largest else array[:k]).tolist()
+
+
+def unique_chunks(
+    arrays: Iterable["numpy.ndarray"], chunk_size: int = 0
+) -> Iterator["numpy.ndarray"]:
+    """将所有块合并后去重，保留每个值第一次出现的位置与顺序"""
+    array = _concatenate(arrays)
+    try:
+        _, index = numpy.unique(array, return_index=True)
+    except TypeError:
+        seen, items = set(), []
+        for item in array.tolist():
+            try:
+                if item in seen:
+                    continue
+                seen.add(item)
+            except TypeError:
+                if item in items:
+                    continue
+            items.append(item)
+        array = _object_array(items, len(items))
+    else:
+        array = array[numpy.sort(index)]
+    yield from split_array(array, chunk_size or len(array) or 1)
@@ -0,0 +1,151 @@
+"""并行执行
+
+将元素按块提交给线程池或进程池执行，同时限制正在执行中的块的数量，
+因此即使上游是无限的迭代器，也只会被按需读取。
+"""
+
+import os
+from collections import deque
+from concurrent.futures import (
+    Executor,
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from copy import deepcopy
+from functools import reduce
+from itertools import islice
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+__all__ = ("ExecutorType", "fold_chunk", "parallel", "tree_reduce")
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+ExecutorType = Union[Literal["thread", "process"], Executor]
+
+
+def map_chunk(func: Callable[[T], R], items: List[T]) -> List[R]:
+    return [func(item) for item in items]
+
+
+def filter_chunk(func: Callable[[T], Any], items: List[T]) -> List[T]:
+    return [item for item in items if func(item)]
+
+
+def filter_false_chunk(func: Callable[[T], Any], items: List[T]) -> List[T]:
+    return [item for item in items if not func(item)]
+
+
+def fold_chunk(func: Tuple[R, Callable[[R, T], R]], items: List[T]) -> List[R]:
+    """以 zero 的副本为初值，用 step 依次折叠一个块，func 为 (zero, step)"""
+    zero, step = func
+    return [reduce(step, items, deepcopy(zero))]
+
+
+def tree_reduce(partials: Iterable[R], combine: Callable[[R, R], R], zero: R) -> R:
+    """按顺序将 partials 两两合并为一棵平衡的树
+
+    每个新的部分结果到达时立即与栈顶相同高度的结果合并，只保留 O(log n) 个尚未合并的结果，
+    且只要求 combine 满足结合律。partials 为空时返回 zero。
+    """
+    stack: List[Tuple[int, R]] = []
+    for partial in partials:
+        height = 0
+        while stack and stack[-1][0] == height:
+            partial = combine(stack.pop()[1], partial)
+            height += 1
+        stack.append((height, partial))
+    if not stack:
+        return zero
+    result = stack.pop()[1]
+    while stack:
+        result = combine(stack.pop()[1], result)
+    return result
+
+
+def _create_executor(executor: ExecutorType, workers: Optional[int]) -> Executor:
+    if executor == "thread":
+        return ThreadPoolExecutor(workers)
+    elif executor == "process":
+        return ProcessPoolExecutor(workers)
+    raise ValueError(f"Unsupported executor: {executor!r}")
+
+
+def parallel(
+    iterable: Iterable[T],
+    worker: Callable[[Callable, List[T]], List[R]],
+    func: Callable,
+    *,
+    executor: ExecutorType = "thread",
+    workers: Optional[int] = None,
+    chunk_size: int = 1,
+    ordered: bool = True,
+    max_pending: Optional[int] = None,
+) -> Iterator[R]:
+    """将 iterable 按块交给 worker(func, chunk) 并行执行，并依次产出结果
+
+    Args:
+        iterable: 输入的元素。
+        worker: 在线程或进程中处理一个块的函数，使用进程池时需要能被 pickle。
+        func: 传给 worker 的函数，使用进程池时需要能被 pickle。
+        executor: "thread"、"process" 或一个已有的 Executor。已有的 Executor 不会被关闭。
+        workers: 新建的池中工作者的数量，默认为 CPU 的数量。
+        chunk_size: 每个块包含的元素数量。
+        ordered: 是否按输入的顺序产出结果；为 False 时先完成的块先产出。
+        max_pending: 同时提交的块的上限，默认为工作者数量的两倍。
+    """
+    if chunk_size <= 0:
+        raise ValueError(f"'chunk_size' must be a positive number: {chunk_size}")
+    if workers is not None and workers <= 0:
+        raise ValueError(f"'workers' must be a positive number: {workers}")
+    if max_pending is None:
+        max_pending = 2 * (workers or os.cpu_count() or 1)
+    elif max_pending <= 0:
+        raise ValueError(f"'max_pending' must be a positive number: {max_pending}")
+
+    owned = not isinstance(executor, Executor)
+    pool = _create_executor(executor, workers) if owned else executor
+    iterator = iter(iterable)
+    pending: deque[Future] = deque()
+
+    def submit() -> bool:
+        chunk = list(islice(iterator, chunk_size))
+        if chunk:
+            pending.append(pool.submit(worker, func, chunk))
+        return bool(chunk)
+
+    try:
+        while len(pending) < max_pending and submit():
+            pass
+        if ordered:
+            while pending:
+                results = pending.popleft().result()
+                submit()
+                yield from results
+        else:
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pending.remove(future)
+                    submit()
+                for future in done:
+                    yield from future.result()
+    finally:
+        for future in pending:
+            future.cancel()
+        if owned:
+            pool.shutdown(wait=False, cancel_futures=True)
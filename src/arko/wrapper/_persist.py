@@ -0,0 +1,163 @@
+"""磁盘缓存
+
+将流水线的输出按块编码为 MessagePack 写入缓存目录，文件名由数据源与操作的指纹决定。
+命中时直接从文件中逐块解码产出，不再执行上游；缓存的总大小超出上限时，最久未被使用的条目会被删除。
+"""
+
+import hashlib
+import os
+import tempfile
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, Union
+
+import msgspec
+
+from arko.wrapper._codec import BLOCK_SIZE, read_frames, write_frames
+
+__all__ = ("DiskCache", "fingerprint", "source_fingerprint")
+
+StrOrPath = Union[str, "os.PathLike[str]"]
+
+SUFFIX = ".arko"
+"""缓存条目的文件后缀"""
+
+_VERSION = 1
+"""缓存格式的版本，格式改变时旧的条目自然失效"""
+
+
+def source_fingerprint(path: StrOrPath, content: bool = False) -> List[Any]:
+    """数据源文件的指纹：默认为 (路径, 修改时间, 大小)，content 为 True 时为内容的 SHA-256"""
+    path = os.path.abspath(os.fspath(path))
+    if not content:
+        stat = os.stat(path)
+        return [path, stat.st_mtime_ns, stat.st_size]
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        while block := file.read(1 << 20):
+            digest.update(block)
+    return [digest.hexdigest()]
+
+
+def _step_key(value: Any) -> Any:
+    """将操作中的函数替换为其限定名，使其可以被编码"""
+    if callable(value):
+        module = getattr(value, "__module__", "")
+        return f"{module}.{getattr(value, '__qualname__', repr(value))}"
+    elif isinstance(value, (list, tuple)):
+        return [_step_key(item) for item in value]
+    return value
+
+
+def fingerprint(key: Any, sources: Sequence[List[Any]] = ()) -> str:
+    """由操作的标识 key 与各数据源的指纹计算缓存条目的名称
+
+    key 可以是任何 msgspec 能编码的值，或者一个 PipelineSpec（按其各步的方法名、函数的限定名与参数）。
+    """
+    steps = getattr(key, "steps", None)
+    if steps is not None:
+        key = [
+            [step.name, _step_key(step.args), _step_key(step.kwargs)] for step in steps
+        ]
+    try:
+        data = msgspec.msgpack.encode([_VERSION, key, list(sources)])
+    except (TypeError, msgspec.EncodeError) as e:
+        raise TypeError(f"Cache key cannot be encoded: {key!r}") from e
+    return hashlib.sha256(data).hexdigest()
+
+
+class DiskCache:
+    """以目录保存的缓存，按最近使用的时间淘汰条目
+
+    Args:
+        directory: 缓存目录，不存在时会被创建。
+        max_bytes: 所有条目的总字节数上限，None 表示不限制。
+    """
+
+    __slots__ = "directory", "max_bytes"
+
+    def __init__(self, directory: StrOrPath, max_bytes: Optional[int] = None) -> None:
+        if max_bytes is not None and max_bytes <= 0:
+            raise ValueError(f"'max_bytes' must be a positive number: {max_bytes}")
+        self.directory = os.fspath(directory)
+        self.max_bytes = max_bytes
+        os.makedirs(self.directory, exist_ok=True)
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__name__} {self.directory!r} max_bytes={self.max_bytes}>"
+        )
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.directory, name + SUFFIX)
+
+    def __contains__(self, name: str) -> bool:
+        return os.path.exists(self.path(name))
+
+    def __len__(self) -> int:
+        return sum(1 for name in os.listdir(self.directory) if name.endswith(SUFFIX))
+
+    def read(self, name: str, type: Any = Any) -> Optional[Iterator[Any]]:
+        """打开条目，返回逐块解码并产出其中元素的迭代器，条目不存在时返回 None
+
+        type 为每个元素的类型，用于校验与还原（例如元组或 msgspec.Struct），默认按 MessagePack 的原样解码。
+        """
+        path = self.path(name)
+        try:
+            file = open(path, "rb")
+        except FileNotFoundError:
+            return None
+        # 以修改时间作为最近使用的时间
+        os.utime(path)
+        return self._read(file, msgspec.msgpack.Decoder(List[type]))
+
+    @staticmethod
+    def _read(file: Any, decoder: msgspec.msgpack.Decoder) -> Iterator[Any]:
+        with file:
+            yield from read_frames(file, decoder)
+
+    def write(
+        self, name: str, iterable: Iterable[Any], chunk_size: int
+    ) -> Iterator[Any]:
+        """依次产出 iterable 中的元素，同时将它们写入条目
+
+        只有 iterable 被完整读取后条目才会生效；提前停止读取时写了一半的文件会被删除。
+        """
+        if chunk_size <= 0:
+            raise ValueError(f"'chunk_size' must be a positive number: {chunk_size}")
+        fd, temp = tempfile.mkstemp(suffix=".tmp", dir=self.directory)
+        committed = False
+        try:
+            with open(fd, "wb", buffering=BLOCK_SIZE) as file:
+                yield from write_frames(file, iterable, chunk_size)
+            os.replace(temp, self.path(name))
+            committed = True
+        finally:
+            if not committed:
+                try:
+                    os.unlink(temp)
+                except FileNotFoundError:
+                    pass
+        self.evict()
+
+    def evict(self) -> None:
+        """删除最久未被使用的条目，直到总字节数不超过 max_bytes"""
+        if self.max_bytes is None:
+            return
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith(SUFFIX):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total -= size
@@ -0,0 +1,191 @@
+"""惰性流水线
+
+将连续的 map / filter / take_while / drop_while / slice / enumerate 操作记录下来，
+在消费时编译成一个单独的循环执行，避免逐层嵌套的生成器与 deque 的开销。
+"""
+
+from functools import lru_cache
+from itertools import islice
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+__all__ = ("Operation", "Pipeline", "fuse")
+
+T = TypeVar("T")
+
+FUSIBLE_OPERATIONS = frozenset(
+    {"map", "filter", "filter_false", "take_while", "drop_while", "slice", "enumerate"}
+)
+"""可以被融合的操作"""
+
+MAX_FUSED_OPERATIONS = 48
+"""单个融合循环中最多包含的操作数，超出部分会被拆分为多个循环串联"""
+
+
+class Operation(NamedTuple):
+    """流水线中的一个操作
+
+    Attributes:
+        kind: 操作的种类，见 ``FUSIBLE_OPERATIONS``
+        func: 操作使用的函数
+        args: 操作的其它参数
+    """
+
+    kind: str
+    func: Optional[Callable] = None
+    args: Tuple[Any, ...] = ()
+
+    def __repr__(self) -> str:
+        name = getattr(self.func, "__name__", None)
+        return self.kind if name is None else f"{self.kind}({name})"
+
+
+def _slice_variant(args: Tuple[Any, ...]) -> Tuple[bool, bool, bool]:
+    start, stop, step = args
+    return start > 0, stop is not None, step > 1
+
+
+@lru_cache(maxsize=256)
+def _compile(signature: Tuple[Tuple[str, Any], ...]) -> Callable[..., Iterator]:
+    """根据操作的签名生成融合后的生成器函数
+
+    相同签名的流水线会共用同一个函数，操作所需的函数与参数在调用时传入。
+    """
+    names: List[str] = []
+    setup: List[str] = []
+    body: List[Tuple[int, str]] = []
+    posts: List[Tuple[int, str]] = []
+    indent = 2
+
+    for i, (kind, variant) in enumerate(signature):
+        if kind == "map":
+            names.append(f"f{i}")
+            body.append((indent, f"x = f{i}(x)"))
+        elif kind == "filter":
+            names.append(f"f{i}")
+            body.append((indent, f"if f{i}(x):"))
+            indent += 1
+        elif kind == "filter_false":
+            names.append(f"f{i}")
+            body.append((indent, f"if not f{i}(x):"))
+            indent += 1
+        elif kind == "take_while":
+            names.append(f"f{i}")
+            body.append((indent, f"if not f{i}(x):"))
+            body.append((indent + 1, "return"))
+        elif kind == "drop_while":
+            names.append(f"f{i}")
+            setup.append(f"d{i} = True")
+            body.append((indent, f"if not d{i} or not f{i}(x):"))
+            body.append((indent + 1, f"d{i} = False"))
+            indent += 1
+        elif kind == "enumerate":
+            names.append(f"m{i}")
+            setup.append(f"n{i} = 0")
+            body.append((indent, f"x = (n{i}, x)"))
+            body.append((indent, f"n{i} += 1"))
+            posts.append((indent, f"if n{i} >= m{i}: return"))
+        elif kind == "slice":
+            has_start, has_stop, has_step = variant
+            names.extend((f"a{i}", f"b{i}", f"s{i}"))
+            setup.append(f"c{i} = 0")
+            if has_stop:
+                setup.append(f"if b{i} <= a{i}: return")
+            body.append((indent, f"c{i} += 1"))
+            if has_stop:
+                posts.append((indent, f"if c{i} >= b{i}: return"))
+            if has_start and has_step:
+                body.append(
+                    (indent, f"if c{i} > a{i} and not (c{i} - a{i} - 1) % s{i}:")
+                )
+                indent += 1
+            elif has_start:
+                body.append((indent, f"if c{i} > a{i}:"))
+                indent += 1
+            elif has_step:
+                body.append((indent, f"if not (c{i} - 1) % s{i}:"))
+                indent += 1
+        else:  # pragma: no cover
+            raise ValueError(f"Unsupported operation: {kind}")
+
+    body.append((indent, "yield x"))
+    body.extend(reversed(posts))
+
+    lines = ["def fused(iterator, params):"]
+    if names:
+        lines.append(f"    {', '.join(names)}, = params")
+    lines.extend(f"    {line}" for line in setup)
+    lines.append("    for x in iterator:")
+    lines.extend("    " * level + line for level, line in body)
+
+    namespace = {}
+    exec(compile("\n".join(lines), "<arko-fused>", "exec"), namespace)
+    return namespace["fused"]
+
+
+def _params(operation: Operation) -> Tuple[Any, ...]:
+    if operation.kind == "slice":
+        return operation.args
+    elif operation.kind == "enumerate":
+        return (operation.args[0],)
+    return (operation.func,)
+
+
+def fuse(iterator: Iterable[T], operations: Tuple[Operation, ...]) -> Iterator:
+    """将一串操作融合成单个循环并作用于 iterator 上"""
+    iterator = iter(iterator)
+    for offset in range(0, len(operations), MAX_FUSED_OPERATIONS):
+        part = operations[offset : offset + MAX_FUSED_OPERATIONS]
+        signature = tuple(
+            (op.kind, _slice_variant(op.args) if op.kind == "slice" else None)
+            for op in part
+        )
+        params = tuple(param for op in part for param in _params(op))
+        iterator = _compile(signature)(iterator, params)
+    return iterator
+
+
+class Pipeline(Iterable[T]):
+    """记录了一串可融合操作的可迭代对象
+
+    每次迭代都会重新从 source 开始，因此 source 需要能被多次迭代（例如一个 ArkoWrapper）。
+    """
+
+    __slots__ = "source", "operations"
+
+    source: Iterable
+    operations: Tuple[Operation, ...]
+
+    def __init__(
+        self, source: Iterable, operations: Tuple[Operation, ...] = ()
+    ) -> None:
+        self.source = source
+        self.operations = operations
+
+    def __iter__(self) -> Iterator[T]:
+        return fuse(self.source, self.operations)
+
+    def __repr__(self) -> str:
+        steps = " -> ".join(map(repr, self.operations)) or "identity"
+        return f"<{self.__class__.__name__} {steps}>"
+
+    def then(self, kind: str, func: Optional[Callable] = None, *args) -> "Pipeline":
+        """返回追加了一个操作的新流水线"""
+        if kind not in FUSIBLE_OPERATIONS:
+            raise ValueError(f"Unsupported operation: {kind}")
+        if kind == "slice":
+            islice((), *args)  # 与 islice 保持一致的参数校验
+            s = slice(*args)
+            args = (s.start or 0, s.stop, s.step or 1)
+        return self.__class__(
+            self.source, self.operations + (Operation(kind, func, args),)
+        )
@@ -0,0 +1,100 @@
+"""后台预取
+
+在后台线程中读取上游，放入有界的队列，使上游的 I/O 与下游的计算重叠。
+上游抛出的异常会在下游读到对应的位置时重新抛出。下游提前停止时，后台线程要等到预取的迭代器被关闭才会退出，
+即 Prefetcher 被 close，或 prefetch 返回的生成器被关闭或回收；此时它会读完正在读取的一个上游元素后退出，
+close 本身不会等待线程结束。
+"""
+
+import threading
+from queue import Empty, Queue
+from typing import Any, Iterable, Iterator, List, Tuple, TypeVar
+
+__all__ = ("Prefetcher", "prefetch", "prefetch_parts")
+
+T = TypeVar("T")
+
+_ITEM, _ERROR, _END = range(3)
+
+
+class Prefetcher(Iterator[T]):
+    """创建时即在后台线程中开始读取 iterable，最多预先读取 n 个元素
+
+    使用完毕（或提前停止）后需要调用 close，也可以作为上下文管理器使用。
+    """
+
+    __slots__ = "_queue", "_stop", "_thread", "_done"
+
+    def __init__(self, iterable: Iterable[T], n: int) -> None:
+        if n <= 0:
+            raise ValueError(f"'n' must be a positive number: {n}")
+        self._queue: Queue[Tuple[int, Any]] = Queue(n)
+        self._stop = threading.Event()
+        self._done = False
+        self._thread = threading.Thread(
+            target=self._fill, args=(iterable,), name="arko-prefetch", daemon=True
+        )
+        self._thread.start()
+
+    def _fill(self, iterable: Iterable[T]) -> None:
+        put, stop = self._queue.put, self._stop
+        try:
+            for item in iterable:
+                put((_ITEM, item))
+                if stop.is_set():
+                    return
+        except BaseException as e:
+            put((_ERROR, e))
+        else:
+            put((_END, None))
+
+    def __iter__(self) -> Iterator[T]:
+        return self
+
+    def __next__(self) -> T:
+        if self._done:
+            raise StopIteration
+        kind, value = self._queue.get()
+        if kind == _ITEM:
+            return value
+        self._done = True
+        if kind == _ERROR:
+            raise value
+        raise StopIteration
+
+    def close(self) -> None:
+        """通知后台线程停止，并清空队列以免它阻塞在放入元素上"""
+        self._done = True
+        self._stop.set()
+        try:
+            while True:
+                self._queue.get_nowait()
+        except Empty:
+            pass
+
+    def __enter__(self) -> "Prefetcher[T]":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def prefetch(iterable: Iterable[T], n: int) -> Iterator[T]:
+    """在后台线程中预取 iterable 中的元素，最多预先读取 n 个"""
+    with Prefetcher(iterable, n) as prefetcher:
+        yield from prefetcher
+
+
+def prefetch_parts(parts: Iterable[Iterable[T]], n: int) -> Iterator[T]:
+    """为每一部分各启动一个线程同时预取，共计最多预先读取 n 个元素，并按顺序产出各部分的元素"""
+    parts = list(parts)
+    size = max(1, n // max(1, len(parts)))
+    prefetchers: List[Prefetcher[T]] = []
+    try:
+        for part in parts:
+            prefetchers.append(Prefetcher(part, size))
+        for prefetcher in prefetchers:
+            yield from prefetcher
+    finally:
+        for prefetcher in prefetchers:
+            prefetcher.close()
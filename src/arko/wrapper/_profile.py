@@ -0,0 +1,211 @@
+"""分阶段的性能分析
+
+生成器串联在一起之后，普通的性能分析器只能看到一长串嵌套的 next 调用。
+在分析期间，每个阶段产出的迭代器都会被一个探针包装：探针记录该阶段产出与读入的元素数量，
+以及花在该阶段自身（不含上游）的墙上时间与 CPU 时间，还可以借助 tracemalloc 记录内存分配的峰值。
+"""
+
+import json
+import threading
+import time
+import tracemalloc
+from contextvars import ContextVar, Token
+from typing import Any, Dict, Iterator, List, Optional, TypeVar
+
+from rich.table import Table
+
+__all__ = ("Profiler", "Stage", "active_profiler")
+
+T = TypeVar("T")
+
+_active: ContextVar[Optional["Profiler"]] = ContextVar("arko_profiler", default=None)
+
+
+def active_profiler() -> Optional["Profiler"]:
+    """返回当前正在进行的性能分析，没有时返回 None"""
+    return _active.get()
+
+
+class Stage:
+    """一个阶段的统计数据，时间均不包含花在上游阶段中的部分"""
+
+    __slots__ = "name", "items_in", "items_out", "wall", "cpu", "peak_memory"
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.items_in = 0
+        self.items_out = 0
+        self.wall = 0.0
+        self.cpu = 0.0
+        # 未记录内存时为 None
+        self.peak_memory: Optional[int] = None
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__name__} {self.name!r} "
+            f"in={self.items_in} out={self.items_out} wall={self.wall:.6f}s>"
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class _Frame:
+    """正在执行的一次 next 调用"""
+
+    __slots__ = "stage", "child_wall", "child_cpu", "peak", "base"
+
+    def __init__(self, stage: Stage) -> None:
+        self.stage = stage
+        self.child_wall = 0.0
+        self.child_cpu = 0.0
+        self.peak = 0
+        self.base = 0
+
+
+class _Probe(Iterator[T]):
+    """包装一个阶段的迭代器，在每次 next 时记录统计数据"""
+
+    __slots__ = "profiler", "stage", "iterator"
+
+    def __init__(self, profiler: "Profiler", stage: Stage, iterator: Iterator[T]):
+        self.profiler = profiler
+        self.stage = stage
+        self.iterator = iterator
+
+    def __iter__(self) -> Iterator[T]:
+        return self
+
+    def __length_hint__(self) -> int:
+        hint = getattr(self.iterator, "__length_hint__", None)
+        return NotImplemented if hint is None else hint()
+
+    def __next__(self) -> T:
+        profiler = self.profiler
+        stack = profiler._stack()
+        frame = _Frame(self.stage)
+        if profiler.memory:
+            frame.base = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        stack.append(frame)
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            item = next(self.iterator)
+        finally:
+            wall = time.perf_counter() - wall
+            cpu = time.process_time() - cpu
+            stack.pop()
+            stage = self.stage
+            stage.wall += wall - frame.child_wall
+            stage.cpu += cpu - frame.child_cpu
+            if profiler.memory:
+                peak = max(tracemalloc.get_traced_memory()[1], frame.peak)
+                used = peak - frame.base
+                if stage.peak_memory is None or used > stage.peak_memory:
+                    stage.peak_memory = used
+            if stack:
+                parent = stack[-1]
+                parent.child_wall += wall
+                parent.child_cpu += cpu
+                if profiler.memory:
+                    # 内层重置了峰值，把内层看到的峰值交给外层
+                    parent.peak = max(parent.peak, peak)
+        stage.items_out += 1
+        if stack:
+            stack[-1].stage.items_in += 1
+        return item
+
+
+class Profiler:
+    """对 ArkoWrapper 流水线进行分阶段的性能分析
+
+    作为上下文管理器使用，在其中创建的每个阶段都会被记录，分析结果可以用 table 渲染为 rich 表格，
+    或用 report、to_json 导出。
+
+    Args:
+        memory: 是否通过 tracemalloc 记录每个阶段内存分配的峰值，开启后会明显变慢。
+    """
+
+    __slots__ = "memory", "stages", "wall", "_local", "_token", "_start", "_tracing"
+
+    def __init__(self, memory: bool = False) -> None:
+        self.memory = memory
+        self.stages: List[Stage] = []
+        self.wall = 0.0
+        self._local = threading.local()
+        self._token: Optional[Token] = None
+        self._start = 0.0
+        self._tracing = False
+
+    def __enter__(self) -> "Profiler":
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._tracing = True
+        self._token = _active.set(self)
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.wall += time.perf_counter() - self._start
+        _active.reset(self._token)
+        self._token = None
+        if self._tracing:
+            tracemalloc.stop()
+            self._tracing = False
+
+    def _stack(self) -> List[_Frame]:
+        # 每个线程各自维护正在执行的调用
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def track(self, name: str, iterator: Iterator[T]) -> Iterator[T]:
+        """登记一个名为 name 的阶段，返回包装后的迭代器"""
+        stage = Stage(name)
+        self.stages.append(stage)
+        return _Probe(self, stage, iterator)
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "wall": self.wall,
+            "memory": self.memory,
+            "stages": [stage.to_dict() for stage in self.stages],
+        }
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        return json.dumps(self.report(), ensure_ascii=False, indent=indent)
+
+    def table(self) -> Table:
+        table = Table(title="ArkoWrapper profile")
+        table.add_column("#", justify="right")
+        table.add_column("stage")
+        table.add_column("in", justify="right")
+        table.add_column("out", justify="right")
+        table.add_column("wall (ms)", justify="right")
+        table.add_column("cpu (ms)", justify="right")
+        table.add_column("wall %", justify="right")
+        if self.memory:
+            table.add_column("peak (KiB)", justify="right")
+        total = sum(stage.wall for stage in self.stages) or 1.0
+        for i, stage in enumerate(self.stages):
+            row = [
+                str(i),
+                stage.name,
+                str(stage.items_in),
+                str(stage.items_out),
+                f"{stage.wall * 1000:.3f}",
+                f"{stage.cpu * 1000:.3f}",
+                f"{stage.wall / total:.1%}",
+            ]
+            if self.memory:
+                peak = stage.peak_memory
+                row.append("-" if peak is None else f"{peak / 1024:.1f}")
+            table.add_row(*row)
+        return table
+
+    def __rich__(self) -> Table:
+        return self.table()
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} stages={len(self.stages)}>"
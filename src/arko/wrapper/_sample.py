@@ -0,0 +1,105 @@
+"""流式抽样
+
+只读取一遍上游，使用 O(k) 的内存：蓄水池抽样使用 Algorithm L，直接计算下一个被选中的位置并跳过中间的元素，
+伯努利抽样按几何分布跳过元素，二者的随机数调用次数只与被选中的元素的数量有关。给出 seed 时结果可以复现。
+"""
+
+import math
+from itertools import islice
+from random import Random
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple, TypeVar
+
+__all__ = ("bernoulli", "reservoir", "stratified")
+
+T = TypeVar("T")
+
+_END = object()
+
+
+def _uniform(rng: Random) -> float:
+    """返回 (0, 1) 之间的随机数"""
+    while True:
+        u = rng.random()
+        if u > 0.0:
+            return u
+
+
+def _skip(rng: Random, w: float) -> int:
+    """以 w 为成功概率的几何分布，返回下一次成功之前失败的次数"""
+    if w >= 1.0:
+        return 0
+    return math.floor(math.log(_uniform(rng)) / math.log1p(-w))
+
+
+def reservoir(iterable: Iterable[T], k: int, rng: Random) -> List[T]:
+    """从 iterable 中等概率地不放回抽取 k 个元素（Algorithm L），元素不足 k 个时返回全部"""
+    if k < 0:
+        raise ValueError(f"'k' must not be negative: {k}")
+    iterator = iter(iterable)
+    samples = list(islice(iterator, k))
+    if len(samples) < k or k == 0:
+        return samples
+    w = math.exp(math.log(_uniform(rng)) / k)
+    while True:
+        skip = _skip(rng, w)
+        item = next(islice(iterator, skip, None), _END)
+        if item is _END:
+            return samples
+        samples[rng.randrange(k)] = item
+        w *= math.exp(math.log(_uniform(rng)) / k)
+
+
+def bernoulli(iterable: Iterable[T], p: float, rng: Random) -> Iterator[T]:
+    """每个元素各自以概率 p 被选中，按原来的顺序产出"""
+    if not 0.0 <= p <= 1.0:
+        raise ValueError(f"'p' must be between 0 and 1: {p}")
+    if p == 0.0:
+        return
+    iterator = iter(iterable)
+    if p == 1.0:
+        yield from iterator
+        return
+    while True:
+        item = next(islice(iterator, _skip(rng, p), None), _END)
+        if item is _END:
+            return
+        yield item
+
+
+class _Stratum:
+    """一个分层的蓄水池，元素交错到达，因此记录下一个被选中的序号而不是直接跳过"""
+
+    __slots__ = "samples", "seen", "target", "w"
+
+    def __init__(self) -> None:
+        self.samples: List[Any] = []
+        self.seen = 0
+        self.target = 0
+        self.w = 1.0
+
+
+def stratified(
+    iterable: Iterable[T], key: Callable[[T], Any], k: int, rng: Random
+) -> Iterator[Tuple[Any, List[T]]]:
+    """按 key 分层，在每一层中各自等概率地不放回抽取 k 个元素，按各层首次出现的顺序产出 (key, 样本)"""
+    if k <= 0:
+        raise ValueError(f"'k' must be a positive number: {k}")
+    strata: Dict[Any, _Stratum] = {}
+    for item in iterable:
+        group = key(item)
+        stratum = strata.get(group)
+        if stratum is None:
+            stratum = strata[group] = _Stratum()
+        index = stratum.seen
+        stratum.seen += 1
+        if index < k:
+            stratum.samples.append(item)
+            if index == k - 1:
+                stratum.w = math.exp(math.log(_uniform(rng)) / k)
+                stratum.target = k + _skip(rng, stratum.w)
+        elif index == stratum.target:
+            stratum.samples[rng.randrange(k)] = item
+            stratum.w *= math.exp(math.log(_uniform(rng)) / k)
+            stratum.target = index + 1 + _skip(rng, stratum.w)
+    for group, stratum in strata.items():
+        yield group, stratum.samples
@@ -0,0 +1,132 @@
+"""子序列搜索
+
+单模式使用 KMP，多模式使用 Aho–Corasick 自动机；以自定义的函数比较元素时使用滑动窗口逐一比较。
+它们都只遍历目标一次，因此可以直接作用在只能迭代一次的迭代器上，额外的内存只与模式的长度有关。
+"""
+
+from collections import deque
+from typing import (
+    Callable,
+    Deque,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+
+__all__ = ("AhoCorasick", "kmp_search", "kmp_table", "window_search")
+
+T = TypeVar("T")
+E = TypeVar("E")
+
+
+def kmp_table(pattern: Sequence[E]) -> List[int]:
+    """计算 KMP 的部分匹配表"""
+    partial = [0] * len(pattern)
+    j = 0
+    for i in range(1, len(pattern)):
+        while j > 0 and pattern[i] != pattern[j]:
+            j = partial[j - 1]
+        if pattern[i] == pattern[j]:
+            j += 1
+        partial[i] = j
+    return partial
+
+
+def kmp_search(target: Iterable[E], pattern: Sequence[E]) -> Iterator[int]:
+    """在 target 中查找 pattern，依次产出每一个（可重叠的）匹配的起始下标，元素以 == 比较"""
+    if not pattern:
+        raise ValueError("Pattern is empty")
+    partial = kmp_table(pattern)
+    length = len(pattern)
+    j = 0
+    for i, item in enumerate(target):
+        while j > 0 and item != pattern[j]:
+            j = partial[j - 1]
+        if item == pattern[j]:
+            j += 1
+        if j == length:
+            yield i - length + 1
+            j = partial[j - 1]
+
+
+def window_search(
+    target: Iterable[T], pattern: Sequence[E], func: Callable[[T, E], bool]
+) -> Iterator[int]:
+    """同 kmp_search，但以 func(目标中的元素, 模式中的元素) 比较
+
+    func 不一定是等价关系，无法使用部分匹配表，因此对每个长度为 len(pattern) 的窗口逐一比较。
+    """
+    if not pattern:
+        raise ValueError("Pattern is empty")
+    length = len(pattern)
+    window: Deque[T] = deque(maxlen=length)
+    for i, item in enumerate(target):
+        window.append(item)
+        if len(window) == length and all(map(func, window, pattern)):
+            yield i - length + 1
+
+
+class AhoCorasick:
+    """Aho–Corasick 自动机，用于在一次遍历中同时查找多个模式
+
+    模式中的元素需要是可哈希的。
+    """
+
+    __slots__ = "patterns", "_goto", "_fail", "_output", "_link"
+
+    patterns: Tuple[Tuple[Hashable, ...], ...]
+
+    def __init__(self, patterns: Iterable[Iterable[Hashable]]) -> None:
+        self.patterns = tuple(tuple(pattern) for pattern in patterns)
+        self._goto: List[Dict[Hashable, int]] = [{}]
+        self._output: List[List[int]] = [[]]
+
+        for index, pattern in enumerate(self.patterns):
+            if not pattern:
+                raise ValueError(f"Pattern {index} is empty")
+            node = 0
+            for item in pattern:
+                next_node = self._goto[node].get(item)
+                if next_node is None:
+                    next_node = len(self._goto)
+                    self._goto[node][item] = next_node
+                    self._goto.append({})
+                    self._output.append([])
+                node = next_node
+            self._output[node].append(index)
+
+        # fail: 最长的、同时也是某个模式前缀的真后缀所对应的节点
+        # link: 沿 fail 链可以到达的最近的、有输出的节点
+        self._fail = [0] * len(self._goto)
+        self._link = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for item, child in self._goto[node].items():
+                queue.append(child)
+                state = self._fail[node]
+                while state and item not in self._goto[state]:
+                    state = self._fail[state]
+                fail = self._goto[state].get(item, 0)
+                self._fail[child] = fail if fail != child else 0
+                self._link[child] = fail if self._output[fail] else self._link[fail]
+
+    def search(self, target: Iterable[Hashable]) -> Iterator[Tuple[int, int]]:
+        """依次产出每一个匹配的 (起始下标, 模式序号)，按匹配的结束位置排序"""
+        goto, fail, output, link = self._goto, self._fail, self._output, self._link
+        patterns = self.patterns
+        state = 0
+        for i, item in enumerate(target):
+            while state and item not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(item, 0)
+            match = state if output[state] else link[state]
+            while match:
+                for index in output[match]:
+                    yield i - len(patterns[index]) + 1, index
+                match = link[match]
@@ -0,0 +1,397 @@
+"""概要数据结构
+
+以远小于 O(n) 的内存近似地回答“有多少个不同的元素”“哪些元素出现得最多”“某个分位数是多少”。
+每种概要都可以与参数相同的另一个概要合并（例如由多个工作者分别处理各自的部分后合并），
+也可以通过 pickle 或 to_bytes / from_bytes 序列化。
+
+元素的哈希由其 MessagePack 编码计算，不受 PYTHONHASHSEED 影响，因此不同进程中得到的概要可以合并；
+相应地，元素需要能被 msgspec 编码。
+"""
+
+import math
+from array import array
+from bisect import bisect_left
+from hashlib import blake2b
+from itertools import accumulate, islice
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import msgspec
+from typing_extensions import Self
+
+__all__ = ("CountMinSketch", "HyperLogLog", "QuantileSketch")
+
+_encode = msgspec.msgpack.encode
+
+
+def _hash(item: Any) -> int:
+    """与进程无关的 64 位哈希"""
+    return int.from_bytes(blake2b(_encode(item), digest_size=8).digest(), "little")
+
+
+def _check_type(sketch: Any, other: Any) -> None:
+    if not isinstance(other, sketch.__class__):
+        raise TypeError(
+            f"Cannot merge {type(other).__name__!r} into {type(sketch).__name__!r}"
+        )
+
+
+class HyperLogLog:
+    """估计不同元素的数量，相对误差约为 1.04 / sqrt(2 ** precision)
+
+    Args:
+        precision: 寄存器数量的以 2 为底的对数，取值为 4 到 18，使用 2 ** precision 字节的内存。
+    """
+
+    __slots__ = "precision", "registers"
+
+    def __init__(self, precision: int = 14) -> None:
+        if not 4 <= precision <= 18:
+            raise ValueError(f"'precision' must be between 4 and 18: {precision}")
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__name__} precision={self.precision} "
+            f"estimate={self.count()}>"
+        )
+
+    def add(self, item: Any) -> Self:
+        x = _hash(item)
+        bits = 64 - self.precision
+        index = x >> bits
+        rank = bits - (x & ((1 << bits) - 1)).bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+        return self
+
+    def update(self, iterable: Iterable[Any]) -> Self:
+        registers = self.registers
+        bits = 64 - self.precision
+        mask = (1 << bits) - 1
+        for item in iterable:
+            x = _hash(item)
+            index = x >> bits
+            rank = bits - (x & mask).bit_length() + 1
+            if rank > registers[index]:
+                registers[index] = rank
+        return self
+
+    def merge(self, other: "HyperLogLog") -> Self:
+        """并入另一个精度相同的 HyperLogLog"""
+        _check_type(self, other)
+        if other.precision != self.precision:
+            raise ValueError(
+                f"Precision mismatch: {self.precision} != {other.precision}"
+            )
+        self.registers = bytearray(map(max, self.registers, other.registers))
+        return self
+
+    def estimate(self) -> float:
+        m = len(self.registers)
+        if m == 16:
+            alpha = 0.673
+        elif m == 32:
+            alpha = 0.697
+        elif m == 64:
+            alpha = 0.709
+        else:
+            alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / math.fsum(2.0**-r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            # 基数较小时使用线性计数
+            return m * math.log(m / zeros)
+        return estimate
+
+    def count(self) -> int:
+        return round(self.estimate())
+
+    def to_bytes(self) -> bytes:
+        return _encode([self.precision, bytes(self.registers)])
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> Self:
+        precision, registers = msgspec.msgpack.decode(data)
+        sketch = cls(precision)
+        sketch.registers[:] = registers
+        return sketch
+
+
+class CountMinSketch:
+    """估计元素出现的次数，并记录出现次数最多的 k 个元素
+
+    估计值不会小于真实值，以 1 - delta 的概率不超过真实值加 eps * 总次数。
+
+    Args:
+        k: 记录的高频元素的数量。
+        eps: 相对于总次数的误差上限，决定每一行的宽度 ceil(e / eps)。
+        delta: 超出误差上限的概率，决定行数 ceil(ln(1 / delta))。
+    """
+
+    __slots__ = "k", "width", "depth", "total", "rows", "candidates", "_floor"
+
+    def __init__(self, k: int = 10, eps: float = 0.001, delta: float = 0.01) -> None:
+        if k <= 0:
+            raise ValueError(f"'k' must be a positive number: {k}")
+        if not 0 < eps < 1 or not 0 < delta < 1:
+            raise ValueError(
+                f"'eps' and 'delta' must be between 0 and 1: {eps}, {delta}"
+            )
+        self.k = k
+        self.width = math.ceil(math.e / eps)
+        self.depth = math.ceil(math.log(1 / delta))
+        self.total = 0
+        self.rows: List[array] = [
+            array("q", bytes(8 * self.width)) for _ in range(self.depth)
+        ]
+        # 高频元素的候选及其估计值
+        self.candidates: Dict[Any, int] = {}
+        # 候选已满时其估计值的下界，候选的估计值只会增加，因此不必时时更新
+        self._floor = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__name__} k={self.k} width={self.width} "
+            f"depth={self.depth} total={self.total}>"
+        )
+
+    def _indexes(self, item: Any) -> List[int]:
+        x = _hash(item)
+        # 由一个 64 位哈希的两半派生出各行的哈希
+        low, high = x & 0xFFFFFFFF, (x >> 32) | 1
+        width = self.width
+        return [(low + i * high) % width for i in range(self.depth)]
+
+    def add(self, item: Any, count: int = 1) -> Self:
+        self.total += count
+        estimate = None
+        for row, index in zip(self.rows, self._indexes(item)):
+            value = row[index] + count
+            row[index] = value
+            if estimate is None or value < estimate:
+                estimate = value
+        self._offer(item, estimate)
+        return self
+
+    def update(self, iterable: Iterable[Any]) -> Self:
+        for item in iterable:
+            self.add(item)
+        return self
+
+    def _offer(self, item: Any, estimate: int) -> None:
+        candidates = self.candidates
+        if item in candidates or len(candidates) < self.k:
+            candidates[item] = estimate
+            return
+        if estimate <= self._floor:
+            return
+        smallest = min(candidates, key=candidates.__getitem__)
+        self._floor = candidates[smallest]
+        if estimate > self._floor:
+            del candidates[smallest]
+            candidates[item] = estimate
+
+    def estimate(self, item: Any) -> int:
+        """估计 item 出现的次数"""
+        return min(row[index] for row, index in zip(self.rows, self._indexes(item)))
+
+    def __getitem__(self, item: Any) -> int:
+        return self.estimate(item)
+
+    def top(self, k: Optional[int] = None) -> List[Tuple[Any, int]]:
+        """按估计的次数从多到少返回至多 k 个 (元素, 估计的次数)，默认为创建时的 k"""
+        items = sorted(self.candidates.items(), key=lambda pair: pair[1], reverse=True)
+        return items[: self.k if k is None else k]
+
+    def merge(self, other: "CountMinSketch") -> Self:
+        """并入另一个 k、eps 与 delta 都相同的 CountMinSketch"""
+        _check_type(self, other)
+        if (self.k, self.width, self.depth) != (other.k, other.width, other.depth):
+            raise ValueError("Cannot merge sketches with different parameters")
+        for row, other_row in zip(self.rows, other.rows):
+            for i, value in enumerate(other_row):
+                if value:
+                    row[i] += value
+        self.total += other.total
+        # 候选的估计值需要按合并后的计数重新计算
+        items = set(self.candidates) | set(other.candidates)
+        self.candidates = {}
+        self._floor = 0
+        for item in items:
+            self._offer(item, self.estimate(item))
+        return self
+
+    def to_bytes(self) -> bytes:
+        return _encode(
+            [
+                self.k,
+                self.width,
+                self.depth,
+                self.total,
+                [row.tobytes() for row in self.rows],
+                list(self.candidates.items()),
+            ]
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> Self:
+        k, width, depth, total, rows, candidates = msgspec.msgpack.decode(data)
+        sketch = cls.__new__(cls)
+        sketch.k, sketch.width, sketch.depth, sketch.total = k, width, depth, total
+        sketch.rows = [array("q", row) for row in rows]
+        sketch._floor = 0
+        sketch.candidates = {
+            tuple(item) if isinstance(item, list) else item: estimate
+            for item, estimate in candidates
+        }
+        return sketch
+
+
+class QuantileSketch:
+    """估计分位数（KLL 概要），秩的误差约为 1.7 / k，内存约为 3k 个元素
+
+    每一层中的元素代表 2 ** 层数 个原始元素；某一层的元素超出容量时，排序后每隔一个取一个提升到上一层。
+    元素需要可以相互比较。
+
+    Args:
+        k: 精度参数，越大越精确。
+        qs: quantiles 默认估计的分位数。
+    """
+
+    __slots__ = "k", "qs", "n", "levels", "_coin", "_limit"
+
+    def __init__(self, k: int = 200, qs: Sequence[float] = ()) -> None:
+        if k < 8:
+            raise ValueError(f"'k' must be at least 8: {k}")
+        self.k = k
+        self.qs = tuple(qs)
+        for q in self.qs:
+            _check_quantile(q)
+        self.n = 0
+        self.levels: List[List[Any]] = [[]]
+        # 压缩时交替地保留奇数位或偶数位，使结果可以复现
+        self._coin = 0
+        # 所有层的容量之和，层数改变时更新
+        self._limit = self._capacity(0)
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__name__} k={self.k} n={self.n} "
+            f"retained={self.retained}>"
+        )
+
+    def __len__(self) -> int:
+        return self.n
+
+    @property
+    def retained(self) -> int:
+        """保留的元素数量"""
+        return sum(map(len, self.levels))
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - 1 - level
+        return max(2, math.ceil(self.k * (2 / 3) ** depth))
+
+    def add(self, item: Any) -> Self:
+        self.levels[0].append(item)
+        self.n += 1
+        if self.retained >= self._limit:
+            self._compress()
+        return self
+
+    def update(self, iterable: Iterable[Any]) -> Self:
+        iterator = iter(iterable)
+        while True:
+            # 一次读入直到需要压缩为止的元素
+            room = max(1, self._limit - self.retained)
+            before = len(self.levels[0])
+            self.levels[0].extend(islice(iterator, room))
+            added = len(self.levels[0]) - before
+            self.n += added
+            if added < room:
+                if self.retained >= self._limit:
+                    self._compress()
+                return self
+            self._compress()
+
+    def _compress(self) -> None:
+        # 只要总数没有超出所有层的容量之和，单独的一层可以超出它的容量，这样可以减少压缩的次数与误差
+        while self.retained >= self._limit:
+            level = next(
+                level
+                for level, items in enumerate(self.levels)
+                if len(items) >= self._capacity(level)
+            )
+            if level + 1 == len(self.levels):
+                self.levels.append([])
+                self._limit = sum(map(self._capacity, range(len(self.levels))))
+            items = sorted(self.levels[level])
+            # 个数为奇数时留下一个，保证总权重不变
+            kept = [items.pop()] if len(items) % 2 else []
+            self.levels[level + 1].extend(items[self._coin :: 2])
+            self._coin ^= 1
+            self.levels[level] = kept
+
+    def merge(self, other: "QuantileSketch") -> Self:
+        """并入另一个 QuantileSketch"""
+        _check_type(self, other)
+        while len(self.levels) < len(other.levels):
+            self.levels.append([])
+        for items, others in zip(self.levels, other.levels):
+            items.extend(others)
+        self._limit = sum(map(self._capacity, range(len(self.levels))))
+        self.n += other.n
+        self._compress()
+        return self
+
+    def _weighted(self) -> List[Tuple[Any, int]]:
+        weighted = [
+            (item, 1 << level)
+            for level, items in enumerate(self.levels)
+            for item in items
+        ]
+        weighted.sort(key=lambda pair: pair[0])
+        return weighted
+
+    def quantiles(self, qs: Optional[Sequence[float]] = None) -> List[Any]:
+        """估计各个分位数，qs 默认为创建时给出的分位数；没有元素时返回 None 组成的列表"""
+        qs = self.qs if qs is None else tuple(qs)
+        for q in qs:
+            _check_quantile(q)
+        weighted = self._weighted()
+        if not weighted:
+            return [None] * len(qs)
+        cumulative = list(accumulate(weight for _, weight in weighted))
+        last = len(weighted) - 1
+        return [
+            weighted[min(bisect_left(cumulative, q * cumulative[-1]), last)][0]
+            for q in qs
+        ]
+
+    def quantile(self, q: float) -> Any:
+        return self.quantiles((q,))[0]
+
+    def rank(self, value: Any) -> float:
+        """估计不大于 value 的元素所占的比例"""
+        weighted = self._weighted()
+        total = sum(weight for _, weight in weighted)
+        if not total:
+            return math.nan
+        return sum(weight for item, weight in weighted if item <= value) / total
+
+    def to_bytes(self) -> bytes:
+        return _encode([self.k, list(self.qs), self.n, self.levels, self._coin])
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> Self:
+        k, qs, n, levels, coin = msgspec.msgpack.decode(data)
+        sketch = cls(k, qs)
+        sketch.n, sketch.levels, sketch._coin = n, levels, coin
+        sketch._limit = sum(map(sketch._capacity, range(len(levels))))
+        return sketch
+
+
+def _check_quantile(q: float) -> None:
+    if not 0 <= q <= 1:
+        raise ValueError(f"Quantile must be between 0 and 1: {q}")
@@ -0,0 +1,250 @@
+"""可序列化的流水线
+
+ArkoWrapper 的各个方法都由局部的生成器函数实现，无法被 pickle，也就无法交给其它进程执行。
+PipelineSpec 只记录一串 (方法名, 参数)，在工作进程中再对各自的那一部分数据重新调用这些方法，
+因此只要参数中的函数定义在模块的顶层，整个流水线就能被 pickle。
+"""
+
+import os
+import pickle
+from itertools import chain
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+)
+
+from arko.wrapper._file import FileSource
+from arko.wrapper._parallel import ExecutorType, parallel, tree_reduce
+
+__all__ = ("PARTITION_SENSITIVE", "PipelineSpec", "Step", "partition")
+
+PARTITION_SENSITIVE = frozenset(
+    {
+        "accumulate",
+        "aggregate",
+        "append",
+        "batched",
+        "chain",
+        "chunked",
+        "chunked_even",
+        "combinations",
+        "combinations_with_replacement",
+        "compress",
+        "cycle",
+        "distribute",
+        "divide",
+        "drop_while",
+        "enumerate",
+        "extend",
+        "fill",
+        "fill_to",
+        "find",
+        "find_target",
+        "group",
+        "groupby",
+        "ichunked",
+        "join",
+        "nlargest",
+        "nsmallest",
+        "pairwise",
+        "permutations",
+        "product",
+        "remove",
+        "repeat",
+        "reverse",
+        "sample",
+        "search",
+        "search_many",
+        "slice",
+        "sliding",
+        "sort",
+        "stratified",
+        "take_while",
+        "to_batches",
+        "tumbling",
+        "unique",
+        "windowed",
+        "zip",
+        "zip_longest",
+    }
+)
+"""结果取决于元素在整个输入中的位置、顺序或相邻元素的方法，对各部分分别执行时得不到与整体执行相同的结果"""
+
+
+class Step(NamedTuple):
+    """流水线中的一步，即对 ArkoWrapper 的一次方法调用"""
+
+    name: str
+    args: Tuple[Any, ...] = ()
+    kwargs: Tuple[Tuple[str, Any], ...] = ()
+
+    def __repr__(self) -> str:
+        params = [getattr(arg, "__name__", None) or repr(arg) for arg in self.args]
+        params.extend(f"{key}={value!r}" for key, value in self.kwargs)
+        return f"{self.name}({', '.join(params)})"
+
+
+def partition(source: Any, n: int) -> List[Any]:
+    """将 source 切分为至多 n 个可以分别交给工作者的部分
+
+    FileSource 按与行（或记录）边界对齐的字节范围切分，range 按下标范围切分，其它序列按切片切分；
+    根为它们之一的 ArkoWrapper 按其根切分。
+    """
+    if n <= 0:
+        raise ValueError(f"'n' must be a positive number: {n}")
+    root = getattr(source, "root", source)
+    if isinstance(root, FileSource):
+        return root.split(n)
+    elif isinstance(root, (range, list, tuple)):
+        length = len(root)
+        bounds = [length * i // n for i in range(n + 1)]
+        return [
+            root[start:stop] for start, stop in zip(bounds, bounds[1:]) if start < stop
+        ]
+    raise TypeError(
+        f"Cannot partition {type(root).__name__!r}, pass a list of shards instead"
+    )
+
+
+def _run_part(spec: "PipelineSpec", parts: List[Any]) -> List[Tuple[bool, Any]]:
+    """在工作者中对每一部分执行流水线，产出 (结果是否为 ArkoWrapper, 结果)
+
+    结果为 ArkoWrapper 时收集为列表后再返回。
+    """
+    results = []
+    for part in parts:
+        result = spec.apply(part)
+        if isinstance(result, spec.wrapper):
+            results.append((True, list(result)))
+        else:
+            results.append((False, result))
+    return results
+
+
+class PipelineSpec:
+    """一串可以被 pickle 的 ArkoWrapper 方法调用
+
+    与 ArkoWrapper 有着相同的链式写法，每次调用都会返回记录了新的一步的 PipelineSpec，
+    例如 ``ArkoWrapper.spec().map(parse).filter(valid).sum()``。最后一步可以是返回其它值的方法。
+
+    Args:
+        wrapper: 执行流水线时使用的 ArkoWrapper 类。
+        steps: 已有的步骤。
+    """
+
+    __slots__ = "wrapper", "steps"
+
+    wrapper: Type
+    steps: Tuple[Step, ...]
+
+    def __init__(self, wrapper: Type, steps: Tuple[Step, ...] = ()) -> None:
+        self.wrapper = wrapper
+        self.steps = tuple(steps)
+
+    def __getattr__(self, name: str) -> Callable[..., "PipelineSpec"]:
+        if name.startswith("_") or not callable(getattr(self.wrapper, name, None)):
+            raise AttributeError(
+                f"{self.wrapper.__name__!r} has no method named {name!r}"
+            )
+
+        def record(*args: Any, **kwargs: Any) -> "PipelineSpec":
+            return self.__class__(
+                self.wrapper, self.steps + (Step(name, args, tuple(kwargs.items())),)
+            )
+
+        return record
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({' | '.join(map(repr, self.steps))})"
+
+    def __reduce__(self):
+        return self.__class__, (self.wrapper, self.steps)
+
+    def __len__(self) -> int:
+        return len(self.steps)
+
+    def apply(self, iterable: Iterable[Any]) -> Any:
+        """在当前进程中对 iterable 执行流水线"""
+        result = self.wrapper(iterable)
+        for step in self.steps:
+            if not isinstance(result, self.wrapper):
+                raise TypeError(
+                    f"Step {step!r} follows a step that did not return a wrapper"
+                )
+            result = getattr(result, step.name)(*step.args, **dict(step.kwargs))
+        return result
+
+    def check(self) -> None:
+        """检查每一步能否被 pickle，不能时抛出 TypeError"""
+        for step in self.steps:
+            try:
+                pickle.dumps(step)
+            except Exception as e:
+                raise TypeError(f"Step {step!r} cannot be pickled: {e}") from e
+
+    def run(
+        self,
+        source: Any,
+        *,
+        shards: bool = False,
+        partitions: Optional[int] = None,
+        combine: Optional[Callable[[Any, Any], Any]] = None,
+        executor: ExecutorType = "process",
+        workers: Optional[int] = None,
+    ) -> Any:
+        """将 source 切分后交给多个工作者分别执行流水线，并合并各部分的结果
+
+        流水线的结果为 ArkoWrapper 时，各部分的元素按顺序串联为一个 ArkoWrapper；
+        否则（例如以 sum 结尾）在给出 combine 时按顺序两两合并为一个值，未给出时返回各部分的结果组成的列表。
+        每一步都在各部分上分别执行，因此切分为多个部分时，流水线中不能包含 PARTITION_SENSITIVE 中的方法
+        （如 slice、enumerate、sort、unique），否则抛出 ValueError；它们可以在合并后的结果上再调用。
+
+        Args:
+            source: FileSource、range、list、tuple，或根为它们之一的 ArkoWrapper，见 partition。
+            shards: 为 True 时 source 是已经切分好的各部分组成的序列，每一部分交给一个工作者。
+            partitions: 切分的部分数，默认为工作者数量的四倍。
+            combine: 合并两部分结果的函数，需要满足结合律。
+            executor: "process"、"thread" 或一个已有的 Executor（不会被关闭）。
+            workers: 新建的池中工作者的数量，默认为 CPU 的数量。
+        """
+        if executor == "process":
+            self.check()
+        if shards:
+            parts: Sequence[Any] = list(source)
+        else:
+            if partitions is None:
+                partitions = 4 * (workers or os.cpu_count() or 1)
+            parts = partition(source, partitions)
+        if len(parts) > 1:
+            for step in self.steps:
+                if step.name in PARTITION_SENSITIVE:
+                    raise ValueError(
+                        f"Step {step!r} depends on the position of elements in the "
+                        f"whole input and cannot run on {len(parts)} partitions "
+                        "separately; apply it to the combined result instead"
+                    )
+        if not parts:
+            result = self.apply(())
+            return (
+                self.wrapper(list(result))
+                if isinstance(result, self.wrapper)
+                else result
+            )
+        results = parallel(parts, _run_part, self, executor=executor, workers=workers)
+        flag, first = next(results)
+        if flag:
+            # 各部分的元素按顺序串联，后面的部分在被读取时才等待其结果
+            return self.wrapper(
+                chain(first, chain.from_iterable(items for _, items in results))
+            )
+        values = chain((first,), (value for _, value in results))
+        if combine is not None:
+            return tree_reduce(values, combine, None)
+        return list(values)
@@ -0,0 +1,402 @@
+"""多读取者共享的缓冲区
+
+同一个上游迭代器只会被读取一次，读取到的元素存放在一个共享的缓冲区中，每个读取者只记录自己的位置。
+缓冲区只保留最慢与最快的读取者之间的元素；超出上限时可以选择抛出异常或将较旧的元素写入临时文件。
+新的读取者从最慢的读取者所在的位置开始读取，所有读取者都越过的元素会被释放，之后无法再次读取。
+AsyncTeeBuffer 以同样的方式在多个读取者之间共享一个异步迭代器。
+"""
+
+import asyncio
+import pickle
+import sys
+import tempfile
+import threading
+import weakref
+from bisect import bisect_right
+from typing import (
+    IO,
+    AsyncIterable,
+    AsyncIterator,
+    Generic,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+__all__ = (
+    "AsyncTeeBuffer",
+    "AsyncTeeCursor",
+    "OverflowPolicy",
+    "Replayable",
+    "TeeBuffer",
+    "TeeCursor",
+)
+
+T = TypeVar("T")
+
+OverflowPolicy = Literal["raise", "spill"]
+
+_COMPACT_THRESHOLD = 1024
+
+
+class TeeBuffer(Generic[T]):
+    """多读取者共享的缓冲区
+
+    不再需要的元素只在缓冲区的大小翻倍或达到上限时才被释放，使每个元素的开销保持在常数级别。
+
+    Args:
+        iterable: 上游的可迭代对象。
+        max_size: 内存中最多保留的元素数量，None 表示不限制。
+        overflow: 超出 max_size 时的处理方式。"raise" 抛出 BufferError；
+            "spill" 将较旧的一半元素用 pickle 写入临时文件，落后的读取者会从文件中读回。
+        one_shot: 为 True 时表示这是只能读取一次的流，持有读取者的一方应直接读取它，
+            而不是保留它并读取它的副本（后者会使读取过的元素一直无法被释放）。
+    """
+
+    __slots__ = (
+        "max_size",
+        "overflow",
+        "one_shot",
+        "_iterator",
+        "_items",
+        "_base",
+        "_head",
+        "_limit",
+        "_cursors",
+        "_file",
+        "_segments",
+        "_segment_starts",
+        "_mutex",
+    )
+
+    max_size: Optional[int]
+    overflow: OverflowPolicy
+    one_shot: bool
+
+    def __init__(
+        self,
+        iterable: Iterable[T],
+        max_size: Optional[int] = None,
+        overflow: OverflowPolicy = "raise",
+        one_shot: bool = False,
+    ) -> None:
+        if max_size is not None and max_size <= 0:
+            raise ValueError(f"'max_size' must be a positive number: {max_size}")
+        if overflow not in ("raise", "spill"):
+            raise ValueError(f"Unsupported overflow policy: {overflow!r}")
+        self.max_size = max_size
+        self.overflow = overflow
+        self.one_shot = one_shot
+        self._iterator = iter(iterable)
+        # _items[i] 是绝对位置为 _base + i 的元素，_items[:_head] 已不再需要，等待被压缩
+        self._items: List[T] = []
+        self._base = 0
+        self._head = 0
+        # len(_items) 达到 _limit 时检查一次是否可以释放
+        self._limit = min(max_size or sys.maxsize, _COMPACT_THRESHOLD)
+        self._cursors: "weakref.WeakSet[TeeCursor[T]]" = weakref.WeakSet()
+        # 写入临时文件的片段：(起始位置, 元素数量, 文件偏移, 字节数)
+        self._file: Optional[IO[bytes]] = None
+        self._segments: List[Tuple[int, int, int, int]] = []
+        self._segment_starts: List[int] = []
+        # 由 share 启用，启用后读取者的每一步读取与新建读取者都在锁内进行
+        self._mutex: Optional[threading.Lock] = None
+
+    def __len__(self) -> int:
+        """内存中保留的元素数量"""
+        return len(self._items) - self._head
+
+    def __del__(self) -> None:
+        if self._file is not None:
+            self._file.close()
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__name__} buffered={len(self)} "
+            f"spilled={sum(s[1] for s in self._segments)} readers={len(self._cursors)}>"
+        )
+
+    @property
+    def low(self) -> int:
+        """最慢的读取者所在的位置"""
+        return min(
+            (c.position for c in list(self._cursors)),
+            default=self._base + len(self._items),
+        )
+
+    def __iter__(self) -> "TeeCursor[T]":
+        return self.cursor()
+
+    def cursor(self, position: Optional[int] = None) -> "TeeCursor[T]":
+        """在 position（默认为最慢的读取者所在的位置）处新建一个读取者"""
+        if self._mutex is not None:
+            with self._mutex:
+                cursor = TeeCursor(self, self._start(position))
+                self._cursors.add(cursor)
+                return cursor
+        cursor = TeeCursor(self, self._start(position))
+        self._cursors.add(cursor)
+        return cursor
+
+    def share(self) -> None:
+        """允许在多个线程中同时读取这个缓冲区
+
+        之后开始的读取都会加锁，在这之前已经开始的迭代不受保护，因此应在其它线程开始读取之前调用。
+        """
+        if self._mutex is None:
+            self._mutex = threading.Lock()
+
+    def _start(self, position: Optional[int]) -> int:
+        """检查新的读取者的起始位置"""
+        position = self.low if position is None else position
+        if position < self._base + self._head and not (
+            self._segments and position >= self._segment_starts[0]
+        ):
+            raise ValueError(f"Position {position} has already been released")
+        return position
+
+    def _make_room(self) -> None:
+        """释放不再需要的元素，仍然超出上限时抛出异常或写入临时文件"""
+        self._release()
+        if self.max_size is not None and len(self) >= self.max_size:
+            if self.overflow == "raise":
+                raise BufferError(
+                    f"Tee buffer is full ({self.max_size} items); "
+                    "a reader is lagging too far behind"
+                )
+            self._spill()
+        self._limit = self._head + min(
+            self.max_size or sys.maxsize, max(_COMPACT_THRESHOLD, 2 * len(self))
+        )
+
+    def _release(self) -> None:
+        """根据最慢的读取者释放不再需要的元素"""
+        low = self.low
+        self._head = max(self._head, low - self._base)
+        # 没有读取者时，缓冲区中的元素都不再需要
+        self._compact(force=not self._cursors)
+        while self._segments and sum(self._segments[0][:2]) <= low:
+            self._segments.pop(0)
+            self._segment_starts.pop(0)
+
+    def _compact(self, force: bool = False) -> None:
+        if force or (
+            self._head >= _COMPACT_THRESHOLD and self._head * 2 >= len(self._items)
+        ):
+            del self._items[: self._head]
+            self._base += self._head
+            self._head = 0
+
+    def _spill(self) -> None:
+        """将内存中较旧的一半元素写入临时文件"""
+        count = max(1, len(self) // 2)
+        data = pickle.dumps(
+            self._items[self._head : self._head + count], pickle.HIGHEST_PROTOCOL
+        )
+        if self._file is None:
+            self._file = tempfile.TemporaryFile(prefix="arko-tee-")
+        offset = self._file.seek(0, 2)
+        self._file.write(data)
+        start = self._base + self._head
+        self._segments.append((start, count, offset, len(data)))
+        self._segment_starts.append(start)
+        self._head += count
+        self._compact()
+
+    def _load(self, position: int) -> Tuple[int, List[T]]:
+        """读回包含 position 的片段，返回 (片段的起始位置, 元素)"""
+        index = bisect_right(self._segment_starts, position) - 1
+        start, _, offset, size = self._segments[index]
+        self._file.flush()
+        self._file.seek(offset)
+        return start, pickle.loads(self._file.read(size))
+
+
+class TeeCursor(Iterator[T]):
+    """共享缓冲区上的一个读取者
+
+    需要从同一位置再次读取时，使用 copy() 新建一个读取者。
+    """
+
+    __slots__ = "buffer", "position", "__weakref__"
+
+    buffer: TeeBuffer[T]
+    position: int
+
+    def __init__(self, buffer: TeeBuffer[T], position: int) -> None:
+        self.buffer = buffer
+        self.position = position
+
+    def __iter__(self) -> Iterator[T]:
+        # 生成器每次都从 self.position 处读取，不在 self 上保存生成器以免形成引用循环，
+        # 使被丢弃的读取者能被立即回收，不再阻止缓冲区释放元素
+        if self.buffer._mutex is not None:
+            return self._read_locked()
+        return self._read()
+
+    def __next__(self) -> T:
+        for item in self:
+            return item
+        raise StopIteration
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} position={self.position}>"
+
+    # noinspection PyProtectedMember
+    def _read(self) -> Iterator[T]:
+        buffer = self.buffer
+        items = buffer._items
+        iterator = buffer._iterator
+        segment: Tuple[int, List[T]] = (0, [])
+        while True:
+            position = self.position
+            index = position - buffer._base
+            if index >= len(items):
+                if index >= buffer._limit:
+                    buffer._make_room()
+                    index = position - buffer._base
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    buffer._cursors.discard(self)
+                    buffer._release()
+                    return
+                items.append(item)
+            elif index >= buffer._head:
+                item = items[index]
+            else:
+                offset = position - segment[0]
+                if not 0 <= offset < len(segment[1]):
+                    segment = buffer._load(position)
+                    offset = position - segment[0]
+                item = segment[1][offset]
+            self.position = position + 1
+            yield item
+
+    # noinspection PyProtectedMember
+    def _read_locked(self) -> Iterator[T]:
+        """与 _read 相同，但每一步读取都在缓冲区的锁内进行"""
+        mutex = self.buffer._mutex
+        read = self._read()
+        while True:
+            with mutex:
+                try:
+                    item = next(read)
+                except StopIteration:
+                    return
+            yield item
+
+    def copy(self) -> "TeeCursor[T]":
+        """在当前位置新建一个读取者"""
+        return self.buffer.cursor(self.position)
+
+
+class Replayable(Iterable[T]):
+    """可以被多次迭代的 iterable
+
+    上游只会被读取一次，读取过的元素保存在共享缓冲区中，每次迭代都从头开始。
+    """
+
+    __slots__ = ("_cursor",)
+
+    def __init__(self, iterable: Iterable[T]) -> None:
+        self._cursor = TeeBuffer(iterable).cursor()
+
+    def __iter__(self) -> Iterator[T]:
+        return self._cursor.copy()
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self._cursor.buffer!r}>"
+
+
+class AsyncTeeBuffer(TeeBuffer[T]):
+    """多读取者共享的异步缓冲区
+
+    与 TeeBuffer 相同，只是上游是一个异步可迭代对象；同一时刻只有一个读取者会从上游读取。
+    """
+
+    __slots__ = ("_lock",)
+
+    def __init__(
+        self,
+        iterable: AsyncIterable[T],
+        max_size: Optional[int] = None,
+        overflow: OverflowPolicy = "raise",
+        one_shot: bool = False,
+    ) -> None:
+        super().__init__((), max_size, overflow, one_shot)
+        self._iterator = aiter(iterable)
+        self._lock = asyncio.Lock()
+
+    def __iter__(self) -> Iterator[T]:
+        raise TypeError(f"'{self.__class__.__name__}' object is not iterable")
+
+    def __aiter__(self) -> AsyncIterator[T]:
+        return aiter(self.cursor())
+
+    def cursor(self, position: Optional[int] = None) -> "AsyncTeeCursor[T]":
+        """在 position（默认为最慢的读取者所在的位置）处新建一个读取者"""
+        cursor = AsyncTeeCursor(self, self._start(position))
+        self._cursors.add(cursor)
+        return cursor
+
+
+class AsyncTeeCursor(AsyncIterable[T]):
+    """共享异步缓冲区上的一个读取者"""
+
+    __slots__ = "buffer", "position", "__weakref__"
+
+    buffer: AsyncTeeBuffer[T]
+    position: int
+
+    def __init__(self, buffer: AsyncTeeBuffer[T], position: int) -> None:
+        self.buffer = buffer
+        self.position = position
+
+    def __aiter__(self) -> AsyncIterator[T]:
+        return self._read()
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} position={self.position}>"
+
+    # noinspection PyProtectedMember
+    async def _read(self) -> AsyncIterator[T]:
+        buffer = self.buffer
+        items = buffer._items
+        segment: Tuple[int, List[T]] = (0, [])
+        while True:
+            position = self.position
+            index = position - buffer._base
+            if index >= len(items):
+                async with buffer._lock:
+                    # 等待期间其它读取者可能已经读取了这个元素
+                    index = position - buffer._base
+                    if index >= len(items):
+                        if index >= buffer._limit:
+                            buffer._make_room()
+                        try:
+                            item = await anext(buffer._iterator)
+                        except StopAsyncIteration:
+                            buffer._cursors.discard(self)
+                            buffer._release()
+                            return
+                        items.append(item)
+                continue
+            elif index >= buffer._head:
+                item = items[index]
+            else:
+                offset = position - segment[0]
+                if not 0 <= offset < len(segment[1]):
+                    segment = buffer._load(position)
+                    offset = position - segment[0]
+                item = segment[1][offset]
+            self.position = position + 1
+            yield item
+
+    def copy(self) -> "AsyncTeeCursor[T]":
+        """在当前位置新建一个读取者"""
+        return self.buffer.cursor(self.position)
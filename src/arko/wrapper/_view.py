@@ -0,0 +1,73 @@
+"""序列视图
+
+为 list、tuple、range 提供基于下标的只读视图，切片与反转都只会产生新的下标范围，而不会复制元素。
+"""
+
+from typing import Iterator, Optional, Sequence, TypeVar, Union, overload
+
+from arko.wrapper._cache import CachedSource
+
+__all__ = ("SequenceView", "SEQUENCE_TYPES", "view")
+
+T = TypeVar("T")
+
+
+class SequenceView(Sequence[T]):
+    """序列的只读视图
+
+    视图只记录 base 与一个下标范围，对 base 的修改会直接反映在视图上。
+    """
+
+    __slots__ = "base", "indices"
+
+    base: Sequence[T]
+    indices: range
+
+    def __init__(self, base: Sequence[T], indices: Optional[range] = None) -> None:
+        if not isinstance(base, Sequence):
+            raise TypeError(f"'{type(base).__name__}' object is not a sequence")
+        if isinstance(base, SequenceView):
+            indices = base.indices if indices is None else base.indices[indices]
+            base = base.base
+        self.base = base
+        self.indices = range(len(base)) if indices is None else indices
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    @overload
+    def __getitem__(self, index: int) -> T: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "SequenceView[T]": ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[T, "SequenceView[T]"]:
+        if isinstance(index, slice):
+            return self.__class__(self.base, self.indices[index])
+        return self.base[self.indices[index]]
+
+    def __iter__(self) -> Iterator[T]:
+        if self.indices == range(len(self.base)):
+            return iter(self.base)
+        return map(self.base.__getitem__, self.indices)
+
+    def __reversed__(self) -> Iterator[T]:
+        return map(self.base.__getitem__, reversed(self.indices))
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({list(self)!r})"
+
+    def reverse(self) -> "SequenceView[T]":
+        """返回反转后的视图"""
+        return self.__class__(self.base, self.indices[::-1])
+
+
+SEQUENCE_TYPES = (list, tuple, range, SequenceView, CachedSource)
+"""可以直接按下标访问、无需经过 tee 的序列类型"""
+
+
+def view(sequence: Sequence[T], index: slice) -> Sequence[T]:
+    """返回 sequence 在 index 上的视图，range 本身即是视图"""
+    if isinstance(sequence, range):
+        return sequence[index]
+    return SequenceView(sequence)[index]
@@ -0,0 +1,239 @@
+"""窗口
+
+按元素个数或时间划分窗口，并增量地计算窗口内的聚合值：
+每个元素进出窗口时只更新一次累加器，最小值与最大值使用单调队列维护，均摊 O(1)。
+"""
+
+import math
+from collections import deque
+from itertools import islice
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+__all__ = ("Rolling", "WindowAggregate", "sliding", "tumbling", "windowed")
+
+T = TypeVar("T")
+
+WindowAggregate = Optional[Union[str, Sequence[str]]]
+
+KINDS = ("count", "sum", "mean", "min", "max")
+
+
+class Rolling:
+    """可以从尾部加入、从头部移除元素的窗口聚合
+
+    只维护 kinds 中的聚合所需的状态：例如只求最小值时元素不需要支持加法，只求和时元素不需要能比较大小。
+    """
+
+    __slots__ = ("values", "total", "pushed", "mins", "maxes", "summing", "ordering")
+
+    def __init__(self, kinds: Iterable[str] = KINDS) -> None:
+        kinds = set(kinds)
+        self.summing = not kinds.isdisjoint(("sum", "mean"))
+        self.ordering = not kinds.isdisjoint(("min", "max"))
+        self.values: Deque[Any] = deque()
+        self.total: Any = 0
+        # 已经加入过的元素的数量，用作单调队列中元素的序号
+        self.pushed = 0
+        # 单调队列：(序号, 值)，mins 中的值单调不减，maxes 中的值单调不增
+        self.mins: Deque[Tuple[int, Any]] = deque()
+        self.maxes: Deque[Tuple[int, Any]] = deque()
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def push(self, value: Any) -> None:
+        self.values.append(value)
+        if self.summing:
+            self.total += value
+        index = self.pushed
+        self.pushed += 1
+        if not self.ordering:
+            return
+        mins, maxes = self.mins, self.maxes
+        while mins and mins[-1][1] > value:
+            mins.pop()
+        mins.append((index, value))
+        while maxes and maxes[-1][1] < value:
+            maxes.pop()
+        maxes.append((index, value))
+
+    def pop(self) -> Any:
+        """移除最早加入的元素"""
+        value = self.values.popleft()
+        if self.summing:
+            self.total = self.total - value if self.values else 0
+        if not self.ordering:
+            return value
+        index = self.pushed - len(self.values) - 1
+        if self.mins[0][0] == index:
+            self.mins.popleft()
+        if self.maxes[0][0] == index:
+            self.maxes.popleft()
+        return value
+
+    def clear(self) -> None:
+        self.values.clear()
+        self.mins.clear()
+        self.maxes.clear()
+        self.total = 0
+
+    def get(self, kind: str) -> Any:
+        if kind == "count":
+            return len(self.values)
+        elif kind == "sum":
+            return self.total
+        elif kind == "mean":
+            return self.total / len(self.values) if self.values else math.nan
+        elif kind == "min":
+            return self.mins[0][1] if self.mins else None
+        return self.maxes[0][1] if self.maxes else None
+
+
+def _kinds(aggregate: WindowAggregate) -> Tuple[str, ...]:
+    if aggregate is None:
+        return ()
+    kinds = (aggregate,) if isinstance(aggregate, str) else tuple(aggregate)
+    for kind in kinds:
+        if kind not in KINDS:
+            raise ValueError(f"Unsupported aggregate: {kind!r}")
+    return kinds
+
+
+def _reader(
+    aggregate: WindowAggregate,
+) -> Optional[Callable[[Rolling], Union[Any, Dict[str, Any]]]]:
+    """返回由 Rolling 读取聚合结果的函数，aggregate 为 None 时返回 None"""
+    if aggregate is None:
+        return None
+    kinds = _kinds(aggregate)
+    if isinstance(aggregate, str):
+        kind = kinds[0]
+        return lambda rolling: rolling.get(kind)
+    return lambda rolling: {kind: rolling.get(kind) for kind in kinds}
+
+
+def windowed(
+    iterable: Iterable[T],
+    n: int,
+    step: int = 1,
+    value: Optional[Callable[[T], Any]] = None,
+    aggregate: WindowAggregate = None,
+) -> Iterator[Any]:
+    """每 step 个元素产出一个包含 n 个元素的窗口，只产出完整的窗口
+
+    aggregate 为 None 时产出窗口内元素组成的元组，否则产出窗口内 value(元素) 的聚合值：
+    aggregate 为 "count"、"sum"、"mean"、"min"、"max" 之一时产出该值，为它们组成的序列时产出字典。
+    """
+    if n <= 0:
+        raise ValueError(f"'n' must be a positive number: {n}")
+    if step <= 0:
+        raise ValueError(f"'step' must be a positive number: {step}")
+    read = _reader(aggregate)
+    iterator = iter(iterable)
+
+    if read is None:
+        window: Deque[T] = deque(maxlen=n)
+        while True:
+            window.extend(islice(iterator, n - len(window)))
+            if len(window) < n:
+                return
+            yield tuple(window)
+            for _ in range(min(step, n)):
+                window.popleft()
+            if step > n:
+                next(islice(iterator, step - n, step - n), None)
+
+    rolling = Rolling(_kinds(aggregate))
+    for item in iterator:
+        rolling.push(item if value is None else value(item))
+        if len(rolling) == n:
+            yield read(rolling)
+            for _ in range(min(step, n)):
+                rolling.pop()
+            if step > n:
+                next(islice(iterator, step - n, step - n), None)
+
+
+def tumbling(
+    iterable: Iterable[T],
+    seconds: float,
+    key: Callable[[T], float],
+    value: Optional[Callable[[T], Any]] = None,
+    aggregate: WindowAggregate = None,
+) -> Iterator[Tuple[float, Any]]:
+    """按时间划分互不重叠的窗口，产出 (窗口的起始时间, 窗口)
+
+    key 返回每个元素的时间戳（秒），时间戳需要单调不减；窗口的起始时间为 seconds 的整数倍，没有元素的窗口会被跳过。
+    aggregate 的含义与 windowed 相同。
+    """
+    if seconds <= 0:
+        raise ValueError(f"'seconds' must be a positive number: {seconds}")
+    read = _reader(aggregate)
+    rolling = Rolling(_kinds(aggregate))
+    items = []
+    current: Optional[float] = None
+    for item in iterable:
+        start = math.floor(key(item) / seconds) * seconds
+        if current is not None and start != current:
+            if start < current:
+                raise ValueError(f"Timestamps must not decrease: {key(item)}")
+            if read is None:
+                yield current, tuple(items)
+                items = []
+            else:
+                yield current, read(rolling)
+                rolling.clear()
+        current = start
+        if read is None:
+            items.append(item)
+        else:
+            rolling.push(item if value is None else value(item))
+    if current is not None:
+        yield current, tuple(items) if read is None else read(rolling)
+
+
+def sliding(
+    iterable: Iterable[T],
+    seconds: float,
+    key: Callable[[T], float],
+    value: Optional[Callable[[T], Any]] = None,
+    aggregate: WindowAggregate = None,
+) -> Iterator[Tuple[float, Any]]:
+    """每个元素产出一次 (时间戳, 窗口)，窗口包含时间戳在 (t - seconds, t] 内的元素
+
+    key 返回每个元素的时间戳（秒），时间戳需要单调不减。aggregate 的含义与 windowed 相同。
+    """
+    if seconds <= 0:
+        raise ValueError(f"'seconds' must be a positive number: {seconds}")
+    read = _reader(aggregate)
+    rolling = Rolling(_kinds(aggregate))
+    items: Deque[T] = deque()
+    stamps: Deque[float] = deque()
+    for item in iterable:
+        stamp = key(item)
+        if stamps and stamp < stamps[-1]:
+            raise ValueError(f"Timestamps must not decrease: {stamp}")
+        stamps.append(stamp)
+        if read is None:
+            items.append(item)
+        else:
+            rolling.push(item if value is None else value(item))
+        while stamps[0] <= stamp - seconds:
+            stamps.popleft()
+            if read is None:
+                items.popleft()
+            else:
+                rolling.pop()
+        yield stamp, tuple(items) if read is None else read(rolling)
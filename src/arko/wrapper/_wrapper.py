@@ -0,0 +1,1902 @@
+import builtins
+import copy
+import functools
+import heapq
+import itertools
+import operator
+import random
+import statistics
+import sys
+from itertools import (
+    chain,
+    compress,
+    cycle,
+    dropwhile,
+    filterfalse,
+    groupby,
+    islice,
+    starmap,
+    takewhile,
+    tee,
+    zip_longest,
+)
+from typing import (
+    Any,
+    Callable,
+    ClassVar,
+    Dict,
+    Generic,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    NoReturn,
+    Optional,
+    Reversible,
+    Sequence,
+    Sized,
+    Tuple,
+    TypeVar,
+    Union,
+    overload,
+)
+
+from typing_extensions import (
+    Self,
+    SupportsIndex,
+    SupportsInt,
+    Type,
+)
+
+from arko.wrapper._aggregate import AggregateSpec, Aggregation, aggregate
+from arko.wrapper._batch import RecordBatch, Schema, batches
+from arko.wrapper._bloom import BloomFilter
+from arko.wrapper._cache import CachedSource
+from arko.wrapper._codec import read_jsonl, read_msgpack, write_jsonl, write_msgpack
+from arko.wrapper._external import external_sort
+from arko.wrapper._file import FileSource, StrOrPath
+from arko.wrapper._hint import (
+    Hinted,
+    LengthHint,
+    chunk_count,
+    estimate,
+    slice_length,
+)
+from arko.wrapper._join import JoinType, hash_join, merge_join
+from arko.wrapper._numeric import (
+    Chunks,
+    DEFAULT_CHUNK_SIZE,
+    accumulate_chunks,
+    accumulate_ufunc,
+    filter_chunks,
+    map_chunks,
+    numpy,
+    scalar,
+    sort_chunks,
+    split_array,
+    to_arrays,
+    top_chunks,
+    unique_chunks,
+)
+from arko.wrapper._parallel import (
+    ExecutorType,
+    filter_chunk,
+    filter_false_chunk,
+    fold_chunk,
+    map_chunk,
+    parallel,
+    tree_reduce,
+)
+from arko.wrapper._persist import DiskCache, fingerprint, source_fingerprint
+from arko.wrapper._pipeline import Pipeline
+from arko.wrapper._prefetch import prefetch, prefetch_parts
+from arko.wrapper._profile import Profiler, active_profiler
+from arko.wrapper._sample import bernoulli, reservoir, stratified
+from arko.wrapper._search import AhoCorasick, kmp_search, window_search
+from arko.wrapper._sketch import CountMinSketch, HyperLogLog, QuantileSketch
+from arko.wrapper._spec import PipelineSpec
+from arko.wrapper._tee import OverflowPolicy, Replayable, TeeBuffer, TeeCursor
+from arko.wrapper._view import SEQUENCE_TYPES, SequenceView, view
+from arko.wrapper._window import WindowAggregate, sliding, tumbling, windowed
+
+try:
+    import more_itertools
+except ImportError:
+    more_itertools = None
+
+__all__ = ["ArkoWrapper"]
+
+T = TypeVar("T")
+E = TypeVar("E")
+R = TypeVar("R")
+Wrapper = TypeVar("Wrapper", bound="ArkoWrapper")
+default_max = sys.maxsize
+NOT_SET = object()
+
+
+def _stage_name(frame: Any) -> str:
+    """由创建 ArkoWrapper 的栈帧得到阶段的名称"""
+    code = frame.f_code
+    if "<locals>" not in code.co_qualname and isinstance(
+        frame.f_locals.get("self"), ArkoWrapper
+    ):
+        return code.co_name
+    return "source"
+
+
+# noinspection PyUnreachableCode
+class ArkoWrapper(Generic[T]):
+    """一个 Python 迭代器的包装器"""
+
+    __root__: Iterable[T]
+    _max: int
+    _hint: Optional[LengthHint]
+    _source: Optional[FileSource]
+
+    __slots__ = "__root__", "_max", "_hint", "_source"
+
+    # noinspection PyTypeChecker
+    def __init__(
+        self,
+        iterable: Optional[Union[Iterable[T], T]] = None,
+        *,
+        max_operate_times: Optional[int] = default_max,
+    ) -> NoReturn:
+        """初始化方法
+
+        Args:
+            iterable: 需要被 Wrap 的 Object。 可以是一个迭代器或者其它任何Object。
+            max_operate_times: Wrapper 操作次数的上限。用于限制无限的迭代器。
+        """
+        if numpy is not None and isinstance(iterable, numpy.ndarray):
+            self.__root__ = (
+                Chunks(split_array(iterable, DEFAULT_CHUNK_SIZE))
+                if iterable.ndim == 1
+                else iterable
+            )
+        elif isinstance(iterable, Iterable):
+            self.__root__ = iterable
+        elif iterable is None:
+            self.__root__ = []
+        else:
+            self.__root__ = [iterable]
+
+        if max_operate_times <= 0:
+            raise ValueError(f"Requires a positive number: {max_operate_times}")
+        elif max_operate_times > default_max:
+            raise ValueError(f"'max_operate_times' cannot exceed {default_max}")
+        self._max = max_operate_times
+        self._hint = None
+        # 流水线最初的数据源文件，由 _derive 传递给下游，persist 以它的指纹作为缓存条目名称的一部分
+        self._source = self.__root__ if isinstance(self.__root__, FileSource) else None
+
+        profiler = active_profiler()
+        if profiler is not None and isinstance(self.__root__, Iterator):
+            self.__root__ = profiler.track(_stage_name(sys._getframe(1)), self.__root__)
+
+    def __str__(self) -> str:
+        return str(self.__root__)
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} " + "{" + f"{self.__root__}" + "}>"
+
+    def _tee(self) -> Iterable[T]:
+        """将已有迭代器分裂一次
+
+        所有分支共享同一个缓冲区，各自只记录读取的位置，因此多次分裂不会层层嵌套。
+        自身保留一个停在起点的读取者，因此可以被多次迭代，代价是读取过的元素会一直保留在缓冲区中；
+        由 buffer 创建的 ArkoWrapper 不保留这个读取者，见 buffer。
+        """
+        root = self.__root__
+        if isinstance(root, (Pipeline, Chunks, FileSource, *SEQUENCE_TYPES)):
+            profiler = active_profiler()
+            if profiler is not None:
+                return profiler.track(f"source:{type(root).__name__}", iter(root))
+            return iter(root)
+        if isinstance(root, TeeBuffer):
+            return root.cursor()
+        if isinstance(root, TeeCursor) and root.buffer.one_shot:
+            # 由 buffer 创建的流的分支：直接读取自身的读取者，使读过的元素可以被释放
+            return root
+        if not isinstance(root, TeeCursor):
+            if self._hint is None:
+                # root 即将被替换，先记下它的长度
+                self._hint = self._length_hint()
+            self.__root__ = root = TeeBuffer(root).cursor()
+        return root.copy()
+
+    def _length_hint(self) -> Optional[LengthHint]:
+        """返回自身的长度提示，未知时返回 None"""
+        if self._hint is not None and self._hint.exact:
+            return self._hint
+        root = self.__root__
+        if isinstance(root, ArkoWrapper):
+            return root._length_hint()
+        elif isinstance(root, CachedSource):
+            # 求长度会读完上游，未读完时只使用已有的提示
+            return LengthHint(len(root.items)) if root.complete else self._hint
+        elif isinstance(root, Sized):
+            return LengthHint(len(root))
+        return self._hint or estimate(root)
+
+    def _derive(
+        self,
+        wrapper: Wrapper,
+        transform: Optional[Callable[[int], int]] = None,
+        exact: bool = True,
+    ) -> Wrapper:
+        """根据自身的长度提示推算 wrapper 的长度提示，并将数据源文件传递给 wrapper
+
+        Args:
+            wrapper: 由自身产生的新的 ArkoWrapper。
+            transform: 由自身的长度计算 wrapper 长度的函数，默认为长度不变。
+            exact: 为 False 时，计算结果只是一个上限。
+        """
+        if wrapper._source is None:
+            wrapper._source = self._source
+        hint = self._length_hint()
+        if hint is not None:
+            length = hint.length if transform is None else transform(hint.length)
+            wrapper._hint = LengthHint(builtins.max(length, 0), hint.exact and exact)
+        return wrapper
+
+    def _then(self, kind: str, func: Optional[Callable] = None, *args) -> Self:
+        """在惰性流水线上追加一个操作"""
+        # noinspection PyUnresolvedReferences
+        return self.__class__(self.__root__.then(kind, func, *args))
+
+    def _chunks(self, arrays: Iterable["numpy.ndarray"]) -> Self:
+        """以数值模式包装一串数组块"""
+        # noinspection PyUnresolvedReferences
+        chunk_size = self.__root__.chunk_size
+        return self.__class__(Chunks(Replayable(arrays), chunk_size))
+
+    def _max_gen(self) -> Iterator[T]:
+        """将自己的迭代器现在某个范围内"""
+        return islice(self._tee(), self._max)
+
+    def __add__(self, other: Union[E, Iterable[E]]) -> Self:
+        """实现加法操作。返回两个实列组成的新的迭代器的ArkoWrapper
+
+        Args:
+            other(Any): 相加的实列。
+
+        Returns:
+            ArkoWrapper: 返回两个实列组成的新的迭代器的 ArkoWrapper
+        """
+
+        values = self._tee()
+
+        def generate() -> Iterator[Union[T, E]]:
+            yield from values
+            if not isinstance(other, str) and (
+                    isinstance(other, Iterable)
+                    and not (isinstance(other, str) and len(other) > 1)
+            ):
+                yield from other  # todo:复制生成器
+            else:
+                yield other
+
+        return self.__class__(generate())
+
+    def __radd__(self, other: Union[Iterable[E], E]) -> Self:
+        """实现反射加法操作。"""
+
+        values = self._tee()
+
+        def generate() -> Iterator[Union[T, E]]:
+            if not isinstance(other, str) and isinstance(other, Iterable):
+                yield from other  # todo: 复制生成器
+            else:
+                yield other
+            yield from values
+
+        return self.__class__(generate())
+
+    def __rsub__(self, other: Union[Iterable[T], T]) -> Self:
+        return self.remove(other, remove_all=False)
+
+    def __eq__(self, other: Any) -> bool:
+        """定义操作符(==)的行为。"""
+        if isinstance(other, Sized) and self.length != len(other):
+            return False
+        if isinstance(other, Hashable) and self.__hash__() == hash(other):
+            return True
+        if isinstance(other, Iterable):
+            for i in self.zip_longest(ArkoWrapper(other)):
+                if i[0] != i[1]:
+                    return False
+            return True
+        return self == [other]
+
+    def __copy__(self) -> Self:
+        return self._derive(self.__class__(self.__root__))
+
+    def __deepcopy__(self, *args) -> Self:
+        """定义对类的实例使用 copy.copy() 时的行为"""
+        return self._derive(self.__class__(self._tee()))
+
+    def __getitem__(self, index: Any) -> T:
+        """定义对容器中某一项使用 self[key] 的方式进行读取操作时的行为"""
+        if isinstance(index, slice):
+            # list、tuple、range 的切片仍返回同类型的对象，由它们创建的视图返回新的 ArkoWrapper
+            if isinstance(self.__root__, (SequenceView, CachedSource)):
+                return self.__class__(view(self.__root__, index))
+            if "__getitem__" in dir(self.__root__):
+                # noinspection PyUnresolvedReferences
+                return self.__root__[index]  # NOSONAR
+            try:
+                return self.slice(start=index.start, stop=index.stop, step=index.step)
+            except ValueError:
+                return self.__class__(list(self._max_gen()).__getitem__(index))
+        if isinstance(self.__root__, SEQUENCE_TYPES):
+            try:
+                return self.__root__[int(index)]
+            except IndexError:
+                raise ValueError(f"Out of range: {index}")
+        try:
+            index = int(index)
+            if index >= 0:
+                target = self._tee()
+            else:
+                target = self.reverse()
+                index = -index - 1
+            iter_values = iter(target)
+            time = -1
+            value = next(iter_values)
+            while value:
+                time += 1
+                if time == index:
+                    return value
+                value = next(iter_values)
+        except StopIteration:
+            raise ValueError(f"Out of range: {index}")
+        except Exception:
+            raise IndexError("Unsupported indexing for iterable")
+
+    def __contains__(self, item: Any) -> bool:
+        if isinstance(self.__root__, SEQUENCE_TYPES):
+            return item in self.__root__
+        for elem in self._tee():
+            if elem == item:
+                return True
+        return False
+
+    def __hash__(self) -> int:
+        return hash(self._tee())
+
+    def __index__(self) -> int:
+        """实现当对象用于切片表达式时到一个整数的类型转换。"""
+        return self.__len__()
+
+    if sys.version_info <= (3, 8):
+
+        def __int__(self) -> int:
+            return self.__index__()
+
+    def __iter__(self) -> Iterator[T]:
+        """返回当前的迭代器。"""
+        return iter(self._tee())
+
+    _len_cache: ClassVar[Dict[int, int]] = {}
+
+    def __len__(self) -> int:
+        """返回当前的迭代器的长度，如果无限的话，则回返回最大操作次数。
+
+        长度已知时（例如 root 是一个容器，或经过 map、sort 等不改变长度的操作）不会遍历迭代器。
+        """
+        hint = self._length_hint()
+        if hint is not None and hint.exact:
+            return hint.length
+        values = self._tee()
+        # 从共享缓冲区读取时，记下的长度从上游的开头算起
+        start = values.position if isinstance(values, TeeCursor) else 0
+        length = 0
+        for _ in values:
+            length += 1
+            if length >= self._max:
+                return self._max
+        self._hint = LengthHint(start + length)
+        return length
+
+    def __length_hint__(self) -> int:
+        hint = self._length_hint()
+        return NotImplemented if hint is None else hint.length
+
+    def __matmul__(self, other: Any) -> T:
+        """定义操作符(@)的行为。"""
+        return self.__getitem__(other)
+
+    def __mul__(self, times: Union[SupportsIndex, SupportsInt, Iterable[E]]) -> Self:
+        """实现乘法操作"""
+        if isinstance(times, (SupportsIndex, SupportsInt)):
+            times = int(times)
+            if times <= 0:
+                raise ValueError(f"'times' can only be positive: {times}")
+            return self.__class__(
+                chain.from_iterable(itertools.repeat(tuple(self._tee()), times))
+            )
+        elif isinstance(times, Iterable):
+            return self.product(times)
+        raise TypeError(f"Unsupported Type: {type(times)}.")
+
+    def __truediv__(self, other: Any) -> Self:
+        """实现除法操作"""
+        if isinstance(other, int):
+            if other < 1:
+                raise ValueError("Dividend must be at least 1")
+
+            if isinstance(self.__root__, SEQUENCE_TYPES):
+                seq = self.__root__
+            else:
+                iterable = self.tee()
+
+                try:
+                    iterable[:0]
+                except TypeError:
+                    seq = tuple(iterable)
+                else:
+                    seq = iterable
+
+            q, r = divmod(len(seq), other)
+
+            result = []
+            stop = 0
+            for i in range(1, other + 1):
+                start = stop
+                stop += q + 1 if i <= r else q
+                if isinstance(seq, SEQUENCE_TYPES):
+                    result.append(self.__class__(view(seq, slice(start, stop))))
+                else:
+                    result.append(self.__class__(iter(seq[start:stop])))
+
+            return self.__class__(result)
+
+        return self.remove(other, remove_all=True)
+
+    def __neg__(self) -> Self:
+        """定义取负操作"""
+        return self.__reversed__()
+
+    def __reversed__(self) -> Self:
+        """定义反转"""
+        if isinstance(self.__root__, SEQUENCE_TYPES):
+            return self.__class__(view(self.__root__, slice(None, None, -1)))
+        elif isinstance(self.__root__, Reversible):
+            from copy import deepcopy as copy
+
+            return self._derive(self.__class__(reversed(copy(self.__root__))))
+        else:
+            return self._derive(
+                self.__class__(reversed(list(self._max_gen()))),
+                lambda n: builtins.min(n, self._max),
+            )
+
+    def __rshift__(self, target: Union[Callable[[Iterable[T], Any], R], Sequence]) -> R:
+        """实现右移位运算符 >>"""
+        if isinstance(target, type) or callable(target):
+            result: R = self.collect(target)
+        elif isinstance(target, Sequence):
+            # noinspection PyArgumentList,PyProtectedMember
+            result: R = target.__class__(self.__radd__(target)._tee())
+        else:
+            raise TypeError(f"Unsupported value or type: '{target}'")
+        return result
+
+    @property
+    def root(self) -> Iterable[T]:
+        return self.__root__
+
+    @property
+    def length(self) -> int:
+        return self.__len__()
+
+    @property
+    def max_operate_time(self) -> int:
+        """最大操作次数，防止无线递归"""
+        return self._max
+
+    @max_operate_time.setter
+    def max_operate_time(self, max_operate_time: int) -> NoReturn:
+        if max_operate_time <= 0:
+            raise ValueError(f"Requires a positive number: {max_operate_time}")
+        self._max = max_operate_time
+
+    if sys.version_info >= (3, 8):
+
+        def accumulate(
+            self,
+            func: Optional[Callable[[T, T], R]] = operator.add,
+            *,
+            initial: Optional[int] = None,
+        ) -> Self:
+            extra = 0 if initial is None else 1
+            if isinstance(self.__root__, Chunks):
+                ufunc = accumulate_ufunc(func)
+                if ufunc is not None:
+                    return self._derive(
+                        self._chunks(
+                            accumulate_chunks(self.__root__.arrays, ufunc, initial)
+                        ),
+                        lambda n: n + extra,
+                    )
+            return self._derive(
+                self.__class__(
+                    itertools.accumulate(self._tee(), func, initial=initial)
+                ),
+                lambda n: n + extra,
+            )
+
+    else:
+
+        def accumulate(
+            self, func: Optional[Callable[[T, T], R]] = operator.add
+        ) -> Self:
+            return self.__class__(itertools.accumulate(self._tee(), func))
+
+    def aggregate(
+        self,
+        key: Callable[[T], R],
+        *,
+        count: bool = False,
+        sum: AggregateSpec = None,
+        min: AggregateSpec = None,
+        max: AggregateSpec = None,
+        mean: AggregateSpec = None,
+        collect: AggregateSpec = None,
+        max_keys: Optional[int] = None,
+        partitions: int = 16,
+    ) -> "ArkoWrapper[Tuple[R, Dict[str, Any]]]":
+        """按 key 分组聚合，无需先排序，得到 (key, {聚合名称: 结果}) 组成的 ArkoWrapper
+
+        与 groupby 不同，不相邻的相同 key 也会被分到同一组。只遍历一次，每个 key 只保留一个累加器。
+
+        Args:
+            key: 分组所依据的函数。
+            count: 是否统计每组元素的个数。
+            sum: 求和。为 True 时作用于元素本身，为函数时作用于其返回值，其余聚合同理。
+            min: 最小值。
+            max: 最大值。
+            mean: 算术平均值。
+            collect: 将每组的值按顺序收集为列表。
+            max_keys: 内存中最多保留的累加器数量，超出时按 key 的哈希值分为 partitions 个分区写入临时文件，
+                结果会按分区依次产出，key 与累加器需要能被 pickle。默认不限制，并按 key 第一次出现的顺序产出。
+                哈希值相同的 key 无法被分开，分区递归到一定深度后会直接在内存中合并，不再受此限制。
+            partitions: 写入临时文件时的分区数量。
+        """
+        aggregation = Aggregation(
+            count=count, sum=sum, min=min, max=max, mean=mean, collect=collect
+        )
+        return self.__class__(
+            aggregate(self._tee(), key, aggregation, max_keys, partitions)
+        )
+
+    def all(self) -> bool:
+        """如果所有元素均为真值（或root为空）则返回 True"""
+        iter_values = iter(self._tee())
+        try:
+            while bool(next(iter_values)):
+                ...
+            return False
+        except StopIteration:
+            return True
+
+    def any(self) -> bool:
+        """如果任一元素为真值则返回 True。 若root为空，返回 False"""
+        iter_values = iter(self._tee())
+        try:
+            while not bool(next(iter_values)):
+                ...
+            return True
+        except StopIteration:
+            return False
+
+    def add(self, other: Union[E, Iterable[E]]) -> Self:
+        return self.__add__(other)
+
+    def append(self, *obj: E) -> Self:
+        """将对象附加到 ArkoWrapper 的末尾。注：此方法会修改本身的 __root__"""
+
+        def clean() -> List[Union[E, T]]:
+            temp = []
+            iter_values = iter(self._tee())
+            try:
+                for _ in range(self._max):
+                    temp.append(next(iter_values))
+            except StopIteration:
+                for item in obj:
+                    temp.append(item)
+                return temp
+
+        result = self.__class__()
+        values = clean()
+        self.__root__, result.__root__ = tee(values)
+        self._hint = LengthHint(len(values))
+        return self
+
+    def approx_distinct(self, precision: int = 14) -> HyperLogLog:
+        """用 HyperLogLog 估计不同元素的数量，只使用 2 ** precision 字节的内存
+
+        返回的 HyperLogLog 可以用 count 取得估计值，也可以与其它部分的结果 merge 后再估计。
+        相对误差约为 1.04 / sqrt(2 ** precision)，元素需要能被 msgspec 编码。
+        """
+        return HyperLogLog(precision).update(self._max_gen())
+
+    def approx_quantiles(
+        self, qs: Sequence[float] = (0.5,), *, k: int = 200
+    ) -> QuantileSketch:
+        """用 KLL 概要估计分位数，只使用约 3k 个元素的内存
+
+        返回的 QuantileSketch 的 quantiles() 给出 qs 中各分位数的估计值，也可以估计其它分位数，
+        或与其它部分的结果 merge。秩的误差约为 1.7 / k。
+        """
+        return QuantileSketch(k, qs).update(self._max_gen())
+
+    def bernoulli(self, p: float, seed: Optional[int] = None) -> Self:
+        """每个元素各自以概率 p 被选中，按原来的顺序产出
+
+        按几何分布直接跳过未被选中的元素，随机数的调用次数只与被选中的元素的数量有关。
+
+        Args:
+            p: 每个元素被选中的概率。
+            seed: 随机数种子，给出时结果可以复现。
+        """
+        result = self.__class__(bernoulli(self._max_gen(), p, random.Random(seed)))
+        return self._derive(result, exact=p == 1)
+
+    def buffer(
+        self, max_size: Optional[int], *, overflow: OverflowPolicy = "raise"
+    ) -> Self:
+        """转为只能读取一次的流，并限制分支之间共享缓冲区的大小
+
+        返回的 ArkoWrapper 不再保留停在起点的读取者：新的分支从最慢的仍在读取的分支所在的位置开始，
+        所有分支都已读过的元素会被释放，之后无法再次读取。例如求 len() 之后再迭代将得不到任何元素。
+        它及由它分裂出的分支在内存中最多缓冲 max_size 个元素，max_size 为 None 时不限制。
+        最慢的分支落后太多时，overflow 为 "raise" 则抛出 BufferError，
+        为 "spill" 则将较旧的元素用 pickle 写入临时文件。
+        """
+        result = self.__class__(
+            TeeBuffer(self._tee(), max_size, overflow, one_shot=True)
+        )
+        return self._derive(result)
+
+    def cache(self) -> Self:
+        """缓存读取到的元素
+
+        之后的迭代、len()、in、按下标（包括负下标）访问与反转都直接使用缓存，上游的每个元素最多只会被计算一次。
+        缓存按需填充，只读取所需的部分时不会读完上游。
+        """
+        if isinstance(self.__root__, SEQUENCE_TYPES):
+            return self._derive(self.__class__(self.__root__))
+        return self._derive(self.__class__(CachedSource(self._tee())))
+
+    def chain(self, *iterables: Iterable[E]) -> Self:
+        """创建一个迭代器，它首先返回第一个可迭代对象中所有元素，接着返回下一个可迭代对象中所有元素，直到耗尽所有可迭代对象中的元素。"""
+        return self.__class__(chain(self._tee(), *iterables))
+
+    def collect(
+        self, func: Optional[Callable[[Iterable[T], Any], R]] = list, *args, **kwargs
+    ) -> R:
+        """以整个迭代器作为参数，于给定的 func 函数中进行运算
+
+        长度已知时，list 与 tuple 会预先分配好空间。
+        """
+        if func in (list, tuple):
+            hint = self._length_hint()
+            if hint is not None and hint.exact:
+                return func(Hinted(iter(self._tee()), hint.length), *args, **kwargs)
+        return func(self._tee(), *args, **kwargs)
+
+    def combinations(self, r: int = 2) -> Self:
+        """返回由元素组成长度为 r 的子序列"""
+        return self.__class__(itertools.combinations(self._tee(), r))
+
+    def combinations_with_replacement(self, r: int = 2) -> Self:
+        """返回由元素组成的长度为 r 的子序列，允许每个元素可重复出现。"""
+        return self.__class__(itertools.combinations_with_replacement(self._tee(), r))
+
+    def compress(self, selectors: Iterable) -> Self:
+        """返回元素中经 selectors 真值测试为 True 的元素"""
+        return self.__class__(compress(self._tee(), selectors))
+
+    def cycle(self) -> Self:
+        return self.__class__(cycle(self._tee()))
+
+    def delete(self, target: Union[Callable[[E], bool], E]) -> Self:
+        """从 ArkoWrapper 中删除指定对象。注：此方法会修改本身的 __root__"""
+
+        def generator() -> Iterator[E]:
+            is_callable = isinstance(target, Callable)
+            for e in iter_values:
+                if (is_callable and target(e)) or target == e:
+                    continue
+                yield e
+
+        iter_values = self._tee()
+        return self._derive(self.__class__(generator()), exact=False)
+
+    def drop_while(self, func: Callable[[T], bool]) -> Self:
+        if isinstance(self.__root__, Pipeline):
+            return self._derive(self._then("drop_while", func), exact=False)
+        return self._derive(self.__class__(dropwhile(func, self._tee())), exact=False)
+
+    def empty(self) -> bool:
+        return self.__len__() == 0
+
+    def enumerate(self) -> Self:
+        if isinstance(self.__root__, Pipeline):
+            return self._derive(
+                self._then("enumerate", None, self.max_operate_time),
+                lambda n: builtins.min(n, self.max_operate_time),
+            )
+
+        iter_values = iter(self._tee())
+
+        def generator() -> Iterator[Tuple[int, T]]:
+            index = 0
+            for _ in range(self.max_operate_time):
+                try:
+                    value = next(iter_values)
+                    yield index, value
+                    index += 1
+                except StopIteration:
+                    break
+
+        return self._derive(
+            self.__class__(generator()),
+            lambda n: builtins.min(n, self.max_operate_time),
+        )
+
+    def extend(self, iterable: Iterable[E]) -> Self:
+        if not isinstance(iterable, Iterable):
+            raise TypeError(f"{type(iterable)} object is not iterable")
+
+        values = self._tee()
+
+        def generator() -> Iterator[Union[T, E]]:
+            yield from values
+            yield from iterable
+
+        return self.__class__(generator())
+
+    def fill(
+        self, num: int, factory: Union[R, Callable[[], R]] = None, *args, **kwargs
+    ) -> Self:
+        if num > self._max:
+            raise ValueError("'num' cannot exceed the maximum number of '_max'")
+        elif num < 0:
+            raise ValueError("'num' must be a positive number.")
+
+        values = self._tee()
+
+        def generator() -> Iterator[Union[T, R]]:
+            yield from values
+            for _ in range(num):
+                yield factory(*args, **kwargs) if callable(factory) else factory
+
+        return self._derive(self.__class__(generator()), lambda n: n + num)
+
+    def fill_to(
+        self, num: int, factory: Union[R, Callable[[], R]] = None, *args, **kwargs
+    ) -> Self:
+        length = self.length
+        if num < length:
+            raise ValueError("'num' cannot be less than its own length.")
+        if num == length:
+            return self
+        else:
+            return self.fill(num - length, factory=factory, *args, **kwargs)
+
+    def filter(
+        self, func: Callable[[T], Any], *, vectorize: Optional[bool] = None
+    ) -> Self:
+        if isinstance(self.__root__, Pipeline):
+            result = self._then("filter", bool if func is None else func)
+        elif isinstance(self.__root__, Chunks):
+            result = self._chunks(filter_chunks(self.__root__.arrays, func, vectorize))
+        else:
+            result = self.__class__(filter(func, self._tee()))
+        return self._derive(result, exact=False)
+
+    def filter_false(
+        self, func: Callable[[T], Any], *, vectorize: Optional[bool] = None
+    ) -> Self:
+        if isinstance(self.__root__, Pipeline):
+            result = self._then("filter_false", bool if func is None else func)
+        elif isinstance(self.__root__, Chunks):
+            result = self._chunks(
+                filter_chunks(self.__root__.arrays, func, vectorize, invert=True)
+            )
+        else:
+            result = self.__class__(filterfalse(func, self._tee()))
+        return self._derive(result, exact=False)
+
+    def find(self, func: Callable[[T], bool], *, full: bool = False) -> Iterator[T]:
+        for t in self._tee():
+            if func(t):
+                yield t
+                if not full:
+                    break
+
+    def find_target(self, target: Any, *, full: bool = False) -> Iterator[int]:
+        for t in self.enumerate():
+            if t[1] == target:
+                yield t[0]
+                if not full:
+                    break
+
+    def flat(
+        self, depth: int = NOT_SET, *, flat_str: bool = False
+    ) -> "ArkoWrapper[Union[T, E]]":
+        def generator(
+            iterator: Iterable[E], times: int = NOT_SET
+        ) -> Iterator[Union[str, E, Iterator]]:
+            for item in iterator:
+                if isinstance(item, str) and times:
+                    if flat_str and len(item) != 0:
+                        yield from item
+                    else:
+                        yield item
+                elif isinstance(item, Iterable) and times:
+                    yield from generator(
+                        item, (times - 1) if isinstance(times, int) else times
+                    )
+                else:
+                    yield item
+
+        return self.__class__(generator(self._tee(), depth))
+
+    def fold(
+        self,
+        zero: R,
+        step: Callable[[R, T], R],
+        combine: Callable[[R, R], R],
+        *,
+        executor: ExecutorType = "process",
+        workers: Optional[int] = None,
+        chunk_size: int = 10000,
+        max_pending: Optional[int] = None,
+    ) -> R:
+        """并行地归约
+
+        元素按 chunk_size 分块，每一块在工作者中以 zero 的副本为初值、用 step 依次折叠，
+        得到的部分结果再在当前进程中按顺序用 combine 两两合并为一棵平衡的树。
+        combine 需要满足结合律，且 combine(zero, x) 与 combine(x, zero) 应等于 x。
+        使用进程池时 zero、step 与元素都需要能被 pickle。
+
+        Args:
+            zero: 初值，每一块使用它的一个副本，zero 本身不会被修改；没有元素时返回它的副本。
+            step: 将一个元素折叠进部分结果的函数。
+            combine: 合并两个部分结果的函数。
+            executor: "thread"、"process" 或一个已有的 Executor（不会被关闭）。
+            workers: 新建的池中工作者的数量，默认为 CPU 的数量；为 1 时直接在当前进程中折叠。
+            chunk_size: 每一块包含的元素数量。
+            max_pending: 同时提交的块的上限，默认为工作者数量的两倍。
+        """
+        if workers == 1 and isinstance(executor, str):
+            # 与并行时相同，以 zero 的副本为初值，不修改调用者的 zero
+            return functools.reduce(step, self._max_gen(), copy.deepcopy(zero))
+        partials = parallel(
+            self._max_gen(),
+            fold_chunk,
+            (zero, step),
+            executor=executor,
+            workers=workers,
+            chunk_size=chunk_size,
+            max_pending=max_pending,
+        )
+        return tree_reduce(partials, combine, copy.deepcopy(zero))
+
+    @classmethod
+    def from_file(
+        cls,
+        path: StrOrPath,
+        mode: str = "lines",
+        *,
+        encoding: str = "utf-8",
+        errors: str = "strict",
+    ) -> Self:
+        """通过 mmap 读取文件，可以被多次迭代，也可以用 split 切分后交给多个工作者
+
+        Args:
+            path: 文件路径。
+            mode: "lines" 产出解码后的 str；"bytes-lines" 产出 mmap 的 memoryview 切片，不复制数据；
+                "struct:<fmt>" 按 struct 格式 fmt 将定长记录解包为元组，例如 "struct:<dqd"。
+                按行读取时以 b"\\n" 分行，并保留行尾。
+            encoding: mode 为 "lines" 时使用的编码。
+            errors: 解码出错时的处理方式。
+        """
+        return cls(FileSource(path, mode, encoding=encoding, errors=errors))
+
+    def heavy_hitters(
+        self, k: int = 10, eps: float = 0.001, delta: float = 0.01
+    ) -> CountMinSketch:
+        """用 Count-Min 概要估计各元素出现的次数，并记录出现次数最多的 k 个元素
+
+        返回的 CountMinSketch 的 top() 给出 (元素, 估计的次数)，也可以与其它部分的结果 merge。
+        估计值不小于真实值，以 1 - delta 的概率不超过真实值加 eps * 总数，元素需要能被 msgspec 编码。
+        """
+        return CountMinSketch(k, eps, delta).update(self._max_gen())
+
+    def group(self, n: int, fill_value: Any = NOT_SET) -> "ArkoWrapper[Self]":
+        if not n:
+            raise ValueError(f"'n' must be a positive integer, not '{n}'")
+
+        iter_value = iter(self._tee())
+
+        def generator() -> Iterator[Self]:
+            stopped = False
+            next_value = NOT_SET
+            while not stopped:
+                item = self.__class__()
+                for _ in range(n):
+                    try:
+                        if next_value is not NOT_SET:
+                            item.append(next_value)
+                        else:
+                            item.append(next(iter_value))
+                    except StopIteration:
+                        stopped = True
+                        if fill_value is not NOT_SET:
+                            item.append(fill_value)
+                    try:
+                        next_value = next(iter_value)
+                    except StopIteration:
+                        stopped = True
+                        next_value = NOT_SET
+                yield item
+
+        return self.__class__(generator())
+
+    # noinspection SpellCheckingInspection
+    @overload
+    def groupby(self, key: Callable[[T], R] = None) -> "ArkoWrapper[Self]":
+        pass
+
+    # noinspection SpellCheckingInspection
+    @overload
+    def groupby(
+        self,
+        start: Callable[[T], bool],
+        stop: Callable[[T], bool],
+        group_type: Callable[[list], Iterable] = list,
+        retain: bool = False,
+        contain_head: bool = False,
+        contain_tail: bool = False,
+    ) -> "ArkoWrapper[Self]":
+        pass
+
+    # noinspection SpellCheckingInspection
+    def groupby(self, *args, **kwargs) -> "ArkoWrapper[Self]":
+        if len(args) + len(kwargs) <= 1:
+            return self.__class__(groupby(self._tee(), *args, **kwargs))
+        else:
+
+            def make_group(
+                start: Callable[[T], bool],
+                stop: Callable[[T], bool],
+                group_type: Callable[[list], Iterable] = list,
+                retain: bool = False,
+                contain_head: bool = False,
+                contain_tail: bool = False,
+            ) -> Self:
+                def generator() -> Iterator[Iterable[T]]:
+                    elem = []
+                    other = []
+                    flag = False
+                    for item in self._tee():
+                        if start(item) and not flag:
+                            elem.append(item) if contain_head else ...
+                            flag = True
+                        elif stop(item) and flag:
+                            elem.append(item) if contain_tail else ...
+                            yield group_type(elem)
+                            elem.clear()
+                            flag = False
+                        elif flag:
+                            elem.append(item)
+                        elif retain:
+                            other.append(item)
+                    if elem:
+                        yield group_type(elem)
+                    if other:
+                        yield group_type(other)
+
+                return self.__class__(generator())
+
+            return make_group(*args, **kwargs)
+
+    @overload
+    def join(self, sep: E = ", ") -> "ArkoWrapper[Union[T, E]]":
+        pass
+
+    @overload
+    def join(
+        self,
+        other: Iterable[E],
+        left_key: Callable[[T], Any],
+        right_key: Optional[Callable[[E], Any]] = None,
+        how: JoinType = "inner",
+        *,
+        sorted: bool = False,
+    ) -> "ArkoWrapper[Union[Tuple[Optional[T], Optional[E]], T]]":
+        pass
+
+    def join(self, *args, **kwargs) -> "ArkoWrapper":
+        """只给出 sep 时在每个元素之间加上 sep；给出 other 与 left_key 时按 key 与 other 连接
+
+        Args:
+            other: 右侧的可迭代对象。
+            left_key: 左侧（自身）元素的 key。
+            right_key: 右侧元素的 key，默认与 left_key 相同。
+            how: "inner"、"left"、"outer" 产出 (左, 右)，缺少匹配的一侧为 None；
+                "semi"、"anti" 产出有、没有匹配的左侧元素。
+            sorted: 两侧是否都已按 key 从小到大排好序。为 True 时使用归并连接，结果按 key 的顺序产出，
+                只需暂存同一个 key 的右侧元素；否则使用哈希连接，在已知长度较小的一侧上建立哈希表，
+                结果通常按左侧的顺序产出，在左侧上建立哈希表时则按右侧的顺序产出，没有匹配的左侧元素在最后。
+
+        Raises:
+            TypeError: 给出了 other（字符串与 bytes 以外的可迭代对象）却没有给出 left_key。
+        """
+        if len(args) + len(kwargs) <= 1:
+            other = args[0] if args else kwargs.get("other", kwargs.get("sep"))
+            if "other" in kwargs or (
+                isinstance(other, Iterable) and not isinstance(other, (str, bytes))
+            ):
+                raise TypeError(
+                    "join() with another iterable requires left_key; "
+                    "use a string or a non-iterable value as separator"
+                )
+            return self._join_sep(*args, **kwargs)
+
+        def join_by_key(
+            other: Iterable[E],
+            left_key: Callable[[T], Any],
+            right_key: Optional[Callable[[E], Any]] = None,
+            how: JoinType = "inner",
+            *,
+            sorted: bool = False,
+        ) -> "ArkoWrapper":
+            right_key = left_key if right_key is None else right_key
+            if sorted:
+                return self.__class__(
+                    merge_join(self._tee(), other, left_key, right_key, how)
+                )
+            left_hint = self._length_hint()
+            if isinstance(other, ArkoWrapper):
+                right_hint = other._length_hint()
+            elif isinstance(other, Sized):
+                right_hint = LengthHint(len(other))
+            else:
+                right_hint = estimate(other)
+            build_left = (
+                left_hint is not None
+                and right_hint is not None
+                and left_hint.length < right_hint.length
+            )
+            return self.__class__(
+                hash_join(self._tee(), other, left_key, right_key, how, build_left)
+            )
+
+        return join_by_key(*args, **kwargs)
+
+    def _join_sep(self, sep: E = ", ") -> "ArkoWrapper[Union[T, E]]":
+        """在每个元素之间加上 sep"""
+        iter_values = iter(self._tee())
+
+        def generator() -> Iterator[Union[T, E]]:
+            default = object()
+            value = default
+            next_value = default
+            for _ in range(self.max_operate_time):
+                try:
+                    if value is default:
+                        value = next(iter_values)
+                        next_value = next(iter_values)
+                    yield value
+                    yield sep
+                    value = next_value
+                    next_value = next(iter_values)
+                except StopIteration:
+                    if value is not default:
+                        yield value
+                    break
+
+        return self.__class__(generator())
+
+    def lazy(self) -> Self:
+        """进入惰性流水线模式
+
+        之后连续调用的 map、filter、filter_false、take_while、drop_while、slice 与
+        enumerate 只会被记录下来，直到被消费时才融合成一个循环执行。
+        流水线中的每一步都可以被多次迭代，但每次迭代都会重新执行其上游的操作；
+        数据源是只能迭代一次的迭代器时，读取过的元素会被保留以便重复迭代（由 buffer 创建的流除外）。
+        """
+        if isinstance(self.__root__, Pipeline):
+            result = self.__class__(self.__root__)
+        elif isinstance(self.__root__, SEQUENCE_TYPES):
+            result = self.__class__(Pipeline(self.__root__))
+        else:
+            result = self.__class__(Pipeline(self.tee()))
+        return self._derive(result)
+
+    def numeric(
+        self, dtype: Any = None, *, chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> Self:
+        """进入基于 NumPy 的数值模式，需要安装 numpy
+
+        元素会被按块读入一维 ndarray，之后的 map、filter、filter_false、accumulate、sort、unique
+        以及 sum、min、max、mean 都会以数组运算的方式执行。
+        map 与 filter 的函数默认逐个元素调用，只有 NumPy 的 ufunc 会直接作用在整个数组上；
+        对能接受数组的其它函数，可以传入 vectorize=True 以整个数组调用。
+        注意数组运算遵循 NumPy 的类型规则，例如定长整数可能会溢出。
+
+        Args:
+            dtype: 数组的类型，默认由 NumPy 推断。
+            chunk_size: 每个块所包含的元素数量。
+        """
+        if numpy is None:
+            raise ImportError("Numeric mode requires 'numpy' to be installed")
+        if chunk_size <= 0:
+            raise ValueError(f"'chunk_size' must be a positive number: {chunk_size}")
+        root = self.__root__
+        if isinstance(root, Chunks) and dtype is None and chunk_size == root.chunk_size:
+            return self._derive(self.__class__(root))
+        arrays = Replayable(to_arrays(self._tee(), dtype, chunk_size))
+        return self._derive(self.__class__(Chunks(arrays, chunk_size)))
+
+    def map(
+        self,
+        func: Union[Callable[[T], R], Type[E]],
+        start: Optional[int] = 0,
+        *,
+        vectorize: Optional[bool] = None,
+    ) -> "ArkoWrapper[R]":
+        if isinstance(self.__root__, Pipeline):
+            target = self._then("slice", None, start, None) if start else self
+            result = target._then("map", func)
+        elif isinstance(self.__root__, Chunks) and not start:
+            result = self._chunks(map_chunks(self.__root__.arrays, func, vectorize))
+        else:
+
+            iter_values = iter(self._tee())
+
+            def generator() -> Iterator[T]:
+                for _ in range(start):
+                    next(iter_values)
+                yield from iter_values
+
+            result = self.__class__(map(func, generator()))
+        return self._derive(result, lambda n: n - start)
+
+    def materialize(self) -> Self:
+        """立即读取全部元素并缓存，见 cache"""
+        result = self.cache()
+        if isinstance(result.__root__, CachedSource):
+            result.__root__.fill()
+        return result
+
+    def max(
+        self, *, key: Optional[Callable[[T], Any]] = None, default: Any = NOT_SET
+    ) -> T:
+        """返回最大的元素，为空时返回 default，未指定 default 则抛出 ValueError"""
+        if isinstance(self.__root__, Chunks) and key is None:
+            values = [a.max() for a in self.__root__.arrays if len(a)]
+            if values:
+                return scalar(builtins.max(map(scalar, values)))
+        else:
+            values = self._tee()
+        kwargs = {} if default is NOT_SET else {"default": default}
+        return builtins.max(values, key=key, **kwargs)
+
+    def mean(self) -> float:
+        """返回所有元素的算术平均值，为空时抛出 ValueError"""
+        if isinstance(self.__root__, Chunks):
+            total, count = 0, 0
+            for array in self.__root__.arrays:
+                total += scalar(array.sum())
+                count += len(array)
+            if count:
+                return total / count
+            raise ValueError("mean requires at least one data point")
+        try:
+            return statistics.fmean(self._tee())
+        except statistics.StatisticsError as e:
+            raise ValueError(str(e))
+
+    def min(
+        self, *, key: Optional[Callable[[T], Any]] = None, default: Any = NOT_SET
+    ) -> T:
+        """返回最小的元素，为空时返回 default，未指定 default 则抛出 ValueError"""
+        if isinstance(self.__root__, Chunks) and key is None:
+            values = [a.min() for a in self.__root__.arrays if len(a)]
+            if values:
+                return scalar(builtins.min(map(scalar, values)))
+        else:
+            values = self._tee()
+        kwargs = {} if default is NOT_SET else {"default": default}
+        return builtins.min(values, key=key, **kwargs)
+
+    def mutate(
+        self, func: Callable[[Iterable[T], Any], Iterable[R]] = list, *args, **kwargs
+    ) -> "ArkoWrapper[R]":
+        """改变 __root__ 的类型。"""
+        self.__root__ = func(self.__root__, *args, **kwargs)
+        self._hint = None
+        return self
+
+    def nlargest(self, k: int, key: Optional[Callable[[T], Any]] = None) -> List[T]:
+        """返回最大的 k 个元素，从大到小排列，只需 O(k) 的额外内存"""
+        if isinstance(self.__root__, Chunks) and key is None:
+            return top_chunks(self.__root__.arrays, k, largest=True) if k > 0 else []
+        return heapq.nlargest(k, self._tee(), key=key)
+
+    def nsmallest(self, k: int, key: Optional[Callable[[T], Any]] = None) -> List[T]:
+        """返回最小的 k 个元素，从小到大排列，只需 O(k) 的额外内存"""
+        if isinstance(self.__root__, Chunks) and key is None:
+            return top_chunks(self.__root__.arrays, k, largest=False) if k > 0 else []
+        return heapq.nsmallest(k, self._tee(), key=key)
+
+    def par_filter(
+        self,
+        func: Callable[[T], Any],
+        *,
+        executor: ExecutorType = "thread",
+        workers: Optional[int] = None,
+        chunk_size: int = 1,
+        ordered: bool = True,
+        max_pending: Optional[int] = None,
+        invert: bool = False,
+    ) -> Self:
+        """在线程池或进程池中并行地执行 filter
+
+        参数与 par_map 相同；invert 为 True 时保留 func 返回假值的元素。
+        """
+        result = self.__class__(
+            parallel(
+                self._max_gen(),
+                filter_false_chunk if invert else filter_chunk,
+                func,
+                executor=executor,
+                workers=workers,
+                chunk_size=chunk_size,
+                ordered=ordered,
+                max_pending=max_pending,
+            )
+        )
+        return self._derive(result, exact=False)
+
+    def par_map(
+        self,
+        func: Callable[[T], R],
+        *,
+        executor: ExecutorType = "thread",
+        workers: Optional[int] = None,
+        chunk_size: int = 1,
+        ordered: bool = True,
+        max_pending: Optional[int] = None,
+    ) -> "ArkoWrapper[R]":
+        """在线程池或进程池中并行地执行 map
+
+        最多只会读取 max_operate_time 个元素，且同时最多只有 max_pending 个块在执行，
+        因此上游只会被按需读取。使用进程池时 func 需要能被 pickle。
+
+        Args:
+            func: 作用于每个元素的函数。
+            executor: "thread"、"process" 或一个已有的 Executor（不会被关闭）。
+            workers: 新建的池中工作者的数量，默认为 CPU 的数量。
+            chunk_size: 每次提交给工作者的元素数量。
+            ordered: 是否保持输入的顺序；为 False 时先完成的块先产出。
+            max_pending: 同时提交的块的上限，默认为工作者数量的两倍。
+        """
+        result = self.__class__(
+            parallel(
+                self._max_gen(),
+                map_chunk,
+                func,
+                executor=executor,
+                workers=workers,
+                chunk_size=chunk_size,
+                ordered=ordered,
+                max_pending=max_pending,
+            )
+        )
+        return self._derive(result, lambda n: builtins.min(n, self._max))
+
+    def persist(
+        self,
+        cache_dir: StrOrPath,
+        key: Any,
+        *,
+        sources: Iterable[StrOrPath] = (),
+        content_hash: bool = False,
+        max_bytes: Optional[int] = None,
+        chunk_size: int = 1024,
+        type: Any = Any,
+    ) -> Self:
+        """将输出缓存在磁盘上，下次以相同的数据源与 key 调用时直接读取缓存，不再执行上游
+
+        缓存按块以 MessagePack 编码，元素需要能被 msgspec 编码；未给出 type 时元组会被还原为列表。
+        只有输出被完整读取后缓存才会生效。
+
+        Args:
+            cache_dir: 缓存目录。
+            key: 标识上游操作的值，例如一个字符串或一个 PipelineSpec，操作改变时需要随之改变。
+            sources: 数据源文件的路径，它们的指纹也是缓存条目名称的一部分。由 from_file 创建、
+                之后只经过会传递长度提示的操作（如 map、filter、slice、sort）时会自动包含该文件；
+                经过 chain、zip 等其它操作后，需要在这里给出。
+            content_hash: 为 True 时按文件内容的 SHA-256 计算数据源的指纹，否则按路径、修改时间与大小。
+            max_bytes: 缓存目录中所有条目的总字节数上限，超出时删除最久未被使用的条目。
+            chunk_size: 每一块包含的元素数量。
+            type: 每个元素的类型，用于解码时的校验与还原，例如 Tuple[int, str] 或一个 msgspec.Struct。
+        """
+        prints = [source_fingerprint(path, content_hash) for path in sources]
+        source = self._source
+        if source is not None:
+            prints.append(
+                source_fingerprint(source.path, content_hash)
+                + [source.mode, source.start, source.end]
+            )
+        name = fingerprint(key, prints)
+        cache = DiskCache(cache_dir, max_bytes)
+        values = self._max_gen()
+
+        def generator() -> Iterator[T]:
+            stored = cache.read(name, type)
+            if stored is not None:
+                yield from stored
+            else:
+                yield from cache.write(name, values, chunk_size)
+
+        return self._derive(self.__class__(generator()))
+
+    def prefetch(self, n: int = 1, workers: int = 1) -> Self:
+        """在后台线程中预先读取上游，使上游的 I/O 与下游的计算重叠
+
+        上游的元素保存在共享缓冲区中时（例如上游是生成器），缓冲区会改为加锁读取，
+        使当前线程可以在后台线程读取的同时迭代自身或它的其它分支。
+        上游抛出的异常会在读到对应的位置时重新抛出。提前停止读取（例如 prefetch(4).slice(3)）时，
+        后台线程不会立即停止，而是在读取它的下游被释放、预取的生成器随之被关闭之后，
+        读完正在读取的一个上游元素再退出；在 CPython 中这通常发生在下游的 ArkoWrapper 不再被引用时。
+
+        Args:
+            n: 最多预先读取的元素数量。
+            workers: 由 from_file 创建时，文件被切分为 workers 段与行边界对齐的部分，各由一个线程同时读取；
+                其它上游只能由一个线程依次读取，此时该参数不起作用。
+        """
+        if n <= 0:
+            raise ValueError(f"'n' must be a positive number: {n}")
+        if workers <= 0:
+            raise ValueError(f"'workers' must be a positive number: {workers}")
+        root = self.__root__
+        if workers > 1 and isinstance(root, FileSource):
+            items = islice(prefetch_parts(root.split(workers), n), self._max)
+        else:
+            # 在当前线程中取得上游的迭代器，后台线程只负责读取
+            values = self._tee()
+            if isinstance(values, TeeCursor):
+                # 后台线程与当前线程可能同时读取这个缓冲区
+                values.buffer.share()
+            items = prefetch(islice(values, self._max), n)
+        return self._derive(self.__class__(items))
+
+    def print(
+        self,
+        length: Optional[int] = None,
+        *,
+        end: Optional[str] = ", ",
+        print_func: Optional[Callable[..., Any]] = builtins.print,
+    ) -> Self:
+        time = 0
+        iter_values = iter(self._tee())
+        try:
+            if length is not None:
+                while length > 0:
+                    print_func(next(iter_values), end=end)
+                    length = length - 1
+                    time += 1
+            else:
+                while time < self._max:
+                    print_func(next(iter_values), end=end)
+                    time += 1
+        except StopIteration:
+            pass
+        if time != 0:
+            print_func(len(end) * "\b")
+        return self
+
+    @classmethod
+    def profile(cls, *, memory: bool = False) -> Profiler:
+        """分阶段的性能分析，作为上下文管理器使用
+
+        在其中创建的每个阶段（map、filter 等）产出的元素都会经过一个探针，记录该阶段读入与产出的元素数量，
+        以及花在该阶段自身（不含上游）的墙上时间与 CPU 时间；可以多次迭代的数据源在每次被读取时记为一个
+        "source:<类型>" 阶段。分析结果可以直接交给 rich 的 Console 打印，也可以用 report、to_json 导出::
+
+            with ArkoWrapper.profile() as profiler:
+                ArkoWrapper(data).map(parse).filter(valid).collect()
+            console.print(profiler)
+
+        Args:
+            memory: 是否通过 tracemalloc 记录每个阶段内存分配的峰值，开启后会明显变慢。
+        """
+        return Profiler(memory)
+
+    @classmethod
+    def read_jsonl(cls, path: StrOrPath, type: Any = Any) -> Self:
+        """通过 msgspec 逐行解码 JSON Lines 文件
+
+        Args:
+            path: 文件路径。
+            type: 每一行的类型，例如一个 msgspec.Struct 或 Dict[str, int]，解码时会按其校验并还原。
+        """
+        return cls(read_jsonl(path, type))
+
+    @classmethod
+    def read_msgpack(cls, path: StrOrPath, type: Any = Any) -> Self:
+        """通过 msgspec 读取由 write_msgpack 写入的文件，type 为每个元素的类型"""
+        return cls(read_msgpack(path, type))
+
+    def remove(
+        self, target: Union[Iterable[T], T], *, remove_all: bool = False
+    ) -> Self:
+        """
+        从容器中删除指定内容
+
+        Args:
+            target (Iterable[T] | T): 需要删除的内容
+            remove_all (bool): 是否删除全部
+
+        Returns:
+            ArkoWrapper
+        """
+
+        iter_values = iter(self._tee())
+
+        def generator() -> Iterator[T]:
+            is_sequence = isinstance(target, Sequence) and not (
+                    isinstance(target, str) and len(target) > 1
+            )
+            removed_seq = []
+            try:
+                for _ in range(self.max_operate_time):
+                    value = next(iter_values)
+                    eq = (is_sequence and value in target) or value == target
+
+                    if remove_all and eq:
+                        continue
+
+                    if value not in removed_seq and eq:
+                        removed_seq.append(value)
+                    else:
+                        yield value
+
+            except StopIteration:
+                pass
+
+        return self._derive(self.__class__(generator()), exact=False)
+
+    def repeat(self, times: Optional[Union[int, float, str]] = None) -> Self:
+        if times is None:
+            return self.__class__(
+                chain.from_iterable(itertools.repeat(tuple(self._tee()), self._max + 1))
+            )
+        if any([isinstance(times, str) and times.isnumeric(), isinstance(times, int)]):
+            time = int(times)
+            if time <= 0:
+                raise ValueError(f"'times' cannot be negative: {times}")
+            return self.__class__(
+                chain.from_iterable(itertools.repeat(tuple(self._tee()), time + 1))
+            )
+        else:
+            raise TypeError(f"Unsupported Type: {type(times)}.")
+
+    def reverse(self) -> Self:
+        return self.__reversed__()
+
+    @overload
+    def slice(self, stop: int) -> Self:  # pragma: no cover
+        ...
+
+    @overload
+    def slice(
+        self, start: int, stop: int, step: Optional[int] = 1
+    ) -> Self:  # pragma: no cover
+        ...
+
+    def slice(self, *args, **kwargs) -> Self:
+        args = (*args, *kwargs.values())
+        if isinstance(self.__root__, Pipeline):
+            result = self._then("slice", None, *args)
+        elif isinstance(self.__root__, SEQUENCE_TYPES):
+            islice((), *args)  # 与 islice 保持一致的参数校验
+            return self.__class__(view(self.__root__, slice(*args)))
+        else:
+            result = self.__class__(islice(self._tee(), *args))
+        s = slice(*args)
+        return self._derive(result, lambda n: slice_length(n, s.start, s.stop, s.step))
+
+    def sample(self, k: int, *, seed: Optional[int] = None) -> Self:
+        """蓄水池抽样：读完上游后，产出等概率地不放回抽取的 k 个元素，元素不足 k 个时产出全部
+
+        使用 Algorithm L，直接计算下一个被选中的位置并跳过中间的元素，只使用 O(k) 的内存。
+        样本的顺序不是元素在上游中的顺序。
+
+        Args:
+            k: 样本的大小。
+            seed: 随机数种子，给出时结果可以复现。
+        """
+
+        values = self._max_gen()
+
+        def generator() -> Iterator[T]:
+            yield from reservoir(values, k, random.Random(seed))
+
+        return self._derive(self.__class__(generator()), lambda n: builtins.min(n, k))
+
+    def search(
+        self, sub: Iterable[E], *, func: Callable[[T, E], bool] = operator.eq
+    ) -> Iterator[int]:
+        """查找子序列 sub，依次返回每一个（可重叠的）匹配的起始下标
+
+        只会遍历一次自身，额外的内存只与 sub 的长度有关。func 为 operator.eq 时使用 KMP；
+        否则 func 只会以 (自身的元素, sub 中的元素) 调用，并对每个窗口逐一比较。
+        """
+        pattern = sub if isinstance(sub, SEQUENCE_TYPES) else tuple(sub)
+        if func is operator.eq:
+            return kmp_search(self._tee(), pattern)
+        return window_search(self._tee(), pattern, func)
+
+    def search_many(
+        self, patterns: Union[Iterable[Iterable[E]], AhoCorasick]
+    ) -> Iterator[Tuple[int, int]]:
+        """同时查找多个子序列，依次返回每一个匹配的 (起始下标, 模式序号)
+
+        使用 Aho–Corasick 自动机，只会遍历一次自身，模式中的元素需要是可哈希的。
+        匹配按其结束位置排序，结束位置相同时较长的模式在前。
+        """
+        automaton = (
+            patterns if isinstance(patterns, AhoCorasick) else AhoCorasick(patterns)
+        )
+        return automaton.search(self._tee())
+
+    def sliding(
+        self,
+        seconds: float,
+        key: Callable[[T], float],
+        *,
+        value: Optional[Callable[[T], Any]] = None,
+        aggregate: WindowAggregate = None,
+    ) -> "ArkoWrapper[Tuple[float, Any]]":
+        """滑动的时间窗口，每个元素产出一次 (时间戳, 窗口)
+
+        Args:
+            seconds: 窗口的长度，时间戳为 t 的元素对应的窗口包含时间戳在 (t - seconds, t] 内的元素。
+            key: 返回元素时间戳（秒）的函数，时间戳需要单调不减。
+            value: 计算聚合时作用于每个元素的函数，默认为元素本身。
+            aggregate: 为 None 时窗口为其中元素组成的元组；为 "count"、"sum"、"mean"、"min"、"max"
+                之一时窗口为该聚合值，为它们组成的序列时窗口为 {名称: 聚合值}。聚合值随元素进出窗口增量地更新。
+        """
+        return self._derive(
+            self.__class__(sliding(self._tee(), seconds, key, value, aggregate))
+        )
+
+    def sort(
+        self,
+        key: Optional[Callable] = None,
+        reverse: bool = False,
+        *,
+        memory_limit: Optional[int] = None,
+    ) -> Self:
+        """稳定地排序
+
+        Args:
+            key: 排序所依据的函数。
+            reverse: 是否从大到小排序。
+            memory_limit: 若给出，则内存中最多同时排序约 memory_limit 个元素，
+                超出的部分分段排序后写入临时文件再多路归并，元素需要能被 pickle。
+        """
+        if memory_limit is not None:
+            return self._derive(
+                self.__class__(external_sort(self._tee(), key, reverse, memory_limit))
+            )
+        if isinstance(self.__root__, Chunks) and key is None:
+            return self._derive(
+                self._chunks(
+                    sort_chunks(self.__root__.arrays, reverse, self.__root__.chunk_size)
+                )
+            )
+        return self.__class__(sorted(self._tee(), key=key, reverse=reverse))
+
+    @classmethod
+    def spec(cls) -> PipelineSpec:
+        """创建一个可以被 pickle 的流水线，用与 ArkoWrapper 相同的链式写法记录操作
+
+        流水线可以交给 run 在多个工作进程中分别处理切分后的数据源，再合并各部分的结果::
+
+            spec = ArkoWrapper.spec().map(parse).filter(valid)
+            result = spec.run(FileSource("data.log"), workers=8)
+
+        其中用到的函数需要定义在模块的顶层。
+        """
+        return PipelineSpec(cls)
+
+    def split(self, n: int) -> List[Self]:
+        """将由 from_file 创建的 ArkoWrapper 切分为至多 n 个，各自读取文件中与行（或记录）边界对齐的一段
+
+        每一行（或记录）恰好属于其中一个；切分得到的 ArkoWrapper 可以被 pickle 后交给其它进程。
+        """
+        if not isinstance(self.__root__, FileSource):
+            raise TypeError("split() requires a file source created by from_file()")
+        return [self.__class__(part) for part in self.__root__.split(n)]
+
+    def starmap(self, func: Callable[[T, T], R]) -> Self:
+        return self.__class__(starmap(func, self._tee()))
+
+    def stratified(
+        self,
+        key: Callable[[T], Any],
+        k_per_stratum: int,
+        *,
+        seed: Optional[int] = None,
+    ) -> "ArkoWrapper[Tuple[Any, List[T]]]":
+        """分层抽样：按 key 分层，读完上游后按各层首次出现的顺序产出 (key, 该层的样本)
+
+        每一层各自进行蓄水池抽样，样本至多 k_per_stratum 个，内存只与层数和 k_per_stratum 有关。
+
+        Args:
+            key: 计算每个元素所属的层的函数。
+            k_per_stratum: 每一层的样本大小。
+            seed: 随机数种子，给出时结果可以复现。
+        """
+
+        values = self._max_gen()
+
+        def generator() -> Iterator[Tuple[Any, List[T]]]:
+            yield from stratified(values, key, k_per_stratum, random.Random(seed))
+
+        return self.__class__(generator())
+
+    def sum(self, start: Any = 0) -> Any:
+        """返回 start 加上所有元素的和"""
+        if isinstance(self.__root__, Chunks):
+            total = start
+            for array in self.__root__.arrays:
+                if len(array):
+                    total = total + scalar(array.sum())
+            return total
+        return builtins.sum(self._tee(), start)
+
+    def take_while(self, func: Union[Any, Callable[[T], bool]] = True) -> Self:
+        if callable(func):
+            if isinstance(self.__root__, Pipeline):
+                result = self._then("take_while", func)
+            else:
+                result = self.__class__(takewhile(func, self._tee()))
+            return self._derive(result, exact=False)
+        elif bool(func):
+            return self.__deepcopy__()
+        else:
+            return self.__class__()
+
+    def tee(self, n: Optional[int] = None) -> Union[Self, Iterable[Self]]:
+        if n is None:
+            return self._derive(self.__class__(self._tee()))
+        if isinstance(self.__root__, SEQUENCE_TYPES):
+            return (self.__class__(self.__root__) for _ in range(n))
+        # 一次性建好所有分支，使它们都从当前位置开始读取
+        return tuple(self._derive(self.__class__(self._tee())) for _ in range(n))
+
+    def to_batches(
+        self, schema: Schema, size: int = 4096
+    ) -> "ArkoWrapper[RecordBatch]":
+        """将数值记录每 size 条打包为一个列式的 RecordBatch
+
+        每一列存储为 array.array，内存占用只有各列的原始字节数；之后可以直接在批次上按列 map、
+        按掩码 filter 或 sum，也可以零拷贝地切片与传给其它进程。
+
+        Args:
+            schema: {列名: array 的类型码} 或 [(列名, 类型码), ...]，如 {"ts": "d", "value": "d", "id": "q"}。
+                记录可以是按 schema 顺序排列的序列，也可以是以列名为键的映射。
+            size: 每个批次包含的记录数量。
+        """
+        return self._derive(
+            self.__class__(batches(self._tee(), schema, size)),
+            lambda length: chunk_count(length, size),
+        )
+
+    def tumbling(
+        self,
+        seconds: float,
+        key: Callable[[T], float],
+        *,
+        value: Optional[Callable[[T], Any]] = None,
+        aggregate: WindowAggregate = None,
+    ) -> "ArkoWrapper[Tuple[float, Any]]":
+        """互不重叠的时间窗口，产出 (窗口的起始时间, 窗口)
+
+        Args:
+            seconds: 窗口的长度，窗口的起始时间为 seconds 的整数倍，没有元素的窗口会被跳过。
+            key: 返回元素时间戳（秒）的函数，时间戳需要单调不减。
+            value: 计算聚合时作用于每个元素的函数，默认为元素本身。
+            aggregate: 为 None 时窗口为其中元素组成的元组；为 "count"、"sum"、"mean"、"min"、"max"
+                之一时窗口为该聚合值，为它们组成的序列时窗口为 {名称: 聚合值}。聚合值随元素进出窗口增量地更新。
+        """
+        return self.__class__(tumbling(self._tee(), seconds, key, value, aggregate))
+
+    def unique(
+        self,
+        key: Optional[Callable[[T], Any]] = None,
+        *,
+        capacity: Optional[int] = None,
+        error_rate: float = 0.01,
+    ) -> Self:
+        """按首次出现的顺序去除重复的元素
+
+        Args:
+            key: 用于判断是否重复的函数，默认为元素本身。
+            capacity: 若给出，则改用容量为 capacity 的布隆过滤器记录已出现的元素，内存占用固定，
+                但会以 error_rate 的概率误把未出现过的元素当作重复而丢弃。
+            error_rate: 布隆过滤器的误判率。
+        """
+        if isinstance(self.__root__, Chunks) and key is None and capacity is None:
+            return self._derive(
+                self._chunks(
+                    unique_chunks(self.__root__.arrays, self.__root__.chunk_size)
+                ),
+                exact=False,
+            )
+        elif capacity is not None:
+            bloom = BloomFilter(capacity, error_rate)
+            values = self._tee()
+
+            def generator() -> Iterator[T]:
+                for item in values:
+                    if not bloom.add(item if key is None else key(item)):
+                        yield item
+
+        else:
+            values = self._tee()
+
+            def generator() -> Iterator[T]:
+                seen = set()
+                unhashable = []
+                for item in values:
+                    k = item if key is None else key(item)
+                    try:
+                        if k in seen:
+                            continue
+                        seen.add(k)
+                    except TypeError:
+                        if k in unhashable:
+                            continue
+                        unhashable.append(k)
+                    yield item
+
+        return self._derive(self.__class__(generator()), exact=False)
+
+    def unwrap(
+        self, func: Optional[Callable[[Iterable[T]], E]] = None
+    ) -> Union[Iterable[T], E]:
+        if func is None:
+            if isinstance(self.__root__, Pipeline):
+                return self._tee()
+            root = self.__root__
+            if isinstance(root, SequenceView):
+                root = root.base
+            hint = self._length_hint()
+            if isinstance(root, (list, tuple)) and hint is not None and hint.exact:
+                return root.__class__(Hinted(iter(self._tee()), hint.length))
+            # noinspection PyBroadException
+            try:
+                # noinspection PyArgumentList
+                return root.__class__(self._tee())
+            except Exception:
+                return self._tee()
+        else:
+            return func(self._tee())
+
+    def windowed(
+        self,
+        n: int,
+        step: int = 1,
+        *,
+        value: Optional[Callable[[T], Any]] = None,
+        aggregate: WindowAggregate = None,
+    ) -> "ArkoWrapper[Any]":
+        """每 step 个元素产出一个包含 n 个元素的窗口，只产出完整的窗口
+
+        Args:
+            n: 窗口的大小。
+            step: 相邻两个窗口的起始位置之差。
+            value: 计算聚合时作用于每个元素的函数，默认为元素本身。
+            aggregate: 为 None 时窗口为其中元素组成的元组；为 "count"、"sum"、"mean"、"min"、"max"
+                之一时窗口为该聚合值，为它们组成的序列时窗口为 {名称: 聚合值}。聚合值随元素进出窗口增量地更新。
+        """
+        return self._derive(
+            self.__class__(windowed(self._tee(), n, step, value, aggregate)),
+            lambda length: (length - n) // step + 1 if length >= n else 0,
+        )
+
+    def write_jsonl(self, path: StrOrPath) -> int:
+        """通过 msgspec 将每个元素编码为一行 JSON 写入文件，返回写入的行数"""
+        return write_jsonl(path, self._max_gen())
+
+    def write_msgpack(self, path: StrOrPath, chunk_size: int = 1024) -> int:
+        """通过 msgspec 每 chunk_size 个元素编码为一块 MessagePack 写入文件，返回写入的元素数量
+
+        文件由若干带有 4 字节（小端）长度头部的 MessagePack 数组组成，可以用 read_msgpack 读取。
+        """
+        return write_msgpack(path, self._max_gen(), chunk_size)
+
+    if sys.version_info >= (3, 10):
+
+        def zip(self, *iterables: Iterable[E], strict: Optional[bool] = False) -> Self:
+            return self.__class__(zip(self._tee(), *iterables, strict=strict))
+
+    else:
+
+        def zip(self, *iterables: Iterable[E]) -> Self:
+            return self.__class__(zip(self._tee(), *iterables))
+
+    def zip_longest(
+        self, *iterables: Iterable[E], fill_value: Optional[R] = None
+    ) -> Self:
+        return self.__class__(
+            zip_longest(self.tee(), *ArkoWrapper(iterables).tee(), fillvalue=fill_value)
+        )
+
+    def product(self, *iterables: Iterable[E], repeat: int = 1) -> Self:
+        return self.__class__(itertools.product(self._tee(), *iterables, repeat=repeat))
+
+    def permutations(self, r: Optional[int] = None) -> Self:
+        # 长度r元组，所有可能的排列，无重复元素
+        return self.__class__(itertools.permutations(self._tee(), r=r))
+
+    if sys.version_info >= (3, 10):
+
+        def pairwise(self) -> Self:
+            return self._derive(
+                self.__class__(itertools.pairwise(self._tee())), lambda n: n - 1
+            )
+
+    if sys.version_info >= (3, 12):
+
+        def batched(self, n: int = 2) -> Self:
+            return self._derive(
+                self.__class__(itertools.batched(self._tee(), n)),
+                lambda length: chunk_count(length, n),
+            )
+
+    if more_itertools is not None:
+        def chunked(self, n: Optional[int] = None, strict: bool = False) -> Self:
+            # noinspection PyUnresolvedReferences
+            return self._derive(
+                self.__class__(more_itertools.chunked(self._tee(), n, strict)),
+                lambda length: chunk_count(length, n),
+            )
+
+        def chunked_even(self, n: int) -> Self:
+            # noinspection PyUnresolvedReferences
+            return self.__class__(more_itertools.chunked_even(self._tee(), n))
+
+        # noinspection SpellCheckingInspection
+        def ichunked(self, n: Optional[int] = None) -> Self:
+            # noinspection PyUnresolvedReferences
+            return self.__class__(more_itertools.ichunked(self._tee(), n)).map(
+                self.__class__
+            )
+
+        def distribute(self, n: int) -> Self:
+            # noinspection PyUnresolvedReferences
+            return self.__class__(more_itertools.distribute(n, self._tee())).map(
+                self.__class__
+            )
+
+        def divide(self, n: int) -> Self:
+            # noinspection PyUnresolvedReferences
+            return self.__class__(more_itertools.divide(n, self._tee()))
+
+        def flatten(self) -> Self:
+            # noinspection PyUnresolvedReferences
+            return self.__class__(more_itertools.flatten(self._tee()))
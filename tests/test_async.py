@@ -0,0 +1,34 @@
+import asyncio
+
+from arko.wrapper import AsyncArkoWrapper
+
+
+async def numbers(n: int = 5):
+    for i in range(n):
+        await asyncio.sleep(0)
+        yield i
+
+
+def test_iterate_twice():
+    async def main():
+        wrapper = AsyncArkoWrapper(numbers())
+        return await wrapper.collect(), await wrapper.map(str).collect()
+
+    assert asyncio.run(main()) == ([0, 1, 2, 3, 4], ["0", "1", "2", "3", "4"])
+
+
+def test_bounded_buffer_streams_more_than_bound():
+    async def main():
+        return await AsyncArkoWrapper(numbers(500)).buffer(10).collect()
+
+    assert asyncio.run(main()) == list(range(500))
+
+
+def test_batch_keeps_every_item():
+    async def main():
+        wrapper = AsyncArkoWrapper(numbers(2000))
+        return await wrapper.batch(7, timeout=0).collect()
+
+    batches = asyncio.run(main())
+    assert all(0 < len(batch) <= 7 for batch in batches)
+    assert [item for batch in batches for item in batch] == list(range(2000))
@@ -0,0 +1,33 @@
+import pickle
+
+import pytest
+
+from arko.wrapper import ArkoWrapper, RecordBatch
+
+
+@pytest.mark.parametrize("typecode", ["u", "w"])
+def test_unicode_typecodes_are_rejected(typecode):
+    with pytest.raises(ValueError):
+        RecordBatch.from_records({"a": typecode}, [])
+
+
+def test_record_length_must_match_schema():
+    with pytest.raises(ValueError):
+        RecordBatch.from_records({"a": "i"}, [(1, 2, 3), (4, 5, 6)])
+    with pytest.raises(ValueError):
+        RecordBatch.from_records({"a": "i", "b": "d"}, [(1, 2.0), (3,)])
+
+
+def test_pickle_round_trip():
+    batch = RecordBatch.from_records({"id": "q", "value": "d"}, [(1, 0.5), (2, 1.5)])
+    for protocol in (4, 5):
+        restored = pickle.loads(pickle.dumps(batch, protocol))
+        assert restored == batch
+        assert list(restored) == [(1, 0.5), (2, 1.5)]
+
+
+def test_to_batches():
+    records = [(i, i / 2) for i in range(5)]
+    batches = ArkoWrapper(records).to_batches({"id": "q", "half": "d"}, 2).collect()
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    assert [row for batch in batches for row in batch] == records
@@ -0,0 +1,26 @@
+import pytest
+
+from arko.wrapper import ArkoWrapper
+
+
+def key(x):
+    return x % 3
+
+
+def test_join_with_separator():
+    assert ArkoWrapper([1, 2, 3]).join(0).collect() == [1, 0, 2, 0, 3]
+    assert ArkoWrapper("ab").join("-").collect() == ["a", "-", "b"]
+
+
+@pytest.mark.parametrize(
+    "args, kwargs",
+    [(([4, 5],), {}), ((), {"other": [4, 5]}), (((4, 5),), {})],
+)
+def test_join_iterable_without_key_is_rejected(args, kwargs):
+    with pytest.raises(TypeError):
+        ArkoWrapper([1, 2, 3]).join(*args, **kwargs)
+
+
+def test_join_by_key():
+    result = ArkoWrapper([1, 2]).join([4, 5], key).collect()
+    assert sorted(result) == [(1, 4), (2, 5)]
@@ -0,0 +1,24 @@
+from arko.wrapper import ArkoWrapper
+
+
+def test_lazy_pipeline_over_generator_iterates_twice():
+    calls = []
+
+    def double(x):
+        calls.append(x)
+        return x * 2
+
+    pipeline = ArkoWrapper(x for x in range(5)).lazy().map(double).filter(bool)
+    assert [x for x in pipeline] == [2, 4, 6, 8]
+    assert [x for x in pipeline] == [2, 4, 6, 8]
+    # 每次迭代都会重新执行 map
+    assert len(calls) == 10
+    assert list(pipeline) == [2, 4, 6, 8]
+
+
+def test_lazy_steps_are_reiterable():
+    base = ArkoWrapper(x for x in range(6)).lazy()
+    evens = base.filter(lambda x: x % 2 == 0)
+    assert evens.collect() == [0, 2, 4]
+    assert base.slice(1, 3).collect() == [1, 2]
+    assert evens.enumerate().collect() == [(0, 0), (1, 2), (2, 4)]
@@ -0,0 +1,37 @@
+import pytest
+
+from arko.wrapper import ArkoWrapper
+
+numpy = pytest.importorskip("numpy")
+
+
+def test_list_and_len_on_ndarray_map():
+    wrapper = ArkoWrapper(numpy.arange(5)).map(numpy.negative)
+    assert list(wrapper) == [0, -1, -2, -3, -4]
+    assert len(wrapper) == 5
+    assert list(wrapper) == [0, -1, -2, -3, -4]
+
+
+def test_list_and_len_on_numeric_filter():
+    wrapper = ArkoWrapper(range(5)).numeric().filter(lambda a: a > 1, vectorize=True)
+    assert list(wrapper) == [2, 3, 4]
+    assert len(wrapper) == 3
+    assert wrapper.collect() == [2, 3, 4]
+
+
+def test_numeric_generator_source_is_reiterable():
+    wrapper = ArkoWrapper(x for x in range(6)).numeric(chunk_size=4).map(numpy.square)
+    assert len(wrapper) == 6
+    assert list(wrapper) == [0, 1, 4, 9, 16, 25]
+    assert wrapper.sum() == 55
+
+
+def test_plain_function_is_called_per_element():
+    seen = []
+
+    def record(x):
+        seen.append(type(x).__name__)
+        return x
+
+    assert ArkoWrapper(range(3)).numeric().map(record).collect() == [0, 1, 2]
+    assert "ndarray" not in seen
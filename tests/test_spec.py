@@ -0,0 +1,48 @@
+import operator
+
+import pytest
+
+from arko.wrapper import ArkoWrapper
+
+
+def double(x):
+    return x * 2
+
+
+def odd(x):
+    return x % 2
+
+
+@pytest.mark.parametrize(
+    "spec",
+    [
+        ArkoWrapper.spec().slice(2),
+        ArkoWrapper.spec().enumerate(),
+        ArkoWrapper.spec().sort(reverse=True),
+        ArkoWrapper.spec().map(double).unique(),
+        ArkoWrapper.spec().reverse(),
+        ArkoWrapper.spec().windowed(2),
+    ],
+)
+def test_partition_sensitive_steps_are_rejected(spec):
+    with pytest.raises(ValueError):
+        spec.run(range(6), partitions=4, executor="thread", workers=2)
+
+
+def test_partition_sensitive_steps_run_on_one_partition():
+    spec = ArkoWrapper.spec().sort(reverse=True).slice(2)
+    result = spec.run(range(6), partitions=1, executor="thread", workers=1)
+    assert result.collect() == [5, 4]
+
+
+def test_elementwise_steps_are_concatenated_in_order():
+    spec = ArkoWrapper.spec().map(double).filter(odd)
+    assert spec.run(range(10), partitions=3, executor="thread").collect() == []
+    spec = ArkoWrapper.spec().filter(odd).map(double)
+    result = spec.run(range(10), partitions=3, executor="thread", workers=2)
+    assert result.collect() == [2, 6, 10, 14, 18]
+
+
+def test_reduction_with_combine():
+    spec = ArkoWrapper.spec().map(double).sum()
+    assert spec.run(range(10), partitions=4, combine=operator.add) == 90
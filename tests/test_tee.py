@@ -0,0 +1,95 @@
+import threading
+
+import pytest
+
+from arko.wrapper import ArkoWrapper
+from arko.wrapper._tee import TeeBuffer
+
+
+def numbers(n: int = 5):
+    return (i for i in range(n))
+
+
+def test_len_then_iterate_generator():
+    wrapper = ArkoWrapper(numbers())
+    assert len(wrapper) == 5
+    assert list(wrapper) == [0, 1, 2, 3, 4]
+
+
+def test_iterate_twice_generator():
+    wrapper = ArkoWrapper(numbers())
+    assert list(wrapper) == [0, 1, 2, 3, 4]
+    assert list(wrapper) == [0, 1, 2, 3, 4]
+
+
+def test_derived_stage_is_reiterable():
+    wrapper = ArkoWrapper([1, 2, 3]).map(str)
+    assert list(wrapper) == ["1", "2", "3"]
+    assert list(wrapper) == ["1", "2", "3"]
+    assert "2" in wrapper
+    assert wrapper[1] == "2"
+    assert wrapper == ["1", "2", "3"]
+
+
+def test_sibling_branches_see_all_items():
+    wrapper = ArkoWrapper(numbers())
+    doubled, odd = wrapper.map(lambda x: x * 2), wrapper.filter(lambda x: x % 2)
+    assert doubled.collect() == [0, 2, 4, 6, 8]
+    assert odd.collect() == [1, 3]
+    assert wrapper.collect() == [0, 1, 2, 3, 4]
+
+
+def test_reverse_keeps_length():
+    reversed_ = ArkoWrapper([0, 1, 2]).map(lambda x: x).reverse()
+    assert len(reversed_) == 3
+    assert not reversed_.empty()
+    assert list(reversed_) == [2, 1, 0]
+
+
+def test_bounded_buffer_streams_more_than_bound():
+    wrapper = ArkoWrapper(numbers(1000)).buffer(100)
+    assert wrapper.map(str).collect() == [str(i) for i in range(1000)]
+    assert [x for x in ArkoWrapper(numbers(1000)).buffer(100)] == list(range(1000))
+
+
+def test_bounded_buffer_branches_in_lockstep():
+    left, right = ArkoWrapper(numbers(1000)).buffer(10).tee(2)
+    assert list(zip(left, right)) == [(i, i) for i in range(1000)]
+
+
+def test_bounded_buffer_raises_when_branch_lags():
+    left, right = ArkoWrapper(numbers(1000)).buffer(10).tee(2)
+    with pytest.raises(BufferError):
+        for _ in left:
+            pass
+
+
+def test_bounded_buffer_spills():
+    left, right = ArkoWrapper(numbers(1000)).buffer(10, overflow="spill").tee(2)
+    assert [x for x in left] == [x for x in right] == list(range(1000))
+
+
+def test_prefetch_shares_buffer_with_current_thread():
+    wrapper = ArkoWrapper(x for x in range(20000))
+    prefetched = wrapper.prefetch(16)
+    # 后台线程读取的同时，当前线程读取同一个缓冲区
+    assert [x for x in wrapper] == list(range(20000))
+    assert [x for x in prefetched] == list(range(20000))
+    assert [x for x in wrapper] == list(range(20000))
+
+
+def test_shared_buffer_across_threads():
+    buffer = TeeBuffer(iter(range(50000)))
+    buffer.share()
+    cursors = [buffer.cursor() for _ in range(4)]
+    results = [None] * 4
+
+    def read(index):
+        results[index] = list(cursors[index])
+
+    threads = [threading.Thread(target=read, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == [list(range(50000))] * 4
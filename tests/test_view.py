@@ -0,0 +1,16 @@
+from arko.wrapper import ArkoWrapper
+
+
+def test_slice_keeps_root_type():
+    assert ArkoWrapper([1, 2, 3, 4])[1:3] == [2, 3]
+    assert type(ArkoWrapper([1, 2, 3, 4])[1:3]) is list
+    assert type(ArkoWrapper((1, 2, 3, 4))[::2]) is tuple
+    assert ArkoWrapper(range(10))[2:8:3] == range(2, 8, 3)
+
+
+def test_slice_of_view_is_wrapper():
+    wrapper = ArkoWrapper([1, 2, 3, 4, 5]).slice(1, None)
+    result = wrapper[1:3]
+    assert isinstance(result, ArkoWrapper)
+    assert list(result) == [3, 4]
+    assert wrapper[-1] == 5
@@ -0,0 +1,36 @@
+from datetime import datetime, timedelta
+
+from arko.wrapper import ArkoWrapper
+
+
+def test_windowed_min_max_over_strings():
+    wrapper = ArkoWrapper(["b", "a", "c"])
+    assert wrapper.windowed(2, aggregate="min").collect() == ["a", "a"]
+    assert wrapper.windowed(2, aggregate=("min", "max", "count")).collect() == [
+        {"min": "a", "max": "b", "count": 2},
+        {"min": "a", "max": "c", "count": 2},
+    ]
+
+
+def test_windowed_min_over_datetimes():
+    start = datetime(2024, 1, 1)
+    stamps = [start + timedelta(days=d) for d in (3, 1, 2, 0)]
+    assert ArkoWrapper(stamps).windowed(3, aggregate="max").collect() == [
+        stamps[0],
+        stamps[2],
+    ]
+
+
+def test_sliding_and_tumbling_min_over_strings():
+    items = [(0, "c"), (1, "a"), (2, "b"), (5, "d")]
+    key, value = (lambda item: item[0]), (lambda item: item[1])
+    sliding = ArkoWrapper(items).sliding(2, key, value=value, aggregate="min")
+    assert sliding.collect() == [(0, "c"), (1, "a"), (2, "a"), (5, "d")]
+    tumbling = ArkoWrapper(items).tumbling(3, key, value=value, aggregate="max")
+    assert tumbling.collect() == [(0, "c"), (3, "d")]
+
+
+def test_windowed_sum_and_mean():
+    wrapper = ArkoWrapper([1, 2, 3, 4])
+    assert wrapper.windowed(2, aggregate="sum").collect() == [3, 5, 7]
+    assert wrapper.windowed(2, 2, aggregate="mean").collect() == [1.5, 3.5]